@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+요청 수락 제어 (admission control / load shedding)
+
+Postgres가 느려지면 워커 스레드가 get_db_connection에서 쌓여 클라이언트 타임아웃까지 붙잡혀 있습니다.
+라우트 분류별로 동시 처리 수를 제한하고, 넘치는 요청은 짧게만 기다리게 한 뒤 빠르게 거절합니다.
+- 라우트 분류: api (기본), heavy (내보내기/대량 등록), ops (/health, /livez, /readyz, /metrics, /admin/profiling)
+- 분류마다 별도 예산이라 API가 과부하여도 헬스 체크와 메트릭은 응답
+- 대기열 상한과 대기 마감 시간: 대기열이 가득 차거나 마감을 넘기면 즉시 503 + Retry-After
+- 적응형 한도: window개 요청마다 p90 지연이 목표를 넘으면 한도를 backoff 배로 줄이고,
+  목표 안이면서 한도까지 찼던 적이 있으면 1씩 늘림 (AIMD)
+
+설정은 분류별 환경 변수로 재정의합니다 (예: ADMISSION_API_LIMIT, ADMISSION_API_MAX_QUEUE).
+"""
+
+import os
+import time
+import math
+import threading
+
+from flask import g, jsonify, request
+
+from metrics import (
+    ADMISSION_IN_FLIGHT, ADMISSION_LIMIT, ADMISSION_QUEUE_WAIT, ADMISSION_QUEUED, ADMISSION_REJECTED,
+)
+
+ADMISSION_CONTROL = os.getenv('ADMISSION_CONTROL', 'true').lower() == 'true'
+ADMISSION_RETRY_AFTER = int(os.getenv('ADMISSION_RETRY_AFTER', 1))
+
+ROUTE_CLASS_DEFAULTS = {
+    'api': {
+        'limit': 8, 'min_limit': 2, 'max_limit': 32, 'max_queue': 16, 'queue_timeout': 1.0,
+        'target_latency': 0.5, 'window': 20, 'backoff': 0.9,
+    },
+    'heavy': {
+        'limit': 2, 'min_limit': 1, 'max_limit': 4, 'max_queue': 4, 'queue_timeout': 1.0,
+        'target_latency': 10.0, 'window': 5, 'backoff': 0.5,
+    },
+    # 고정 예산 (적응 없음)
+    'ops': {
+        'limit': 4, 'min_limit': 4, 'max_limit': 4, 'max_queue': 8, 'queue_timeout': 0.5,
+        'target_latency': 0, 'window': 0, 'backoff': 1.0,
+    },
+}
+
+# Flask endpoint 이름 -> 라우트 분류 (없으면 api)
+ROUTE_CLASSES = {
+    'health': 'ops',
+    'livez': 'ops',
+    'readyz': 'ops',
+    'metrics': 'ops',
+    'profiling.status': 'ops',
+    'profiling.configure': 'ops',
+    'profiling.download': 'ops',
+    'profiling.reset': 'ops',
+    'export_users': 'heavy',
+    'bulk_create_users': 'heavy',
+}
+
+
+def limiter_settings_from_env(route_class):
+    """ADMISSION_<CLASS>_<KEY> 환경 변수로 기본값 재정의"""
+    settings = dict(ROUTE_CLASS_DEFAULTS[route_class])
+    for key, default in settings.items():
+        value = os.getenv(f'ADMISSION_{route_class.upper()}_{key.upper()}')
+        if value is not None:
+            settings[key] = int(float(value)) if isinstance(default, int) else float(value)
+    return settings
+
+
+class AdmissionRejected(Exception):
+    """수락 거절 (reason: queue_full / deadline)"""
+
+    def __init__(self, route_class, reason):
+        super().__init__(f"{route_class} admission rejected: {reason}")
+        self.route_class = route_class
+        self.reason = reason
+
+
+class AdaptiveLimiter:
+    """동시 처리 한도 + 대기열 + 지연 기반 AIMD 한도 조정"""
+
+    def __init__(self, name, limit=8, min_limit=1, max_limit=32, max_queue=16, queue_timeout=1.0,
+                 target_latency=0.5, window=20, backoff=0.9, clock=time.monotonic):
+        self.name = name
+        self.min_limit = min_limit
+        self.max_limit = max(max_limit, min_limit)
+        self.limit = min(max(limit, min_limit), self.max_limit)
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.target_latency = target_latency
+        self.window = window
+        self.backoff = backoff
+        self.clock = clock
+
+        self.in_flight = 0
+        self.queued = 0
+        self._samples = []
+        self._saturated = False
+        self._cond = threading.Condition()
+        ADMISSION_LIMIT.labels(route_class=name).set(self.limit)
+
+    @property
+    def adaptive(self):
+        return self.window > 0 and self.target_latency > 0
+
+    def _update_gauges(self):
+        ADMISSION_IN_FLIGHT.labels(route_class=self.name).set(self.in_flight)
+        ADMISSION_QUEUED.labels(route_class=self.name).set(self.queued)
+
+    def _admit(self):
+        self.in_flight += 1
+        if self.in_flight >= self.limit:
+            self._saturated = True
+        self._update_gauges()
+
+    def acquire(self):
+        """슬롯 확보 (대기한 시간 반환), 실패 시 AdmissionRejected"""
+        with self._cond:
+            if self.in_flight < self.limit and self.queued == 0:
+                self._admit()
+                return 0.0
+            if self.queued >= self.max_queue:
+                ADMISSION_REJECTED.labels(route_class=self.name, reason='queue_full').inc()
+                raise AdmissionRejected(self.name, 'queue_full')
+
+            start = self.clock()
+            deadline = start + self.queue_timeout
+            self.queued += 1
+            self._update_gauges()
+            try:
+                while self.in_flight >= self.limit:
+                    remaining = deadline - self.clock()
+                    if remaining <= 0 or not self._cond.wait(remaining):
+                        if self.in_flight < self.limit:
+                            break
+                        ADMISSION_REJECTED.labels(route_class=self.name, reason='deadline').inc()
+                        raise AdmissionRejected(self.name, 'deadline')
+            finally:
+                self.queued -= 1
+            self._admit()
+            waited = self.clock() - start
+        ADMISSION_QUEUE_WAIT.labels(route_class=self.name).observe(waited)
+        return waited
+
+    def release(self, latency=None):
+        """슬롯 반환과 지연 표본 기록"""
+        with self._cond:
+            self.in_flight -= 1
+            if latency is not None and self.adaptive:
+                self._record(latency)
+            self._update_gauges()
+            self._cond.notify(max(self.limit - self.in_flight, 1))
+
+    def _record(self, latency):
+        """window개 표본마다 한도 조정"""
+        self._samples.append(latency)
+        if len(self._samples) < self.window:
+            return
+        samples = sorted(self._samples)
+        p90 = samples[min(len(samples) - 1, math.ceil(len(samples) * 0.9) - 1)]
+        if p90 > self.target_latency:
+            self.limit = max(self.min_limit, math.floor(self.limit * self.backoff))
+        elif self._saturated:
+            self.limit = min(self.max_limit, self.limit + 1)
+        self._samples = []
+        self._saturated = False
+        ADMISSION_LIMIT.labels(route_class=self.name).set(self.limit)
+
+    def status(self):
+        return {
+            'limit': self.limit,
+            'in_flight': self.in_flight,
+            'queued': self.queued,
+            'max_queue': self.max_queue,
+        }
+
+
+class AdmissionController:
+    """Flask before/teardown_request 훅으로 라우트 분류별 수락 제어"""
+
+    def __init__(self, app=None, limiters=None, route_classes=None, retry_after=ADMISSION_RETRY_AFTER,
+                 enabled=ADMISSION_CONTROL):
+        self.limiters = limiters if limiters is not None else {
+            name: AdaptiveLimiter(name, **limiter_settings_from_env(name)) for name in ROUTE_CLASS_DEFAULTS
+        }
+        self.route_classes = ROUTE_CLASSES if route_classes is None else route_classes
+        self.retry_after = retry_after
+        self.enabled = enabled
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.before_request(self.before_request)
+        app.after_request(self.after_request)
+        app.teardown_request(self.teardown_request)
+
+    def route_class(self, endpoint):
+        return self.route_classes.get(endpoint, 'api')
+
+    def before_request(self):
+        """슬롯을 얻지 못하면 503 + Retry-After로 바로 응답"""
+        # 매칭되지 않은 요청(404 등)은 뷰가 실행되지 않으므로 제외
+        if not self.enabled or request.endpoint is None:
+            return None
+        limiter = self.limiters[self.route_class(request.endpoint)]
+        try:
+            limiter.acquire()
+        except AdmissionRejected as e:
+            response = jsonify({'error': 'Server overloaded, retry later', 'reason': e.reason})
+            response.status_code = 503
+            response.headers['Retry-After'] = str(self.retry_after)
+            return response
+        g._admission = (limiter, time.perf_counter())
+        return None
+
+    def after_request(self, response):
+        """스트리밍 응답은 본문을 다 보내거나 끊겨 응답이 닫힐 때 슬롯 반환
+
+        teardown_request는 본문을 보내기 전에 실행되므로, 여기서 슬롯을 넘겨받아 response.close()에 묶습니다.
+        """
+        if response.is_streamed:
+            admission = g.pop('_admission', None)
+            if admission is not None:
+                response.call_on_close(lambda: self._release(admission))
+        return response
+
+    def teardown_request(self, exc=None):
+        """응답 후 슬롯 반환 (스트리밍 응답은 after_request가 넘겨받아 여기서는 건너뜀)"""
+        admission = g.pop('_admission', None)
+        if admission is not None:
+            self._release(admission)
+
+    def _release(self, admission):
+        limiter, start = admission
+        limiter.release(time.perf_counter() - start)
+
+    def status(self):
+        return {name: limiter.status() for name, limiter in self.limiters.items()}
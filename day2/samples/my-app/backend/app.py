@@ -6,10 +6,32 @@ My App Backend - 고급 Docker 및 Kubernetes 애플리케이션
 import os
 import time
 import logging
-from flask import Flask, jsonify, request
-from prometheus_client import Counter, Histogram, generate_latest, CONTENT_TYPE_LATEST
-import psycopg2
-from psycopg2.pool import SimpleConnectionPool
+import threading
+from contextlib import contextmanager
+from flask import Flask, Response, jsonify, request
+from prometheus_client import CONTENT_TYPE_LATEST
+
+from admission import AdmissionController
+from db_pool import ConnectionPool, PoolError, dsn_from_env, pool_settings_from_env
+from db_router import ReadRouter, mark_write, wrote_recently
+from health import HealthMonitor
+from json_provider import FastJSONProvider, dumps
+from load_jobs import LoadJobManager, LoadRejected
+from metrics import collect_latest, query_timer
+from pagination import (
+    QUERY_STRATEGIES, QUERY_STRATEGY, PaginationError, build_page_json_query, build_page_query,
+    paginate_json, paginate_rows, parse_page_args,
+)
+import prepared
+from profiling import ProfilingMiddleware
+from request_metrics import RequestTimer
+from response_cache import build_table_versions, cached_response
+from shared_cache import build_response_cache
+from single_flight import SingleFlight, coalesce_requests
+from stats import StatsCache, load_stats
+from user_export import EXPORT_FORMATS, rows_to_users, stream_users
+from user_import import BulkPayloadError, bulk_insert, iter_request_records, summarize
+from warmup import DB_WARMUP, Warmup, warm_pool
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
@@ -17,37 +39,33 @@ logger = logging.getLogger(__name__)
 
 # Flask 앱 생성
 app = Flask(__name__)
+app.json = FastJSONProvider(app)
 
-# Prometheus 메트릭
-REQUEST_COUNT = Counter('http_requests_total', 'Total HTTP requests', ['method', 'endpoint', 'status'])
-REQUEST_DURATION = Histogram('http_request_duration_seconds', 'HTTP request duration', ['method', 'endpoint'])
-DB_CONNECTION_COUNT = Counter('db_connections_total', 'Total database connections')
-DB_QUERY_DURATION = Histogram('db_query_duration_seconds', 'Database query duration')
-
-# 데이터베이스 연결 풀
+# 데이터베이스 연결 풀 (primary + 읽기 복제본 라우터)
 db_pool = None
+db_router = None
+db_pool_lock = threading.Lock()
 
 def init_db():
     """데이터베이스 연결 풀 초기화"""
-    global db_pool
-    try:
-        db_pool = SimpleConnectionPool(
-            minconn=1,
-            maxconn=10,
-            host=os.getenv('DB_HOST', 'localhost'),
-            port=os.getenv('DB_PORT', '5432'),
-            database=os.getenv('DB_NAME', 'myapp'),
-            user=os.getenv('DB_USER', 'postgres'),
-            password=os.getenv('DB_PASSWORD', 'password')
-        )
-        logger.info("Database connection pool initialized")
-    except Exception as e:
-        logger.error(f"Failed to initialize database: {e}")
+    global db_pool, db_router
+    with db_pool_lock:
+        if db_router is None:
+            db_router = ReadRouter.from_env()
+        if db_pool:
+            return
+        try:
+            db_pool = ConnectionPool(**pool_settings_from_env(), **dsn_from_env())
+            logger.info("Database connection pool initialized")
+        except Exception as e:
+            logger.error(f"Failed to initialize database: {e}")
 
 def get_db_connection():
     """데이터베이스 연결 가져오기"""
     if not db_pool:
         init_db()
+    if not db_pool:
+        raise PoolError('Database connection pool is not available')
     return db_pool.getconn()
 
 def return_db_connection(conn):
@@ -55,20 +73,69 @@ def return_db_connection(conn):
     if db_pool:
         db_pool.putconn(conn)
 
-@app.before_request
-def before_request():
-    """요청 전 처리"""
-    request.start_time = time.time()
-
-@app.after_request
-def after_request(response):
-    """요청 후 처리"""
-    if hasattr(request, 'start_time'):
-        duration = time.time() - request.start_time
-        REQUEST_DURATION.labels(method=request.method, endpoint=request.endpoint).observe(duration)
-    
-    REQUEST_COUNT.labels(method=request.method, endpoint=request.endpoint, status=response.status_code).inc()
-    return response
+def close_db():
+    """연결 풀 종료 (워커 종료 시)"""
+    global db_pool, db_router
+    with db_pool_lock:
+        if db_pool:
+            db_pool.closeall()
+            db_pool = None
+        if db_router:
+            db_router.close()
+            db_router = None
+
+def reset_db_after_fork():
+    """fork 전에 만들어진 풀을 버림
+
+    부모 프로세스와 소켓을 공유하는 연결을 자식에서 닫으면 부모 쪽 세션도 끊기므로
+    close 없이 참조만 버리고, 자식은 자기 풀을 새로 엽니다.
+    """
+    global db_pool, db_router, db_pool_lock
+    db_pool = None
+    db_router = None
+    db_pool_lock = threading.Lock()
+
+@contextmanager
+def db_connection():
+    """예외가 나도 연결을 반환하는 컨텍스트 매니저"""
+    if not db_pool:
+        init_db()
+    if not db_pool:
+        raise PoolError('Database connection pool is not available')
+    with db_pool.connection() as conn:
+        yield conn
+
+@contextmanager
+def db_read_connection(prefer_primary=False):
+    """읽기 전용 연결 (복제본 우선, 지연/장애 시 primary)"""
+    if db_router is None:
+        init_db()
+    with db_router.connection(db_connection, prefer_primary=prefer_primary) as conn:
+        yield conn
+
+def request_read_connection():
+    """현재 요청용 읽기 연결 (최근에 쓴 세션이면 primary)"""
+    return db_read_connection(prefer_primary=wrote_recently(request.cookies))
+
+# 요청 타이밍 메트릭
+request_timer = RequestTimer(app)
+
+# 샘플링 프로파일러 (기본 꺼짐, 수락 제어 대기도 스택에 보이도록 먼저 등록)
+profiling = ProfilingMiddleware(app)
+
+# 라우트 분류별 동시 처리 제한 (과부하 시 503 + Retry-After)
+admission = AdmissionController(app)
+
+# 응답 캐시 (users 테이블 버전이 바뀌면 무효화, 버전은 DB 카운터 또는 CACHE_BACKEND=redis면 L2로 파드 간 공유)
+table_versions = build_table_versions(db_connection)
+response_cache = build_response_cache(versions=table_versions)
+
+def session_wrote_recently():
+    """read-your-writes 세션은 캐시를 건너뜀"""
+    return wrote_recently(request.cookies)
+
+# 동시에 들어온 같은 읽기 요청은 한 번의 쿼리/직렬화를 공유
+request_flight = SingleFlight()
 
 @app.route('/')
 def index():
@@ -80,70 +147,149 @@ def index():
         'timestamp': time.time()
     })
 
-@app.route('/health')
-def health():
-    """헬스 체크 엔드포인트"""
+def ping_database():
+    """DB 연결 확인 (SELECT 1)"""
+    with db_read_connection() as conn:
+        with query_timer('health_ping'), conn.cursor() as cursor:
+            prepared.execute(cursor, 'health_ping', 'SELECT 1')
+            cursor.fetchone()
+
+# 백그라운드 DB 헬스 체크 (워커마다 하나, 프로브는 스냅샷만 읽음)
+health_monitor = HealthMonitor(ping_database)
+
+@app.route('/livez')
+def livez():
+    """liveness 프로브 (I/O 없음)"""
+    return jsonify({'status': 'alive', 'timestamp': time.time()}), 200
+
+@app.route('/readyz')
+def readyz():
+    """readiness 프로브 (워밍업 완료 + 백그라운드 헬스 체크 스냅샷)"""
+    start_background_tasks()
+    body = health_monitor.status()
+    if DB_WARMUP:
+        body['warmup'] = warmup.summary()
+    body['timestamp'] = time.time()
+    return jsonify(body), 200 if health_monitor.is_ready() else 503
+
+def deep_health():
+    """요청 시점에 DB를 직접 확인하고 결과를 스냅샷에도 반영"""
     try:
         # 데이터베이스 연결 테스트
-        conn = get_db_connection()
-        if conn:
-            with conn.cursor() as cursor:
-                cursor.execute('SELECT 1')
-                cursor.fetchone()
-            return_db_connection(conn)
-            
-            return jsonify({
-                'status': 'healthy',
-                'database': 'connected',
-                'timestamp': time.time()
-            }), 200
-        else:
-            return jsonify({
-                'status': 'unhealthy',
-                'database': 'disconnected',
-                'timestamp': time.time()
-            }), 503
+        ping_database()
+        health_monitor.record()
+        
+        return jsonify({
+            'status': 'healthy',
+            'database': 'connected',
+            'timestamp': time.time()
+        }), 200
+    except PoolError as e:
+        logger.error(f"Health check failed: {e}")
+        health_monitor.record(str(e))
+        return jsonify({
+            'status': 'unhealthy',
+            'database': 'disconnected',
+            'error': str(e),
+            'timestamp': time.time()
+        }), 503
     except Exception as e:
         logger.error(f"Health check failed: {e}")
+        health_monitor.record(str(e))
         return jsonify({
             'status': 'unhealthy',
             'error': str(e),
             'timestamp': time.time()
         }), 503
 
+@app.route('/health')
+def health():
+    """헬스 체크 엔드포인트 (기본은 스냅샷, ?deep=1이면 DB 직접 확인)"""
+    start_background_tasks()
+    snapshot = health_monitor.snapshot()
+    if snapshot is None or request.args.get('deep', '').lower() in ('1', 'true', 'yes'):
+        return deep_health()
+
+    body = {
+        'status': 'healthy' if health_monitor.is_ready() else 'unhealthy',
+        'database': 'connected' if snapshot.ok else 'disconnected',
+        'timestamp': time.time()
+    }
+    if snapshot.error:
+        body['error'] = snapshot.error
+    return jsonify(body), 200 if health_monitor.is_ready() else 503
+
 @app.route('/metrics')
 def metrics():
     """Prometheus 메트릭 엔드포인트"""
-    return generate_latest(), 200, {'Content-Type': CONTENT_TYPE_LATEST}
+    return collect_latest(), 200, {'Content-Type': CONTENT_TYPE_LATEST}
+
+def get_users_json(limit, after, before):
+    """json_agg 전략: Postgres가 만든 users 배열을 파싱 없이 응답에 붙임"""
+    with request_read_connection() as conn, conn.cursor() as cursor:
+        sql, params = build_page_json_query(limit, after, before)
+        with query_timer('users_page_json'):
+            prepared.execute(cursor, 'users_page_json', sql, params)
+            row = cursor.fetchone()
+    users_json, page = paginate_json(row, limit, after, before)
+    body = f'{{"users":{users_json},"pagination":{dumps(page)}}}\n'
+    return Response(body, status=200, mimetype='application/json')
 
 @app.route('/api/users', methods=['GET'])
+@cached_response(response_cache, 'users', bypass=session_wrote_recently)
+@coalesce_requests(request_flight, bypass=session_wrote_recently)
 def get_users():
-    """사용자 목록 조회"""
+    """사용자 목록 조회 (커서 페이지네이션)"""
     try:
-        conn = get_db_connection()
-        if not conn:
-            return jsonify({'error': 'Database connection failed'}), 500
+        limit, after, before = parse_page_args(request.args)
+    except PaginationError as e:
+        return jsonify({'error': str(e)}), 400
+
+    strategy = request.args.get('strategy', QUERY_STRATEGY)
+    if strategy not in QUERY_STRATEGIES:
+        return jsonify({'error': f"Unsupported strategy: {strategy}"}), 400
+
+    try:
+        if strategy == 'json':
+            return get_users_json(limit, after, before)
+
+        with request_read_connection() as conn, conn.cursor() as cursor:
+            sql, params = build_page_query(limit, after, before)
+            with query_timer('users_page'):
+                prepared.execute(cursor, 'users_page', sql, params)
+                rows = cursor.fetchall()
+            users, page = paginate_rows(rows, limit, after, before)
+        
+        return jsonify({'users': rows_to_users(users), 'pagination': page}), 200
         
-        with conn.cursor() as cursor:
-            cursor.execute('SELECT id, name, email, created_at FROM users ORDER BY created_at DESC')
-            users = cursor.fetchall()
-            
-            user_list = []
-            for user in users:
-                user_list.append({
-                    'id': user[0],
-                    'name': user[1],
-                    'email': user[2],
-                    'created_at': user[3].isoformat() if user[3] else None
-                })
-            
-            return_db_connection(conn)
-            return jsonify({'users': user_list}), 200
-            
+    except PoolError as e:
+        logger.error(f"Failed to get users: {e}")
+        return jsonify({'error': 'Database connection failed'}), 503
     except Exception as e:
         logger.error(f"Failed to get users: {e}")
         return jsonify({'error': 'Internal server error'}), 500
 
+@app.route('/api/users/export', methods=['GET'])
+def export_users():
+    """사용자 전체 내보내기 (NDJSON / 청크 JSON 스트리밍)"""
+    fmt = request.args.get('format', 'ndjson')
+    if fmt not in EXPORT_FORMATS:
+        return jsonify({'error': f"Unsupported format: {fmt}"}), 400
+
+    try:
+        conn = get_db_connection()
+    except PoolError as e:
+        logger.error(f"Failed to export users: {e}")
+        return jsonify({'error': 'Database connection failed'}), 503
+    except Exception as e:
+        logger.error(f"Failed to export users: {e}")
+        return jsonify({'error': 'Internal server error'}), 500
+
+    # 본문은 요청 컨텍스트 없이 동작하므로 stream_with_context로 감싸지 않음
+    # (감싸면 본문을 읽기 전에 닫힐 때 close()가 전달되지 않아 연결이 새어 나감)
+    body = stream_users(conn, fmt, return_db_connection)
+    return Response(body, mimetype=EXPORT_FORMATS[fmt])
+
 @app.route('/api/users', methods=['POST'])
 def create_user():
     """사용자 생성"""
@@ -152,84 +298,186 @@ def create_user():
         if not data or 'name' not in data or 'email' not in data:
             return jsonify({'error': 'Name and email are required'}), 400
         
-        conn = get_db_connection()
-        if not conn:
-            return jsonify({'error': 'Database connection failed'}), 500
+        with db_connection() as conn:
+            with query_timer('users_insert'), conn.cursor() as cursor:
+                prepared.execute(
+                    cursor, 'users_insert',
+                    'INSERT INTO users (name, email) VALUES (%s, %s) RETURNING id',
+                    (data['name'], data['email'])
+                )
+                user_id = cursor.fetchone()[0]
+                conn.commit()
+        response_cache.versions.bump('users')
+        
+        return mark_write(jsonify({
+            'id': user_id,
+            'name': data['name'],
+            'email': data['email'],
+            'message': 'User created successfully'
+        })), 201
         
-        with conn.cursor() as cursor:
-            cursor.execute(
-                'INSERT INTO users (name, email) VALUES (%s, %s) RETURNING id',
-                (data['name'], data['email'])
-            )
-            user_id = cursor.fetchone()[0]
-            conn.commit()
-            
-            return_db_connection(conn)
-            return jsonify({
-                'id': user_id,
-                'name': data['name'],
-                'email': data['email'],
-                'message': 'User created successfully'
-            }), 201
-            
+    except PoolError as e:
+        logger.error(f"Failed to create user: {e}")
+        return jsonify({'error': 'Database connection failed'}), 503
     except Exception as e:
         logger.error(f"Failed to create user: {e}")
         return jsonify({'error': 'Internal server error'}), 500
 
+@app.route('/api/users/bulk', methods=['POST'])
+def bulk_create_users():
+    """사용자 대량 등록 (JSON 배열 / NDJSON)"""
+    try:
+        records = iter_request_records(request)
+    except BulkPayloadError as e:
+        return jsonify({'error': str(e)}), 400
+
+    try:
+        try:
+            with db_connection() as conn:
+                reports = bulk_insert(conn, records)
+        finally:
+            # 실패해도 앞선 배치는 커밋되었을 수 있음
+            response_cache.versions.bump('users')
+        return mark_write(jsonify({'batches': reports, 'total': summarize(reports)})), 201
+        
+    except PoolError as e:
+        logger.error(f"Failed to bulk create users: {e}")
+        return jsonify({'error': 'Database connection failed'}), 503
+    except BulkPayloadError as e:
+        reports = getattr(e, 'reports', [])
+        return jsonify({'error': str(e), 'batches': reports, 'total': summarize(reports)}), 400
+    except Exception as e:
+        logger.error(f"Failed to bulk create users: {e}")
+        reports = getattr(e, 'reports', [])
+        return jsonify({'error': 'Internal server error', 'batches': reports, 'total': summarize(reports)}), 500
+
+def load_stats_from_db():
+    """통계 캐시 로더 (캐시를 여러 세션이 공유하므로 read-your-writes 미적용)"""
+    with db_read_connection() as conn:
+        return load_stats(conn)
+
+# 쓰기와 무관하게 STATS_CACHE_TTL마다 한 번만 재계산 (응답 캐시는 버전으로 무효화되지만 값은 최대 TTL만큼 늦을 수 있음)
+stats_cache = StatsCache(load_stats_from_db)
+
+def warm_database():
+    """워밍업 단계: 풀 생성, 최소 연결 병렬 생성, hot statement 준비와 인덱스 페이지 읽기"""
+    init_db()
+    if not db_pool:
+        raise PoolError('Database connection pool is not available')
+    warm_pool(db_pool)
+
+# 시작 워밍업 (끝나기 전에는 /readyz가 warming_up)
+warmup = Warmup([
+    ('database', warm_database),
+    ('stats_cache', stats_cache.get),
+])
+if DB_WARMUP:
+    health_monitor.wait_for(lambda: warmup.finished)
+
+def start_background_tasks():
+    """워커마다 워밍업, 헬스 체크와 테이블 버전 갱신 스레드 시작 (이미 시작했으면 무시)"""
+    if DB_WARMUP:
+        warmup.start()
+    health_monitor.start()
+    table_versions.start()
+
 @app.route('/api/stats')
+@cached_response(response_cache, 'users', bypass=session_wrote_recently)
+@coalesce_requests(request_flight, bypass=session_wrote_recently)
 def get_stats():
     """애플리케이션 통계"""
     try:
-        conn = get_db_connection()
-        if not conn:
-            return jsonify({'error': 'Database connection failed'}), 500
+        stats = stats_cache.get()
         
-        with conn.cursor() as cursor:
-            cursor.execute('SELECT COUNT(*) FROM users')
-            user_count = cursor.fetchone()[0]
-            
-            cursor.execute('SELECT COUNT(*) FROM users WHERE created_at > NOW() - INTERVAL \'1 day\'')
-            new_users_today = cursor.fetchone()[0]
-            
-            return_db_connection(conn)
-            
-            return jsonify({
-                'total_users': user_count,
-                'new_users_today': new_users_today,
-                'uptime': time.time() - app.start_time if hasattr(app, 'start_time') else 0,
-                'timestamp': time.time()
-            }), 200
-            
+        return jsonify({
+            'total_users': stats['total_users'],
+            'new_users_today': stats['new_users_today'],
+            'uptime': time.time() - app.start_time if hasattr(app, 'start_time') else 0,
+            'timestamp': time.time()
+        }), 200
+        
+    except PoolError as e:
+        logger.error(f"Failed to get stats: {e}")
+        return jsonify({'error': 'Database connection failed'}), 503
     except Exception as e:
         logger.error(f"Failed to get stats: {e}")
         return jsonify({'error': 'Internal server error'}), 500
 
+# 부하 생성 작업 (CPU는 별도 프로세스 풀, 그 외 프로필은 워커의 스레드 풀에서 실행)
+load_jobs = LoadJobManager()
+
+# latency 프로필 지연 주입 (수락 제어 뒤에 실행되어 지연 동안 슬롯을 차지)
+load_jobs.latency.init_app(app)
+
+def start_load(profile, data):
+    """부하 작업을 시작하고 202 응답 생성"""
+    try:
+        job = load_jobs.start(profile, data)
+    except (TypeError, ValueError) as e:
+        return jsonify({'error': str(e)}), 400
+    except LoadRejected as e:
+        return jsonify({'error': str(e)}), 503, {'Retry-After': '5'}
+    
+    body = job.to_dict()
+    if job.kind == 'cpu':
+        body['message'] = (
+            f"Load started for {job.params['duration']:g} seconds at {job.params['cpu_percent']:g}% CPU "
+            f"on {job.params['workers']} worker(s)"
+        )
+    else:
+        body['message'] = f"{job.kind} load started for {job.params['duration']:g} seconds"
+    return jsonify(body), 202, {'Location': f'/api/load/jobs/{job.id}'}
+
 @app.route('/api/load')
 def generate_load():
-    """CPU 부하 생성 (테스트용)"""
+    """CPU 부하 생성 (테스트용, 작업만 시작하고 바로 반환)
+
+    기존 파라미터 intensity는 병렬 작업 수로 해석합니다.
+    """
     try:
-        duration = int(request.args.get('duration', 10))
+        duration = float(request.args.get('duration', 10))
         intensity = int(request.args.get('intensity', 1))
-        
-        start_time = time.time()
-        while time.time() - start_time < duration:
-            # CPU 집약적 작업
-            for i in range(100000 * intensity):
-                _ = i ** 2
-        
-        return jsonify({
-            'message': f'Load generated for {duration} seconds with intensity {intensity}',
-            'duration': duration,
-            'intensity': intensity
-        }), 200
-        
-    except Exception as e:
-        logger.error(f"Failed to generate load: {e}")
-        return jsonify({'error': 'Internal server error'}), 500
+        cpu_percent = float(request.args.get('cpu_percent', 100))
+    except ValueError:
+        return jsonify({'error': 'duration, intensity and cpu_percent must be numbers'}), 400
+    return start_load('cpu', {'cpu_percent': cpu_percent, 'duration': duration, 'workers': intensity})
+
+@app.route('/api/load/jobs', methods=['POST'])
+def start_load_job():
+    """부하 작업 시작
+
+    profile: cpu (기본) / memory / disk / db / latency, 공통 파라미터 duration, ramp_up, ramp_down, shape
+    """
+    data = request.get_json(silent=True) or {}
+    if not isinstance(data, dict):
+        return jsonify({'error': 'Request body must be a JSON object'}), 400
+    data.setdefault('duration', 10)
+    return start_load(data.get('profile', 'cpu'), data)
+
+@app.route('/api/load/jobs', methods=['GET'])
+def list_load_jobs():
+    """부하 작업 목록"""
+    return jsonify({'jobs': [job.to_dict() for job in load_jobs.jobs()]}), 200
+
+@app.route('/api/load/jobs/<job_id>', methods=['GET'])
+def get_load_job(job_id):
+    """부하 작업 상태 조회"""
+    job = load_jobs.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Load job not found'}), 404
+    return jsonify(job.to_dict()), 200
+
+@app.route('/api/load/jobs/<job_id>', methods=['DELETE'])
+def cancel_load_job(job_id):
+    """부하 작업 취소"""
+    job = load_jobs.cancel(job_id)
+    if job is None:
+        return jsonify({'error': 'Load job not found'}), 404
+    return jsonify(job.to_dict()), 200
 
 if __name__ == '__main__':
     app.start_time = time.time()
-    init_db()
+    start_background_tasks()
     
     port = int(os.getenv('PORT', 3000))
     debug = os.getenv('DEBUG', 'false').lower() == 'true'
@@ -0,0 +1,339 @@
+#!/usr/bin/env python3
+"""
+My App Backend - ASGI 서빙 모드
+
+app.py(Flask/WSGI)와 같은 라우트와 JSON 계약을 asyncpg 풀 위에서 제공합니다.
+느린 쿼리가 워커 하나를 통째로 막지 않으므로, I/O 위주 부하에서 파드당 동시 처리 요청 수가 늘어납니다.
+
+실행:
+    uvicorn asgi:app --host 0.0.0.0 --port 3000
+"""
+
+import os
+import time
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+
+import asyncpg
+from prometheus_client import CONTENT_TYPE_LATEST
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.responses import JSONResponse as StarletteJSONResponse, Response
+from starlette.routing import Route
+
+from db_pool import PoolError, PoolTimeoutError, dsn_from_env, pool_settings_from_env
+from health import HealthMonitor
+from json_provider import dumps_bytes
+from metrics import REQUEST_COUNT, REQUEST_DURATION, collect_latest, query_timer
+from pagination import PaginationError, build_page_query, paginate_rows, parse_page_args
+from prepared import numbered_placeholders
+from request_metrics import KNOWN_METHODS, UNMATCHED_ENDPOINT, excluded_paths_from_env
+from stats import NEW_USERS_TODAY_SQL, STATS_CACHE_TTL, STATS_MODE, STATS_MODES, TOTAL_USERS_SQL
+from user_export import rows_to_users
+
+logger = logging.getLogger(__name__)
+
+VERSION = '2.0.0'
+
+db_pool = None
+start_time = time.time()
+
+
+class JSONResponse(StarletteJSONResponse):
+    """json_provider의 빠른 직렬화를 쓰는 JSON 응답"""
+
+    def render(self, content):
+        return dumps_bytes(content)
+
+
+async def init_db():
+    """asyncpg 연결 풀 생성"""
+    global db_pool
+    settings = pool_settings_from_env()
+    dsn = dsn_from_env()
+    try:
+        db_pool = await asyncpg.create_pool(
+            min_size=settings['minconn'],
+            max_size=settings['maxconn'],
+            max_inactive_connection_lifetime=settings['max_lifetime'],
+            host=dsn['host'],
+            port=int(dsn['port']),
+            database=dsn['database'],
+            user=dsn['user'],
+            password=dsn['password'],
+        )
+        logger.info("Async database connection pool initialized")
+    except Exception as e:
+        logger.error(f"Failed to initialize database: {e}")
+
+
+@asynccontextmanager
+async def db_connection():
+    """풀에서 연결을 빌려 항상 반환"""
+    if db_pool is None:
+        await init_db()
+    if db_pool is None:
+        raise PoolError('Database connection pool is not available')
+    timeout = pool_settings_from_env()['timeout']
+    try:
+        conn = await db_pool.acquire(timeout=timeout)
+    except asyncio.TimeoutError as e:
+        raise PoolTimeoutError(f"Timed out after {timeout}s waiting for a connection") from e
+    try:
+        yield conn
+    finally:
+        await db_pool.release(conn)
+
+
+class AsyncStatsCache:
+    """StatsCache의 asyncio 버전 (TTL + single-flight)"""
+
+    def __init__(self, loader, ttl=STATS_CACHE_TTL):
+        self.loader = loader
+        self.ttl = ttl
+        self._value = None
+        self._loaded_at = None
+        self._lock = asyncio.Lock()
+
+    def _fresh(self):
+        return self._loaded_at is not None and time.monotonic() - self._loaded_at < self.ttl
+
+    async def get(self):
+        if self.ttl <= 0:
+            return await self.loader()
+        if self._fresh():
+            return self._value
+        async with self._lock:
+            if self._fresh():
+                return self._value
+            self._value = await self.loader()
+            self._loaded_at = time.monotonic()
+            return self._value
+
+
+async def load_stats(mode=STATS_MODE):
+    """DB에서 통계 계산"""
+    if mode not in STATS_MODES:
+        raise ValueError(f"Unknown STATS_MODE: {mode}")
+    async with db_connection() as conn:
+        with query_timer(f'users_total_{mode}'):
+            total_users = await conn.fetchval(TOTAL_USERS_SQL[mode]) or 0
+        with query_timer('users_count_today'):
+            new_users_today = await conn.fetchval(NEW_USERS_TODAY_SQL)
+    return {
+        'total_users': total_users,
+        'new_users_today': new_users_today,
+    }
+
+
+stats_cache = AsyncStatsCache(load_stats)
+
+
+class MetricsMiddleware(BaseHTTPMiddleware):
+    """요청 수/처리 시간 메트릭 기록 (request_metrics.RequestTimer와 같은 라벨 규칙)"""
+
+    exclude = excluded_paths_from_env()
+
+    async def dispatch(self, request, call_next):
+        if request.url.path in self.exclude:
+            return await call_next(request)
+
+        start_ns = time.perf_counter_ns()
+        response = await call_next(request)
+        duration = (time.perf_counter_ns() - start_ns) / 1e9
+
+        method = request.method if request.method in KNOWN_METHODS else 'OTHER'
+        endpoint = ROUTE_TEMPLATES.get(request.scope.get('endpoint'), UNMATCHED_ENDPOINT)
+        REQUEST_DURATION.labels(method=method, endpoint=endpoint).observe(duration)
+        REQUEST_COUNT.labels(method=method, endpoint=endpoint, status=response.status_code).inc()
+        return response
+
+
+async def index(request):
+    """메인 페이지"""
+    return JSONResponse({
+        'message': 'My App Backend - 고급 Docker 및 Kubernetes 애플리케이션',
+        'version': VERSION,
+        'status': 'healthy',
+        'timestamp': time.time()
+    })
+
+
+async def ping_database():
+    """DB 연결 확인 (SELECT 1)"""
+    async with db_connection() as conn:
+        with query_timer('health_ping'):
+            await conn.fetchval('SELECT 1')
+
+
+# 이벤트 루프의 백그라운드 태스크가 갱신 (check는 쓰지 않고 record만 사용)
+health_monitor = HealthMonitor(check=None)
+
+
+async def refresh_health():
+    """DB를 한 번 확인하고 스냅샷 갱신"""
+    start = time.perf_counter()
+    try:
+        await ping_database()
+        error = None
+    except Exception as e:
+        error = str(e) or type(e).__name__
+        logger.warning(f"Background health check failed: {error}")
+    return health_monitor.record(error, time.perf_counter() - start)
+
+
+async def health_loop():
+    """HEALTH_CHECK_INTERVAL마다 스냅샷 갱신"""
+    while True:
+        await refresh_health()
+        await asyncio.sleep(health_monitor.interval)
+
+
+async def livez(request):
+    """liveness 프로브 (I/O 없음)"""
+    return JSONResponse({'status': 'alive', 'timestamp': time.time()})
+
+
+async def readyz(request):
+    """readiness 프로브 (백그라운드 헬스 체크 스냅샷)"""
+    body = health_monitor.status()
+    body['timestamp'] = time.time()
+    return JSONResponse(body, status_code=200 if health_monitor.is_ready() else 503)
+
+
+async def health(request):
+    """헬스 체크 엔드포인트 (기본은 스냅샷, ?deep=1이면 DB 직접 확인)"""
+    snapshot = health_monitor.snapshot()
+    if snapshot is None or request.query_params.get('deep', '').lower() in ('1', 'true', 'yes'):
+        snapshot = await refresh_health()
+
+    if snapshot.ok and health_monitor.is_ready():
+        return JSONResponse({
+            'status': 'healthy',
+            'database': 'connected',
+            'timestamp': time.time()
+        }, status_code=200)
+    return JSONResponse({
+        'status': 'unhealthy',
+        'database': 'disconnected',
+        'error': snapshot.error or 'health check is stale',
+        'timestamp': time.time()
+    }, status_code=503)
+
+
+async def metrics(request):
+    """Prometheus 메트릭 엔드포인트"""
+    return Response(collect_latest(), media_type=CONTENT_TYPE_LATEST)
+
+
+async def get_users(request):
+    """사용자 목록 조회 (커서 페이지네이션)"""
+    try:
+        limit, after, before = parse_page_args(request.query_params)
+    except PaginationError as e:
+        return JSONResponse({'error': str(e)}, status_code=400)
+
+    try:
+        sql, params = build_page_query(limit, after, before)
+        async with db_connection() as conn:
+            with query_timer('users_page'):
+                rows = await conn.fetch(numbered_placeholders(sql), *params)
+        users, page = paginate_rows([tuple(r) for r in rows], limit, after, before)
+        return JSONResponse({'users': rows_to_users(users), 'pagination': page})
+    except PoolError as e:
+        logger.error(f"Failed to get users: {e}")
+        return JSONResponse({'error': 'Database connection failed'}, status_code=503)
+    except Exception as e:
+        logger.error(f"Failed to get users: {e}")
+        return JSONResponse({'error': 'Internal server error'}, status_code=500)
+
+
+async def create_user(request):
+    """사용자 생성"""
+    try:
+        data = await request.json()
+    except ValueError:
+        data = None
+    if not isinstance(data, dict) or 'name' not in data or 'email' not in data:
+        return JSONResponse({'error': 'Name and email are required'}, status_code=400)
+
+    try:
+        async with db_connection() as conn:
+            with query_timer('users_insert'):
+                user_id = await conn.fetchval(
+                    'INSERT INTO users (name, email) VALUES ($1, $2) RETURNING id',
+                    data['name'], data['email']
+                )
+        return JSONResponse({
+            'id': user_id,
+            'name': data['name'],
+            'email': data['email'],
+            'message': 'User created successfully'
+        }, status_code=201)
+    except PoolError as e:
+        logger.error(f"Failed to create user: {e}")
+        return JSONResponse({'error': 'Database connection failed'}, status_code=503)
+    except Exception as e:
+        logger.error(f"Failed to create user: {e}")
+        return JSONResponse({'error': 'Internal server error'}, status_code=500)
+
+
+async def get_stats(request):
+    """애플리케이션 통계"""
+    try:
+        stats = await stats_cache.get()
+        return JSONResponse({
+            'total_users': stats['total_users'],
+            'new_users_today': stats['new_users_today'],
+            'uptime': time.time() - start_time,
+            'timestamp': time.time()
+        })
+    except PoolError as e:
+        logger.error(f"Failed to get stats: {e}")
+        return JSONResponse({'error': 'Database connection failed'}, status_code=503)
+    except Exception as e:
+        logger.error(f"Failed to get stats: {e}")
+        return JSONResponse({'error': 'Internal server error'}, status_code=500)
+
+
+@asynccontextmanager
+async def lifespan(app):
+    """시작 시 풀 생성과 헬스 체크 태스크 시작, 종료 시 정리"""
+    await init_db()
+    health_task = asyncio.create_task(health_loop())
+    yield
+    health_task.cancel()
+    if db_pool is not None:
+        await db_pool.close()
+
+
+routes = [
+    Route('/', index),
+    Route('/health', health),
+    Route('/livez', livez),
+    Route('/readyz', readyz),
+    Route('/metrics', metrics),
+    Route('/api/users', get_users, methods=['GET']),
+    Route('/api/users', create_user, methods=['POST']),
+    Route('/api/stats', get_stats),
+]
+
+# 핸들러 -> 라우트 템플릿 (메트릭 endpoint 라벨)
+ROUTE_TEMPLATES = {route.endpoint: route.path for route in routes}
+
+app = Starlette(
+    routes=routes,
+    middleware=[Middleware(MetricsMiddleware)],
+    lifespan=lifespan,
+)
+
+
+if __name__ == '__main__':
+    import uvicorn
+
+    logging.basicConfig(level=logging.INFO)
+    port = int(os.getenv('PORT', 3000))
+    logger.info(f"Starting My App Backend (ASGI) on port {port}")
+    uvicorn.run(app, host='0.0.0.0', port=port)
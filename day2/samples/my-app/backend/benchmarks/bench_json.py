@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+사용자 목록 JSON 직렬화 처리량 벤치마크
+
+- legacy: 행마다 dict를 만들고 isoformat()을 호출한 뒤 표준 json으로 직렬화 (기존 get_users)
+- bulk+json: rows_to_users 일괄 변환 + 표준 json (orjson 미설치 환경의 폴백 경로)
+- bulk+orjson: rows_to_users 일괄 변환 + orjson (설치되어 있을 때)
+
+실행:
+    python benchmarks/bench_json.py [행 수 ...]     # 기본 10000 100000 1000000
+"""
+
+import sys
+import json
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import json_provider  # noqa: E402
+from user_export import rows_to_users  # noqa: E402
+
+
+def make_rows(count):
+    """users 테이블과 같은 모양의 (id, name, email, created_at) 행 생성"""
+    base = datetime(2024, 1, 1)
+    return [
+        (i, f'User {i}', f'user{i}@example.com', base + timedelta(seconds=i, microseconds=i % 1000))
+        for i in range(count, 0, -1)
+    ]
+
+
+def legacy(rows):
+    user_list = []
+    for user in rows:
+        user_list.append({
+            'id': user[0],
+            'name': user[1],
+            'email': user[2],
+            'created_at': user[3].isoformat() if user[3] else None
+        })
+    return json.dumps({'users': user_list}, separators=(',', ':')).encode('utf-8')
+
+
+def bulk_stdlib(rows):
+    return json.dumps(
+        {'users': rows_to_users(rows, native_datetime=False)}, default=json_provider._default, separators=(',', ':')
+    ).encode('utf-8')
+
+
+def bulk_fast(rows):
+    return json_provider.dumps_bytes({'users': rows_to_users(rows)})
+
+
+def measure(func, rows, repeat=3):
+    """repeat 회 중 최소 시간(초)"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(rows)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    sizes = [int(a) for a in sys.argv[1:]] or [10000, 100000, 1000000]
+    modes = [('legacy', legacy), ('bulk+json', bulk_stdlib)]
+    if json_provider.orjson:
+        modes.append(('bulk+orjson', bulk_fast))
+
+    print(f"{'rows':>9} {'mode':<12} {'seconds':>9} {'rows/s':>12} {'speedup':>8}")
+    for size in sizes:
+        rows = make_rows(size)
+        baseline = None
+        for name, func in modes:
+            seconds = measure(func, rows, repeat=3 if size <= 100000 else 1)
+            baseline = baseline or seconds
+            print(f"{size:>9} {name:<12} {seconds:>9.3f} {size / seconds:>12,.0f} {baseline / seconds:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+요청 타이밍 미들웨어 마이크로벤치마크
+
+요청 하나당 before/after 훅이 추가하는 시간을 측정합니다.
+- legacy: 기존 time.time() + request.endpoint 라벨 방식
+- timer: RequestTimer (perf_counter_ns + 라우트 템플릿 + 라벨 캐시)
+- excluded: 측정 제외 경로 (/metrics)
+
+실행:
+    python benchmarks/bench_request_timing.py [반복 횟수]
+"""
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from flask import Flask, request  # noqa: E402
+
+from metrics import REQUEST_COUNT, REQUEST_DURATION  # noqa: E402
+from request_metrics import RequestTimer  # noqa: E402
+
+
+class Response:
+    status_code = 200
+
+
+def legacy_hooks():
+    """기존 app.py 훅과 같은 동작"""
+    request.start_time = time.time()
+    duration = time.time() - request.start_time
+    REQUEST_DURATION.labels(method=request.method, endpoint=request.endpoint).observe(duration)
+    REQUEST_COUNT.labels(method=request.method, endpoint=request.endpoint, status=200).inc()
+
+
+def make_timer_hooks(timer):
+    response = Response()
+
+    def hooks():
+        timer.before_request()
+        timer.after_request(response)
+    return hooks
+
+
+def measure(app, path, func, iterations):
+    """요청 컨텍스트 안에서 func를 반복 실행해 호출당 ns 반환"""
+    with app.test_request_context(path):
+        for _ in range(1000):
+            func()
+        start = time.perf_counter_ns()
+        for _ in range(iterations):
+            func()
+        return (time.perf_counter_ns() - start) / iterations
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+
+    app = Flask('bench')
+    app.add_url_rule('/api/users', 'get_users', lambda: '')
+    app.add_url_rule('/metrics', 'metrics', lambda: '')
+    timer = RequestTimer()
+
+    results = [
+        ('legacy', measure(app, '/api/users', legacy_hooks, iterations)),
+        ('timer', measure(app, '/api/users', make_timer_hooks(timer), iterations)),
+        ('excluded', measure(app, '/metrics', make_timer_hooks(timer), iterations)),
+    ]
+
+    print(f"{'mode':<10} {'ns/request':>12}")
+    for name, ns in results:
+        print(f"{name:<10} {ns:>12.0f}")
+
+
+if __name__ == '__main__':
+    main()
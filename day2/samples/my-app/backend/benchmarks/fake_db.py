@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+메모리 안의 psycopg2 연결/커서 대역
+
+테스트(tests/conftest.py)와 벤치마크(regress.py)가 함께 쓰므로 pytest에 의존하지 않습니다.
+"""
+
+import psycopg2
+from psycopg2 import extensions
+
+
+class FakeInfo:
+    def __init__(self):
+        self.transaction_status = extensions.TRANSACTION_STATUS_IDLE
+
+
+class FakeCursor:
+    """psycopg2 커서 대역 (named 커서의 행 순회 포함)
+
+    실행한 (sql, params)는 연결의 executed에 기록하고, 결과는 연결의 respond(sql, params)로 만듭니다.
+    EXECUTE는 respond에 PREPARE 했던 원래 쿼리를 넘깁니다.
+    """
+
+    def __init__(self, connection, name=None):
+        self.connection = connection
+        self.name = name
+        self.itersize = None
+        self._result = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql, params=None):
+        conn = self.connection
+        if conn.record:
+            conn.executed.append((sql, tuple(params or ())))
+        if conn.broken:
+            raise psycopg2.OperationalError('server closed the connection')
+        if conn.failures and sql.startswith(conn.failures[0][0]):
+            raise conn.failures.pop(0)[1]
+        if sql.startswith('PREPARE '):
+            name, _, body = sql[len('PREPARE '):].partition(' AS ')
+            conn.prepared[name] = body
+            self._result = []
+            return
+        if sql.startswith('EXECUTE '):
+            sql = conn.prepared[sql[len('EXECUTE '):].split('(')[0]]
+        self._result = conn.respond(sql, params or ()) if conn.respond else conn.rows
+
+    def fetchone(self):
+        return self._result[0] if self._result else None
+
+    def fetchall(self):
+        return self._result
+
+    def __iter__(self):
+        self.connection.iterated.append((self.name, self.itersize))
+        return iter(self._result)
+
+
+class FakeConnection:
+    """psycopg2 연결 대역
+
+    결과 행은 respond(sql, params)가 있으면 그 반환값, 없으면 rows입니다 (기본 [(1,)], SELECT 1 헬스 체크용).
+    broken이면 모든 쿼리가 OperationalError, fail_next(prefix, exc)는 prefix로 시작하는 다음 쿼리 한 번만 실패시킵니다.
+    """
+
+    autocommit = False
+
+    def __init__(self, rows=None, respond=None, name=None, record=True):
+        self.rows = [(1,)] if rows is None else rows
+        self.respond = respond
+        self.name = name
+        # 벤치마크처럼 오래 돌 때는 record=False로 executed 기록을 끔
+        self.record = record
+        self.executed = []
+        self.prepared = {}
+        self.failures = []
+        self.broken = False
+        self.closed = 0
+        self.commits = 0
+        self.rollbacks = 0
+        self.info = FakeInfo()
+        # 행을 순회한 커서의 (name, itersize)
+        self.iterated = []
+
+    @property
+    def statements(self):
+        """실행한 SQL 문자열 목록"""
+        return [sql for sql, _ in self.executed]
+
+    def fail_next(self, prefix, exc):
+        self.failures.append((prefix, exc))
+
+    def cursor(self, name=None):
+        return FakeCursor(self, name)
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+        self.info.transaction_status = extensions.TRANSACTION_STATUS_IDLE
+
+    def close(self):
+        self.closed = 1
@@ -0,0 +1,562 @@
+#!/usr/bin/env python3
+"""
+백엔드 HTTP 부하 테스트 (asyncio 클라이언트)
+
+시나리오 파일(benchmarks/scenarios/*.json)의 요청 묶음을 가중치대로 섞어 보내고
+지연 분포와 처리량을 JSON으로 남겨 커밋 간 비교할 수 있게 합니다.
+- rate 모드 (open loop): 초당 rate개를 정해진 시각에 보냄. 지연은 "보냈어야 할 시각"부터 재므로
+  서버가 밀려 요청을 늦게 보내도 대기 시간이 빠지지 않음 (coordinated omission 보정)
+- concurrency 모드 (closed loop): 연결 N개가 응답을 받자마자 다음 요청을 보냄.
+  expected_interval_ms를 주면 HdrHistogram과 같은 방식으로 빠진 표본을 채워 보정
+- 지연 히스토그램: HDR 방식 로그-선형 버킷 (유효 숫자 약 3자리), p50/p90/p99/p99.9
+- coordinated omission 감지: 예정 시각보다 늦게 보낸 요청 비율과 보정 전후 p99 차이
+
+표준 라이브러리만 사용하므로 docker-compose 스택이나 테스트 Postgres에 붙은 로컬 백엔드에 바로 실행할 수 있습니다.
+
+실행:
+    python benchmarks/loadtest.py benchmarks/scenarios/mixed.json --base-url http://localhost:3000 \\
+        --mode rate --rate 200 --duration 30 --output results/mixed.json
+"""
+
+import sys
+import json
+import math
+import time
+import uuid
+import random
+import asyncio
+import argparse
+import platform
+import subprocess
+from collections import Counter
+from datetime import datetime, timezone
+from pathlib import Path
+from urllib.parse import urlsplit
+
+MODES = ('rate', 'concurrency')
+PERCENTILES = (50, 90, 99, 99.9)
+
+# 예정 시각보다 이만큼 늦게 보낸 요청은 "늦음"으로 셈
+DEFAULT_LAG_THRESHOLD_MS = 10.0
+# 늦은 요청 비율 또는 보정 후 p99 증가율이 이 값을 넘으면 coordinated omission으로 판단
+LATE_FRACTION_THRESHOLD = 0.01
+P99_INFLATION_THRESHOLD = 1.1
+
+
+class LatencyHistogram:
+    """HDR 방식 로그-선형 버킷 히스토그램 (마이크로초 단위 기록)
+
+    2의 거듭제곱 구간마다 2048개 버킷을 두어 상대 오차를 0.1% 안으로 유지합니다.
+    """
+
+    SUB_BUCKET_BITS = 11
+
+    def __init__(self):
+        self.counts = Counter()
+        self.total = 0
+        self.sum_us = 0
+        self.min_us = None
+        self.max_us = 0
+
+    @classmethod
+    def bucket(cls, value_us):
+        """value_us가 속한 버킷의 하한"""
+        shift = max(value_us.bit_length() - cls.SUB_BUCKET_BITS, 0)
+        return (value_us >> shift) << shift
+
+    @classmethod
+    def bucket_top(cls, bucket_us):
+        """버킷에 들어가는 가장 큰 값"""
+        shift = max(bucket_us.bit_length() - cls.SUB_BUCKET_BITS, 0)
+        return bucket_us + (1 << shift) - 1
+
+    def record(self, seconds, count=1):
+        value = max(int(seconds * 1_000_000), 0)
+        self.counts[self.bucket(value)] += count
+        self.total += count
+        self.sum_us += value * count
+        self.min_us = value if self.min_us is None else min(self.min_us, value)
+        self.max_us = max(self.max_us, value)
+
+    def record_corrected(self, seconds, expected_interval):
+        """closed loop 보정: 지연이 expected_interval보다 길면 그동안 보내지 못한 요청의 지연도 기록"""
+        self.record(seconds)
+        if not expected_interval or expected_interval <= 0:
+            return
+        missing = seconds - expected_interval
+        while missing >= expected_interval:
+            self.record(missing)
+            missing -= expected_interval
+
+    def merge(self, other):
+        self.counts.update(other.counts)
+        self.total += other.total
+        self.sum_us += other.sum_us
+        if other.min_us is not None:
+            self.min_us = other.min_us if self.min_us is None else min(self.min_us, other.min_us)
+        self.max_us = max(self.max_us, other.max_us)
+        return self
+
+    def percentile(self, p):
+        """p 백분위 값 (초)"""
+        if not self.total:
+            return 0.0
+        target = max(math.ceil(self.total * p / 100), 1)
+        seen = 0
+        for bucket in sorted(self.counts):
+            seen += self.counts[bucket]
+            if seen >= target:
+                return min(self.bucket_top(bucket), self.max_us) / 1_000_000
+        return self.max_us / 1_000_000
+
+    def summary(self):
+        """밀리초 단위 요약"""
+        body = {'count': self.total}
+        if not self.total:
+            return body
+        body['min'] = round(self.min_us / 1000, 3)
+        body['mean'] = round(self.sum_us / self.total / 1000, 3)
+        for p in PERCENTILES:
+            body[f'p{p:g}'] = round(self.percentile(p) * 1000, 3)
+        body['max'] = round(self.max_us / 1000, 3)
+        return body
+
+    def to_dict(self):
+        return {'unit': 'us', 'buckets': [[b, self.counts[b]] for b in sorted(self.counts)]}
+
+    @classmethod
+    def from_dict(cls, data):
+        histogram = cls()
+        for bucket, count in data['buckets']:
+            histogram.counts[bucket] += count
+            histogram.total += count
+            histogram.sum_us += bucket * count
+            histogram.min_us = bucket if histogram.min_us is None else min(histogram.min_us, bucket)
+            histogram.max_us = max(histogram.max_us, bucket)
+        return histogram
+
+
+def render(template, variables):
+    """문자열 안의 {n}, {run} 등을 치환 (dict/list는 재귀)"""
+    if isinstance(template, str):
+        return template.format(**variables)
+    if isinstance(template, dict):
+        return {k: render(v, variables) for k, v in template.items()}
+    if isinstance(template, list):
+        return [render(v, variables) for v in template]
+    return template
+
+
+class RequestSpec:
+    """시나리오의 요청 하나 (method, path, 가중치, JSON 본문 템플릿)"""
+
+    def __init__(self, name, method='GET', path='/', weight=1, json_body=None, headers=None):
+        self.name = name
+        self.method = method.upper()
+        self.path = path
+        self.weight = float(weight)
+        self.json_body = json_body
+        self.headers = headers or {}
+        if self.weight <= 0:
+            raise ValueError(f"Request {name} must have a positive weight")
+
+    def build(self, variables):
+        """(method, path, headers, body) 생성"""
+        headers = dict(render(self.headers, variables))
+        body = b''
+        if self.json_body is not None:
+            body = json.dumps(render(self.json_body, variables)).encode('utf-8')
+            headers.setdefault('Content-Type', 'application/json')
+        return self.method, render(self.path, variables), headers, body
+
+
+class Scenario:
+    """시나리오 파일 (요청 묶음과 기본 실행 설정)"""
+
+    DEFAULTS = {
+        'base_url': 'http://localhost:3000',
+        'mode': 'rate',
+        'rate': 50.0,
+        'concurrency': 10,
+        'duration': 30.0,
+        'warmup': 5.0,
+        'timeout': 10.0,
+        'max_connections': 256,
+        'expected_interval_ms': None,
+        'lag_threshold_ms': DEFAULT_LAG_THRESHOLD_MS,
+    }
+
+    def __init__(self, name, requests, **settings):
+        if not requests:
+            raise ValueError('Scenario needs at least one request')
+        unknown = set(settings) - set(self.DEFAULTS)
+        if unknown:
+            raise ValueError(f"Unknown scenario settings: {', '.join(sorted(unknown))}")
+        self.name = name
+        self.requests = requests
+        self.settings = {**self.DEFAULTS, **{k: v for k, v in settings.items() if v is not None}}
+        if self.settings['mode'] not in MODES:
+            raise ValueError(f"mode must be one of {', '.join(MODES)}")
+        self._weights = [r.weight for r in requests]
+
+    @classmethod
+    def from_dict(cls, data, **overrides):
+        data = dict(data)
+        requests = [
+            RequestSpec(
+                r.get('name') or f"{r.get('method', 'GET')} {r['path']}", r.get('method', 'GET'), r['path'],
+                r.get('weight', 1), r.get('json'), r.get('headers'),
+            )
+            for r in data.pop('requests', [])
+        ]
+        name = data.pop('name', 'scenario')
+        data.pop('description', None)
+        return cls(name, requests, **{**data, **{k: v for k, v in overrides.items() if v is not None}})
+
+    @classmethod
+    def load(cls, path, **overrides):
+        with open(path, encoding='utf-8') as f:
+            return cls.from_dict(json.load(f), **overrides)
+
+    def pick(self, rng):
+        return rng.choices(self.requests, weights=self._weights)[0]
+
+
+class HttpConnection:
+    """keep-alive HTTP/1.1 연결 하나 (Content-Length / chunked 응답)"""
+
+    def __init__(self, reader, writer, host):
+        self.reader = reader
+        self.writer = writer
+        self.host = host
+        self.reusable = True
+
+    @classmethod
+    async def open(cls, host, port):
+        reader, writer = await asyncio.open_connection(host, port)
+        return cls(reader, writer, f'{host}:{port}')
+
+    async def request(self, method, path, headers, body):
+        """요청을 보내고 (상태 코드, 본문 바이트 수) 반환"""
+        lines = [f'{method} {path} HTTP/1.1', f'Host: {self.host}', f'Content-Length: {len(body)}']
+        lines += [f'{k}: {v}' for k, v in headers.items()]
+        self.writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1') + body)
+        await self.writer.drain()
+
+        status_line = await self.reader.readline()
+        if not status_line:
+            raise ConnectionError('Connection closed by server')
+        status = int(status_line.split()[1])
+        response_headers = {}
+        while True:
+            line = await self.reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            key, _, value = line.decode('latin-1').partition(':')
+            response_headers[key.strip().lower()] = value.strip()
+
+        if response_headers.get('connection', '').lower() == 'close':
+            self.reusable = False
+        if 'content-length' in response_headers:
+            size = int(response_headers['content-length'])
+            await self.reader.readexactly(size)
+        elif response_headers.get('transfer-encoding', '').lower() == 'chunked':
+            size = 0
+            while True:
+                chunk_size = int((await self.reader.readline()).split(b';')[0], 16)
+                await self.reader.readexactly(chunk_size + 2)
+                size += chunk_size
+                if chunk_size == 0:
+                    break
+        else:
+            size = len(await self.reader.read())
+            self.reusable = False
+        return status, size
+
+    def close(self):
+        self.reusable = False
+        self.writer.close()
+
+
+class ConnectionPool:
+    """대상 서버 연결 풀 (최대 max_connections개)"""
+
+    def __init__(self, host, port, max_connections):
+        self.host = host
+        self.port = port
+        self._idle = []
+        self._slots = asyncio.Semaphore(max_connections)
+
+    async def request(self, method, path, headers, body, timeout):
+        """(상태 코드, 본문 바이트 수, 연결을 얻어 보내기 시작한 시각) 반환"""
+        async with self._slots:
+            sent = time.perf_counter()
+            conn = self._idle.pop() if self._idle else await HttpConnection.open(self.host, self.port)
+            try:
+                result = await asyncio.wait_for(conn.request(method, path, headers, body), timeout)
+            except BaseException:
+                conn.close()
+                raise
+            if conn.reusable:
+                self._idle.append(conn)
+            else:
+                conn.close()
+            return (*result, sent)
+
+    def close(self):
+        while self._idle:
+            self._idle.pop().close()
+
+
+class RequestStats:
+    """요청 이름별 집계"""
+
+    def __init__(self):
+        self.latency = LatencyHistogram()
+        self.service_time = LatencyHistogram()
+        self.statuses = Counter()
+        self.errors = 0
+
+    def to_dict(self):
+        return {
+            'requests': self.latency.total,
+            'errors': self.errors,
+            'statuses': dict(sorted(self.statuses.items())),
+            'latency_ms': self.latency.summary(),
+        }
+
+
+class LoadTest:
+    """시나리오 실행기"""
+
+    def __init__(self, scenario, seed=None, clock=time.perf_counter):
+        # ConnectionPool이 보내는 시각을 perf_counter로 재므로 같은 시계를 씀
+        self.scenario = scenario
+        self.settings = scenario.settings
+        self.rng = random.Random(seed)
+        self.clock = clock
+        self.run_id = uuid.uuid4().hex[:8]
+        self.counter = 0
+        self.stats = {r.name: RequestStats() for r in scenario.requests}
+        self.lags = []
+        self.measure_from = None
+        self.measure_until = None
+
+    def next_request(self):
+        spec = self.scenario.pick(self.rng)
+        self.counter += 1
+        return spec, spec.build({'n': self.counter, 'run': self.run_id})
+
+    async def send(self, pool, spec, request, intended):
+        """요청 하나 실행 후 기록 (intended: 보냈어야 할 시각, closed loop에서는 실제 시각)"""
+        sent = self.clock()
+        try:
+            status, _, sent = await pool.request(*request, timeout=self.settings['timeout'])
+            outcome = status
+        except asyncio.TimeoutError:
+            outcome = 'timeout'
+        except (OSError, ConnectionError, ValueError, asyncio.IncompleteReadError):
+            outcome = 'error'
+        except asyncio.CancelledError:
+            # run_rate가 마감까지 끝나지 않은 요청을 취소하면 timeout으로 셈
+            self.record(spec, 'timeout', intended, sent, self.clock())
+            raise
+        self.record(spec, outcome, intended, sent, self.clock())
+
+    def record(self, spec, outcome, intended, sent, done):
+        """요청 하나의 결과 기록 (워밍업 중에 예정된 요청은 제외)"""
+        if intended < self.measure_from:
+            return
+        stats = self.stats[spec.name]
+        stats.statuses[str(outcome)] += 1
+        if not isinstance(outcome, int) or outcome >= 500:
+            stats.errors += 1
+        if self.settings['mode'] == 'rate':
+            self.lags.append(sent - intended)
+            stats.latency.record(done - intended)
+        else:
+            stats.latency.record_corrected(done - sent, (self.settings['expected_interval_ms'] or 0) / 1000)
+        stats.service_time.record(done - sent)
+
+    async def run_rate(self, pool, start, end):
+        """open loop: 예정 시각마다 요청을 띄움"""
+        interval = 1.0 / self.settings['rate']
+        tasks = set()
+        i = 0
+        while True:
+            intended = start + i * interval
+            if intended >= end:
+                break
+            delay = intended - self.clock()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            spec, request = self.next_request()
+            task = asyncio.create_task(self.send(pool, spec, request, intended))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+            i += 1
+        if tasks:
+            _, pending = await asyncio.wait(tasks, timeout=self.settings['timeout'])
+            # 연결 슬롯을 기다리느라 마감을 넘긴 요청은 버리지 않고 취소해서 timeout으로 기록
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    async def run_concurrency(self, pool, end):
+        """closed loop: 연결마다 응답을 받으면 바로 다음 요청"""
+        async def worker():
+            while self.clock() < end:
+                spec, request = self.next_request()
+                await self.send(pool, spec, request, self.clock())
+
+        await asyncio.gather(*(worker() for _ in range(int(self.settings['concurrency']))))
+
+    async def run(self):
+        target = urlsplit(self.settings['base_url'])
+        pool = ConnectionPool(
+            target.hostname, target.port or 80,
+            self.settings['max_connections'] if self.settings['mode'] == 'rate' else int(self.settings['concurrency']),
+        )
+        start = self.clock()
+        self.measure_from = start + self.settings['warmup']
+        end = self.measure_from + self.settings['duration']
+        started_at = datetime.now(timezone.utc).isoformat()
+        try:
+            if self.settings['mode'] == 'rate':
+                await self.run_rate(pool, start, end)
+            else:
+                await self.run_concurrency(pool, end)
+        finally:
+            pool.close()
+        self.measure_until = min(self.clock(), end)
+        return self.report(started_at)
+
+    def coordinated_omission(self, latency, service_time):
+        """보정 전(service time)과 후 p99 비교, open loop면 예정 대비 지연도 확인"""
+        threshold = self.settings['lag_threshold_ms'] / 1000
+        corrected_p99, uncorrected_p99 = latency.percentile(99), service_time.percentile(99)
+        inflation = corrected_p99 / uncorrected_p99 if uncorrected_p99 else 1.0
+        # 1ms 미만 지연에서는 타이머 오차만으로 비율이 커지므로 차이가 lag_threshold_ms 이상일 때만 셈
+        inflated = inflation > P99_INFLATION_THRESHOLD and corrected_p99 - uncorrected_p99 > threshold
+        body = {'p99_inflation': round(inflation, 3)}
+        if self.settings['mode'] == 'rate':
+            late = sum(1 for lag in self.lags if lag > threshold)
+            late_fraction = late / len(self.lags) if self.lags else 0.0
+            body.update({
+                'corrected': True,
+                'late_requests': late,
+                'late_fraction': round(late_fraction, 4),
+                'max_schedule_lag_ms': round(max(self.lags, default=0) * 1000, 3),
+                'detected': late_fraction > LATE_FRACTION_THRESHOLD or inflated,
+            })
+        elif self.settings['expected_interval_ms']:
+            body.update({'corrected': True, 'detected': inflated})
+        else:
+            # closed loop는 서버가 멈춘 동안 요청을 보내지 않으므로 보정 없이는 판단할 수 없음
+            body.update({
+                'corrected': False,
+                'detected': None,
+                'note': 'closed-loop run without expected_interval_ms; use rate mode for corrected latencies',
+            })
+        return body
+
+    def report(self, started_at):
+        latency, service_time = LatencyHistogram(), LatencyHistogram()
+        statuses, errors = Counter(), 0
+        for stats in self.stats.values():
+            latency.merge(stats.latency)
+            service_time.merge(stats.service_time)
+            statuses.update(stats.statuses)
+            errors += stats.errors
+        measured = max(self.measure_until - self.measure_from, 1e-9)
+        requests = service_time.total
+        return {
+            'scenario': self.scenario.name,
+            'started_at': started_at,
+            'environment': environment(),
+            'settings': self.settings,
+            'totals': {
+                'requests': requests,
+                'errors': errors,
+                'error_rate': round(errors / requests, 4) if requests else 0.0,
+                'throughput_rps': round(requests / measured, 2),
+                'statuses': dict(sorted(statuses.items())),
+            },
+            'latency_ms': latency.summary(),
+            'service_time_ms': service_time.summary(),
+            'coordinated_omission': self.coordinated_omission(latency, service_time),
+            'requests': {name: stats.to_dict() for name, stats in self.stats.items()},
+            'histogram': latency.to_dict(),
+        }
+
+
+def environment():
+    """커밋 간 비교용 실행 환경 (git 커밋은 가능할 때만)"""
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, timeout=5,
+            cwd=Path(__file__).resolve().parent,
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {'commit': commit, 'python': platform.python_version(), 'host': platform.node()}
+
+
+def format_report(report):
+    """터미널 출력용 요약"""
+    totals, co = report['totals'], report['coordinated_omission']
+    lines = [
+        f"scenario {report['scenario']} ({report['settings']['mode']}): "
+        f"{totals['requests']} requests, {totals['throughput_rps']} req/s, {totals['errors']} errors",
+        f"{'request':<24} {'count':>7} {'p50':>9} {'p90':>9} {'p99':>9} {'p99.9':>9} {'max':>9}",
+    ]
+    rows = [(name, r['latency_ms']) for name, r in report['requests'].items()] + [('all', report['latency_ms'])]
+    for name, s in rows:
+        if s['count']:
+            lines.append(
+                f"{name:<24} {s['count']:>7} {s['p50']:>9.2f} {s['p90']:>9.2f} {s['p99']:>9.2f} "
+                f"{s['p99.9']:>9.2f} {s['max']:>9.2f}"
+            )
+    if co.get('detected'):
+        lines.append(
+            f"WARNING: coordinated omission detected (p99 x{co['p99_inflation']}, "
+            f"{co.get('late_requests', 0)} requests sent late); latencies above are corrected"
+        )
+    elif co.get('detected') is None:
+        lines.append(f"NOTE: {co['note']}")
+    return '\n'.join(lines)
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description='Run an HTTP load-test scenario against the backend')
+    parser.add_argument('scenario', help='scenario JSON file')
+    parser.add_argument('--base-url')
+    parser.add_argument('--mode', choices=MODES)
+    parser.add_argument('--rate', type=float, help='requests per second (rate mode)')
+    parser.add_argument('--concurrency', type=int, help='open connections (concurrency mode)')
+    parser.add_argument('--duration', type=float, help='measured seconds (after warmup)')
+    parser.add_argument('--warmup', type=float, help='seconds excluded from results')
+    parser.add_argument('--timeout', type=float)
+    parser.add_argument('--expected-interval-ms', type=float, dest='expected_interval_ms')
+    parser.add_argument('--seed', type=int)
+    parser.add_argument('--output', help='write the JSON report here')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    overrides = {k: getattr(args, k) for k in (
+        'base_url', 'mode', 'rate', 'concurrency', 'duration', 'warmup', 'timeout', 'expected_interval_ms',
+    )}
+    report = asyncio.run(LoadTest(Scenario.load(args.scenario, **overrides), seed=args.seed).run())
+    print(format_report(report))
+    if args.output:
+        output = Path(args.output)
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(json.dumps(report, indent=2), encoding='utf-8')
+        print(f"report written to {output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
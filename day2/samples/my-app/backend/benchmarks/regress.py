@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+"""
+핫 패스 마이크로벤치마크 회귀 검사
+
+get_users 직렬화, get_stats, 요청 미들웨어를 메모리 안의 가짜 DB로 실행하므로 Postgres 없이 돌아갑니다.
+- 벤치마크마다 samples개 표본을 모으고, 표본마다 처리량(호출/초)과 호출 지연 p99를 기록
+- 저장소의 기준선(benchmarks/baselines/microbench.json)과 표본 분포를 Mann-Whitney U 검정으로 비교
+- 처리량 중앙값이 max_throughput_drop보다 떨어지거나 p99 중앙값이 max_p99_increase보다 늘고,
+  그 차이가 유의하면 (p < alpha) 회귀로 보고 종료 코드 1
+
+기준선은 측정한 장비에 묶여 있으므로 CI 러너가 바뀌면 같은 러너에서 baseline 명령으로 다시 만듭니다.
+
+실행:
+    python benchmarks/regress.py check                   # 측정 후 기준선과 비교 (회귀면 exit 1)
+    python benchmarks/regress.py baseline                # 기준선 갱신
+    python benchmarks/regress.py run --output out.json   # 측정만
+    python benchmarks/regress.py compare old.json new.json
+"""
+
+import gc
+import os
+import sys
+import json
+import math
+import time
+import inspect
+import argparse
+import platform
+import statistics
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from contextlib import contextmanager
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+# 테스트와 같은 DB 연결 대역 (PREPARE / EXECUTE 해석 포함)
+from fake_db import FakeConnection  # noqa: E402
+
+BASELINE_PATH = Path(__file__).resolve().parent / 'baselines' / 'microbench.json'
+
+BENCH_SAMPLES = int(os.getenv('BENCH_SAMPLES', 20))
+BENCH_SAMPLE_SECONDS = float(os.getenv('BENCH_SAMPLE_SECONDS', 0.1))
+BENCH_MAX_THROUGHPUT_DROP = float(os.getenv('BENCH_MAX_THROUGHPUT_DROP', 0.10))
+BENCH_MAX_P99_INCREASE = float(os.getenv('BENCH_MAX_P99_INCREASE', 0.20))
+BENCH_ALPHA = float(os.getenv('BENCH_ALPHA', 0.01))
+
+FAKE_USERS = 1000
+
+
+class FakeDatabase:
+    """users 행을 메모리에 들고 앱이 쓰는 쿼리 모양에만 응답"""
+
+    def __init__(self, count=FAKE_USERS):
+        base = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        self.rows = [
+            (i, f'User {i}', f'user{i}@example.com', base + timedelta(seconds=i, microseconds=i % 1000))
+            for i in range(count, 0, -1)
+        ]
+        self.connection = FakeConnection(respond=self.query, record=False)
+
+    def query(self, sql, params):
+        if 'ORDER BY created_at' in sql:
+            return self.rows[:params[-1]]
+        if 'INTERVAL' in sql:
+            return [(len(self.rows) // 10,)]
+        if 'COUNT(*)' in sql:
+            return [(len(self.rows),)]
+        raise ValueError(f"FakeDatabase cannot answer: {sql}")
+
+
+@contextmanager
+def fake_backend(database=None):
+    """app 모듈의 DB 접근을 가짜 DB로 바꾼 (app 모듈, 가짜 DB)"""
+    import app as backend
+    from stats import StatsCache, load_stats
+
+    database = database or FakeDatabase()
+
+    @contextmanager
+    def connection(*args, **kwargs):
+        yield database.connection
+
+    saved = {name: getattr(backend, name) for name in ('request_read_connection', 'db_read_connection', 'stats_cache')}
+    # CACHE_BACKEND=redis면 L1의 TTL로 켜고 끔
+    response_cache = getattr(backend.response_cache, 'l1', backend.response_cache)
+    saved_cache_ttl = response_cache.ttl
+    backend.request_read_connection = connection
+    backend.db_read_connection = connection
+    # TTL 0: 매 호출 통계 쿼리와 응답 생성을 모두 측정 (응답 캐시도 꺼서 전체 요청이 매번 뷰까지 감)
+    backend.stats_cache = StatsCache(lambda: load_stats(database.connection, mode='count', strategy='rows'), ttl=0)
+    response_cache.ttl = 0
+    try:
+        yield backend, database
+    finally:
+        for name, value in saved.items():
+            setattr(backend, name, value)
+        response_cache.ttl = saved_cache_ttl
+
+
+def view_call(backend, endpoint, path):
+    """캐시/합치기 데코레이터를 벗긴 뷰를 요청 컨텍스트에서 실행하고 응답 객체까지 생성"""
+    view = inspect.unwrap(backend.app.view_functions[endpoint])
+    app = backend.app
+
+    def call():
+        with app.test_request_context(path):
+            response = app.make_response(view())
+            if response.status_code != 200:
+                raise RuntimeError(f"{path} returned {response.status_code}")
+            return response
+    return call
+
+
+def client_call(backend, path):
+    """테스트 클라이언트로 전체 요청 처리 (before/after 훅 포함)"""
+    client = backend.app.test_client()
+
+    def call():
+        response = client.get(path)
+        if response.status_code != 200:
+            raise RuntimeError(f"{path} returned {response.status_code}")
+        return response
+    return call
+
+
+# 이름 -> (설명, backend를 받아 측정할 함수를 만드는 함수)
+BENCHMARKS = {
+    'users_page_50': (
+        'GET /api/users view, 50 rows serialized', lambda b: view_call(b, 'get_users', '/api/users?limit=50'),
+    ),
+    'users_page_500': (
+        'GET /api/users view, 500 rows serialized', lambda b: view_call(b, 'get_users', '/api/users?limit=500'),
+    ),
+    'stats': (
+        'GET /api/stats view with uncached stats queries', lambda b: view_call(b, 'get_stats', '/api/stats'),
+    ),
+    # /livez 등 REQUEST_TIMING_EXCLUDE 경로는 요청 타이머를 건너뛰므로 타이머가 도는 경로로 측정
+    'middleware_stats': (
+        'Full GET /api/stats request through app hooks (timer, admission, latency injection, cache bypass)',
+        lambda b: client_call(b, '/api/stats'),
+    ),
+}
+
+
+def sample(func, seconds, clock=time.perf_counter_ns):
+    """seconds 동안 func 반복 실행 후 (처리량 호출/초, p99 마이크로초)"""
+    durations = []
+    start = clock()
+    deadline = start + seconds * 1e9
+    now = start
+    while now < deadline or len(durations) < 20:
+        before = clock()
+        func()
+        now = clock()
+        durations.append(now - before)
+    durations.sort()
+    p99 = durations[min(len(durations) - 1, math.ceil(len(durations) * 0.99) - 1)]
+    return len(durations) / ((now - start) / 1e9), p99 / 1000
+
+
+def run_benchmarks(names=None, samples=BENCH_SAMPLES, sample_seconds=BENCH_SAMPLE_SECONDS):
+    """벤치마크 실행 결과 (기준선 파일과 같은 모양)"""
+    names = names or list(BENCHMARKS)
+    results = {name: {'throughput': [], 'p99_us': []} for name in names}
+    with fake_backend() as (backend, _):
+        funcs = {name: BENCHMARKS[name][1](backend) for name in names}
+        # 워밍업 (import, 캐시, prepared statement 등록)
+        for func in funcs.values():
+            sample(func, sample_seconds)
+        # 벤치마크를 번갈아 측정해 장비 부하 변화가 한 벤치마크에 몰리지 않게 함
+        for _ in range(samples):
+            for name, func in funcs.items():
+                gc.collect()
+                throughput, p99 = sample(func, sample_seconds)
+                results[name]['throughput'].append(round(throughput, 1))
+                results[name]['p99_us'].append(round(p99, 2))
+    return {
+        'created_at': datetime.now(timezone.utc).isoformat(),
+        'environment': {'python': platform.python_version(), 'machine': platform.machine(), 'host': platform.node()},
+        'settings': {'samples': samples, 'sample_seconds': sample_seconds},
+        'benchmarks': results,
+    }
+
+
+def mann_whitney_greater(x, y):
+    """H1: x가 y보다 큰 쪽으로 치우침 (단측) p-value, 정규 근사 + 동률/연속성 보정"""
+    n1, n2 = len(x), len(y)
+    if not n1 or not n2:
+        return 1.0
+    combined = sorted([(v, 0) for v in x] + [(v, 1) for v in y])
+    ranks = [0.0] * len(combined)
+    tie_term = 0
+    i = 0
+    while i < len(combined):
+        j = i
+        while j + 1 < len(combined) and combined[j + 1][0] == combined[i][0]:
+            j += 1
+        for k in range(i, j + 1):
+            ranks[k] = (i + j) / 2 + 1
+        tie_term += (j - i + 1) ** 3 - (j - i + 1)
+        i = j + 1
+    rank_sum = sum(r for r, (_, group) in zip(ranks, combined) if group == 0)
+    u = rank_sum - n1 * (n1 + 1) / 2
+    n = n1 + n2
+    variance = n1 * n2 / 12 * ((n + 1) - tie_term / (n * (n - 1)))
+    if variance <= 0:
+        return 1.0
+    z = (u - n1 * n2 / 2 - 0.5) / math.sqrt(variance)
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+def compare_metric(baseline, current, higher_is_better, threshold, alpha):
+    """지표 하나 비교: 변화율, p-value, 판정 (regression / improved / ok)"""
+    base, cur = statistics.median(baseline), statistics.median(current)
+    change = cur / base - 1 if base else 0.0
+    # worse: 나빠진 방향의 변화율
+    if higher_is_better:
+        worse, worse_p, better_p = -change, mann_whitney_greater(baseline, current), mann_whitney_greater(current, baseline)
+    else:
+        worse, worse_p, better_p = change, mann_whitney_greater(current, baseline), mann_whitney_greater(baseline, current)
+    if worse > threshold and worse_p < alpha:
+        verdict, p_value = 'regression', worse_p
+    elif -worse > threshold and better_p < alpha:
+        verdict, p_value = 'improved', better_p
+    else:
+        verdict, p_value = 'ok', min(worse_p, better_p)
+    return {'baseline': base, 'current': cur, 'change': change, 'p_value': p_value, 'verdict': verdict}
+
+
+def compare(baseline, current, max_throughput_drop=BENCH_MAX_THROUGHPUT_DROP,
+            max_p99_increase=BENCH_MAX_P99_INCREASE, alpha=BENCH_ALPHA):
+    """기준선과 현재 결과 비교 행 목록 (기준선에 없는 벤치마크는 new)"""
+    rows = []
+    for name, result in current['benchmarks'].items():
+        base = baseline['benchmarks'].get(name)
+        if base is None:
+            rows.append({'benchmark': name, 'metric': '-', 'verdict': 'new'})
+            continue
+        for metric, higher_is_better, threshold in (
+            ('throughput', True, max_throughput_drop),
+            ('p99_us', False, max_p99_increase),
+        ):
+            row = compare_metric(base[metric], result[metric], higher_is_better, threshold, alpha)
+            rows.append({'benchmark': name, 'metric': metric, **row})
+    return rows
+
+
+def format_comparison(rows):
+    """사람이 읽는 비교표"""
+    lines = [f"{'benchmark':<20} {'metric':<11} {'baseline':>12} {'current':>12} {'change':>8} {'p':>8}  verdict"]
+    for row in rows:
+        if row['verdict'] == 'new':
+            lines.append(f"{row['benchmark']:<20} {'-':<11} {'-':>12} {'-':>12} {'-':>8} {'-':>8}  new (no baseline)")
+            continue
+        marker = '  <-- REGRESSION' if row['verdict'] == 'regression' else ''
+        lines.append(
+            f"{row['benchmark']:<20} {row['metric']:<11} {row['baseline']:>12,.1f} {row['current']:>12,.1f} "
+            f"{row['change']:>+7.1%} {row['p_value']:>8.4f}  {row['verdict']}{marker}"
+        )
+    regressions = [r for r in rows if r['verdict'] == 'regression']
+    if regressions:
+        lines.append(f"{len(regressions)} regression(s) beyond thresholds")
+    return '\n'.join(lines)
+
+
+def load_json(path):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def write_json(path, data):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(data, indent=2) + '\n', encoding='utf-8')
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description='Backend hot-path benchmark regression gate')
+    parser.add_argument('command', choices=('check', 'baseline', 'run', 'compare'))
+    parser.add_argument('files', nargs='*', help='compare: BASELINE CURRENT result files')
+    parser.add_argument('--baseline', default=str(BASELINE_PATH))
+    parser.add_argument('--output')
+    parser.add_argument('--only', action='append', choices=sorted(BENCHMARKS), help='run only these benchmarks')
+    parser.add_argument('--samples', type=int, default=BENCH_SAMPLES)
+    parser.add_argument('--sample-seconds', type=float, default=BENCH_SAMPLE_SECONDS)
+    parser.add_argument('--max-throughput-drop', type=float, default=BENCH_MAX_THROUGHPUT_DROP)
+    parser.add_argument('--max-p99-increase', type=float, default=BENCH_MAX_P99_INCREASE)
+    parser.add_argument('--alpha', type=float, default=BENCH_ALPHA)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+
+    if args.command == 'compare':
+        if len(args.files) != 2:
+            print('compare needs BASELINE and CURRENT files', file=sys.stderr)
+            return 2
+        baseline, current = load_json(args.files[0]), load_json(args.files[1])
+    else:
+        current = run_benchmarks(args.only, args.samples, args.sample_seconds)
+        if args.output:
+            write_json(args.output, current)
+        if args.command == 'baseline':
+            write_json(args.baseline, current)
+            print(f"baseline written to {args.baseline}")
+            return 0
+        if args.command == 'run':
+            for name, result in current['benchmarks'].items():
+                print(f"{name:<20} {statistics.median(result['throughput']):>12,.1f} calls/s  "
+                      f"p99 {statistics.median(result['p99_us']):>10,.1f} us")
+            return 0
+        if not Path(args.baseline).exists():
+            print(f"no baseline at {args.baseline}; create one with: regress.py baseline", file=sys.stderr)
+            return 2
+        baseline = load_json(args.baseline)
+
+    rows = compare(baseline, current, args.max_throughput_drop, args.max_p99_increase, args.alpha)
+    print(format_comparison(rows))
+    return 1 if any(r['verdict'] == 'regression' for r in rows) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+CPU 부하 작업 (load_jobs의 프로세스 풀에서 실행)
+
+spawn된 자식 프로세스가 import 하므로 표준 라이브러리만 사용합니다.
+"""
+
+import time
+
+from load_shapes import load_level
+
+SLICE_SECONDS = 0.1
+
+# 부모가 initializer로 넘겨주는 공유 취소 플래그 배열 (슬롯마다 0/1)
+_cancel_flags = None
+
+
+def init_worker(cancel_flags):
+    """프로세스 풀 워커 초기화"""
+    global _cancel_flags
+    _cancel_flags = cancel_flags
+
+
+def cancelled(slot):
+    return _cancel_flags is not None and bool(_cancel_flags[slot])
+
+
+def burn_cpu(slot, cpu_percent, duration, ramp_up=0.0, ramp_down=0.0, shape='linear',
+             slice_seconds=SLICE_SECONDS):
+    """duration초 동안 코어 하나를 cpu_percent%만큼 사용
+
+    slice마다 (cpu_percent% x 현재 부하 비율 구간은 계산, 나머지는 sleep) 취소 플래그를 확인합니다.
+    """
+    start = time.monotonic()
+    cpu_start = time.process_time()
+    deadline = start + duration
+    peak = min(max(cpu_percent, 0), 100) / 100.0
+    iterations = 0
+    was_cancelled = False
+
+    while True:
+        now = time.monotonic()
+        if now >= deadline:
+            break
+        if cancelled(slot):
+            was_cancelled = True
+            break
+        slice_end = min(now + slice_seconds, deadline)
+        busy_fraction = peak * load_level(now - start, duration, ramp_up, ramp_down, shape)
+        busy_until = now + (slice_end - now) * busy_fraction
+        while time.monotonic() < busy_until:
+            for i in range(1000):
+                _ = i ** 2
+            iterations += 1000
+        rest = slice_end - time.monotonic()
+        if rest > 0:
+            time.sleep(rest)
+
+    return {
+        'iterations': iterations,
+        'cpu_seconds': time.process_time() - cpu_start,
+        'elapsed': time.monotonic() - start,
+        'cancelled': was_cancelled,
+    }
@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""
+데이터베이스 연결 풀
+
+ThreadedConnectionPool 위에 다음을 더한 풀입니다.
+- 대기열 상한과 타임아웃이 있는 체크아웃 (gunicorn 스레드 워커에서 안전)
+- 체크아웃 시 헬스 체크, 최대 수명이 지난 연결 교체
+- 예외가 나도 항상 연결을 반환하는 컨텍스트 매니저
+- 체크아웃 대기 시간, 사용 중/유휴 연결 수, 고갈 이벤트, 연결 수명 메트릭
+- 최소 연결(minconn)은 생성자에서 하나씩 열지 않고 prefill()에서 병렬로 엶 (warmup.py)
+- 반환된 연결은 maxconn개까지 유휴로 남김 (psycopg2 풀은 유휴가 minconn개를 넘으면 반환 즉시 닫음)
+"""
+
+import os
+import time
+import logging
+import weakref
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+import psycopg2
+from psycopg2 import extensions
+from psycopg2.pool import ThreadedConnectionPool
+
+import prepared
+from metrics import (
+    DB_CONNECTION_AGE, DB_CONNECTION_COUNT, DB_POOL_CHECKOUT_DURATION, DB_POOL_EXHAUSTED,
+    DB_POOL_IDLE, DB_POOL_IN_USE, DB_POOL_SIZE, DB_POOL_WAITING, query_timer,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class PoolError(Exception):
+    """연결 풀 오류"""
+
+
+class PoolTimeoutError(PoolError):
+    """타임아웃 안에 연결을 얻지 못함"""
+
+
+class PoolExhaustedError(PoolError):
+    """대기열이 가득 차서 즉시 거절"""
+
+
+class PrefillConnectionPool(ThreadedConnectionPool):
+    """minconn개 연결을 생성자에서 순서대로 열지 않고 prefill()에서 병렬로 여는 풀
+
+    ThreadedConnectionPool은 새 연결을 풀 잠금을 잡은 채 열기 때문에 동시에 getconn 해도
+    접속이 직렬화됩니다. prefill은 잠금 밖에서 접속한 뒤 유휴 목록에만 넣습니다.
+    """
+
+    def __init__(self, minconn, maxconn, *args, **kwargs):
+        super().__init__(0, maxconn, *args, **kwargs)
+        # prefill()로 미리 열 연결 수
+        self.prefill_size = int(minconn)
+        # psycopg2 putconn은 유휴가 minconn개 이상이면 반환된 연결을 닫으므로 maxconn까지 남기게 함
+        self.minconn = int(maxconn)
+
+    @property
+    def idle_count(self):
+        """유휴 목록에 있는 연결 수"""
+        return len(self._pool)
+
+    def prefill(self, workers=None):
+        """연결이 prefill_size(생성자의 minconn)개가 되도록 병렬 접속 후 새로 연 연결 목록 반환"""
+        with self._lock:
+            missing = self.prefill_size - len(self._pool) - len(self._used)
+        if missing <= 0:
+            return []
+
+        with ThreadPoolExecutor(max_workers=workers or missing) as executor:
+            futures = [executor.submit(psycopg2.connect, *self._args, **self._kwargs) for _ in range(missing)]
+        conns = [f.result() for f in futures if f.exception() is None]
+        errors = [f.exception() for f in futures if f.exception() is not None]
+
+        opened = []
+        with self._lock:
+            for conn in conns:
+                if self.closed or len(self._pool) + len(self._used) >= self.maxconn:
+                    conn.close()
+                else:
+                    self._pool.append(conn)
+                    opened.append(conn)
+        if errors and not opened:
+            raise errors[0]
+        return opened
+
+
+def pool_settings_from_env():
+    """환경 변수에서 풀 설정 읽기"""
+    return {
+        'minconn': int(os.getenv('DB_POOL_MIN', 1)),
+        'maxconn': int(os.getenv('DB_POOL_MAX', 10)),
+        'timeout': float(os.getenv('DB_POOL_TIMEOUT', 5)),
+        'max_waiters': int(os.getenv('DB_POOL_MAX_WAITERS', 50)),
+        'max_lifetime': float(os.getenv('DB_POOL_MAX_LIFETIME', 1800)),
+        'ping_interval': float(os.getenv('DB_POOL_PING_INTERVAL', 30)),
+    }
+
+
+def dsn_from_env(host=None):
+    """환경 변수에서 접속 정보 읽기"""
+    return {
+        'host': host or os.getenv('DB_HOST', 'localhost'),
+        'port': os.getenv('DB_PORT', '5432'),
+        'database': os.getenv('DB_NAME', 'myapp'),
+        'user': os.getenv('DB_USER', 'postgres'),
+        'password': os.getenv('DB_PASSWORD', 'password'),
+    }
+
+
+class ConnectionPool:
+    """스레드 안전하고 연결이 새지 않는 연결 풀"""
+
+    def __init__(self, minconn=1, maxconn=10, timeout=5.0, max_waiters=50,
+                 max_lifetime=1800.0, ping_interval=30.0, pool_factory=PrefillConnectionPool,
+                 name='primary', **dsn):
+        self.name = name
+        self.minconn = minconn
+        self.maxconn = maxconn
+        self.timeout = timeout
+        self.max_waiters = max_waiters
+        self.max_lifetime = max_lifetime
+        self.ping_interval = ping_interval
+
+        self._pool = pool_factory(minconn, maxconn, **dsn)
+        self._slots = threading.BoundedSemaphore(maxconn)
+        self._lock = threading.Lock()
+        self._waiters = 0
+        self._in_use = 0
+        # conn -> 생성 시각 / 마지막 반환 시각 (닫힌 연결의 id가 재사용되어도 섞이지 않게 약한 참조로 보관)
+        self._born = weakref.WeakKeyDictionary()
+        self._last_used = weakref.WeakKeyDictionary()
+
+        DB_POOL_SIZE.labels(pool=name).set(maxconn)
+        self._update_gauges()
+
+    @property
+    def in_use(self):
+        """사용 중인 연결 수"""
+        return self._in_use
+
+    @property
+    def waiting(self):
+        """연결을 기다리는 요청 수"""
+        return self._waiters
+
+    def _update_gauges(self):
+        """사용 중/유휴/대기 게이지 갱신"""
+        DB_POOL_IN_USE.labels(pool=self.name).set(self._in_use)
+        DB_POOL_IDLE.labels(pool=self.name).set(self._pool.idle_count)
+        DB_POOL_WAITING.labels(pool=self.name).set(self._waiters)
+
+    def _acquire_slot(self, timeout):
+        """풀 슬롯 확보 (대기열 상한 적용)"""
+        with self._lock:
+            if self._waiters >= self.max_waiters:
+                DB_POOL_EXHAUSTED.labels(pool=self.name, reason='queue_full').inc()
+                raise PoolExhaustedError(f"Connection wait queue is full ({self.max_waiters})")
+            self._waiters += 1
+            DB_POOL_WAITING.labels(pool=self.name).set(self._waiters)
+        try:
+            if not self._slots.acquire(timeout=timeout):
+                DB_POOL_EXHAUSTED.labels(pool=self.name, reason='timeout').inc()
+                raise PoolTimeoutError(f"Timed out after {timeout}s waiting for a connection")
+        finally:
+            with self._lock:
+                self._waiters -= 1
+                DB_POOL_WAITING.labels(pool=self.name).set(self._waiters)
+
+    def _is_expired(self, conn, now):
+        """최대 수명 초과 여부"""
+        born = self._born.get(conn)
+        return born is not None and self.max_lifetime > 0 and now - born > self.max_lifetime
+
+    def _is_healthy(self, conn, now):
+        """체크아웃 시 헬스 체크
+
+        닫힌 연결은 바로 폐기하고, ping_interval 이상 놀고 있던 연결만 SELECT 1로 확인합니다.
+        """
+        if conn.closed:
+            return False
+        last_used = self._last_used.get(conn)
+        if last_used is not None and now - last_used < self.ping_interval:
+            return True
+        try:
+            with query_timer('pool_ping'), conn.cursor() as cursor:
+                cursor.execute('SELECT 1')
+                cursor.fetchone()
+            conn.rollback()
+            return True
+        except psycopg2.Error:
+            return False
+
+    def _forget(self, conn):
+        """닫힌 연결의 기록 제거와 수명 기록"""
+        prepared.invalidate(conn)
+        born = self._born.pop(conn, None)
+        if born is not None:
+            DB_CONNECTION_AGE.labels(pool=self.name).observe(time.monotonic() - born)
+        self._last_used.pop(conn, None)
+
+    def _discard(self, conn):
+        """연결을 닫고 풀에서 제거"""
+        self._forget(conn)
+        try:
+            self._pool.putconn(conn, close=True)
+        except Exception as e:
+            logger.warning(f"Failed to discard connection: {e}")
+
+    def getconn(self, timeout=None):
+        """연결 체크아웃"""
+        timeout = self.timeout if timeout is None else timeout
+        start = time.perf_counter()
+        self._acquire_slot(timeout)
+        try:
+            while True:
+                conn = self._pool.getconn()
+                now = time.monotonic()
+                # 처음 보는 연결 = 풀이 새로 연 연결 (폐기 후 재접속 포함)
+                if conn not in self._born:
+                    self._born[conn] = now
+                    DB_CONNECTION_COUNT.labels(pool=self.name).inc()
+                elif self._is_expired(conn, now) or not self._is_healthy(conn, now):
+                    self._discard(conn)
+                    continue
+                with self._lock:
+                    self._in_use += 1
+                    self._update_gauges()
+                DB_POOL_CHECKOUT_DURATION.labels(pool=self.name).observe(time.perf_counter() - start)
+                return conn
+        except Exception:
+            self._slots.release()
+            raise
+
+    def putconn(self, conn, close=False):
+        """연결 반환 (진행 중인 트랜잭션은 롤백)"""
+        if conn is None:
+            return
+        try:
+            if not conn.closed and not close:
+                if conn.info.transaction_status != extensions.TRANSACTION_STATUS_IDLE:
+                    conn.rollback()
+        except psycopg2.Error:
+            close = True
+
+        try:
+            if close or conn.closed or self._is_expired(conn, time.monotonic()):
+                self._discard(conn)
+            else:
+                self._last_used[conn] = time.monotonic()
+                self._pool.putconn(conn)
+                # psycopg2 풀이 반환받으며 닫은 연결 (서버 연결 끊김 등)
+                if conn.closed:
+                    self._forget(conn)
+        finally:
+            with self._lock:
+                self._in_use -= 1
+                self._update_gauges()
+            self._slots.release()
+
+    @contextmanager
+    def connection(self, timeout=None):
+        """항상 연결을 반환하는 컨텍스트 매니저
+
+        연결 자체가 깨진 오류(OperationalError, InterfaceError)면 연결을 폐기합니다.
+        """
+        conn = self.getconn(timeout)
+        broken = False
+        try:
+            yield conn
+        except (psycopg2.OperationalError, psycopg2.InterfaceError):
+            broken = True
+            raise
+        finally:
+            self.putconn(conn, close=broken)
+
+    def prefill(self, workers=None):
+        """최소 연결을 병렬로 미리 열기 (열린 연결 수 반환)"""
+        prefill = getattr(self._pool, 'prefill', None)
+        if prefill is None:
+            return 0
+        opened = prefill(workers)
+        now = time.monotonic()
+        with self._lock:
+            for conn in opened:
+                self._born[conn] = now
+                self._last_used[conn] = now
+                DB_CONNECTION_COUNT.labels(pool=self.name).inc()
+            self._update_gauges()
+        return len(opened)
+
+    def closeall(self):
+        """모든 연결 종료"""
+        self._pool.closeall()
+        self._born.clear()
+        self._last_used.clear()
+        self._update_gauges()
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+읽기 복제본 라우팅
+
+DB_READ_HOSTS(쉼표 구분)에 지정된 복제본마다 별도 연결 풀을 두고 GET 핸들러의 읽기를 분산합니다.
+- 라운드 로빈으로 복제본 선택, 복제 지연이 DB_REPLICA_MAX_LAG초를 넘거나 연결이 안 되면 primary로 폴백
+- 복제본 풀이 가득 찬 것(바쁜 것)은 장애가 아니므로 제외하지 않고 그 요청만 다음 복제본이나 primary로 보냄
+- 복제 지연은 DB_REPLICA_LAG_CHECK_INTERVAL초마다 체크아웃한 연결로 측정
+- read-your-writes: 쓰기 요청 후 DB_READ_YOUR_WRITES_WINDOW초 동안 같은 세션(쿠키)의 읽기는 primary로
+"""
+
+import os
+import time
+import logging
+import threading
+from contextlib import contextmanager
+from itertools import count
+
+import psycopg2
+import psycopg2.pool
+
+from db_pool import ConnectionPool, PoolError, PoolExhaustedError, PoolTimeoutError, dsn_from_env, pool_settings_from_env
+from metrics import DB_READ_ROUTE, DB_REPLICA_LAG, query_timer
+
+logger = logging.getLogger(__name__)
+
+READ_YOUR_WRITES = os.getenv('DB_READ_YOUR_WRITES', 'true').lower() == 'true'
+READ_YOUR_WRITES_WINDOW = float(os.getenv('DB_READ_YOUR_WRITES_WINDOW', 5))
+READ_YOUR_WRITES_COOKIE = 'myapp_ryw'
+
+# 복제본이 primary를 모두 따라잡았으면 0, 아니면 마지막 재생 트랜잭션 이후 경과 시간
+REPLICA_LAG_SQL = (
+    'SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 '
+    'ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END'
+)
+
+# 풀 슬롯을 얻지 못함 (복제본은 살아 있고 바쁠 뿐)
+POOL_BUSY_ERRORS = (PoolTimeoutError, PoolExhaustedError, psycopg2.pool.PoolError)
+
+
+def read_hosts_from_env():
+    """DB_READ_HOSTS 목록"""
+    return [h.strip() for h in os.getenv('DB_READ_HOSTS', '').split(',') if h.strip()]
+
+
+class Replica:
+    """복제본 하나의 풀과 상태"""
+
+    def __init__(self, host, pool_factory=None, retry_after=10.0):
+        self.host = host
+        self.retry_after = retry_after
+        self._pool_factory = pool_factory or (
+            lambda: ConnectionPool(name=f'replica-{host}', **pool_settings_from_env(), **dsn_from_env(host=host))
+        )
+        self._pool = None
+        self._lock = threading.Lock()
+        self.lag = None
+        self.lag_checked_at = None
+        self.down_until = 0.0
+
+    def pool(self):
+        """풀을 처음 사용할 때 생성 (복제본이 내려가 있어도 앱 시작은 막지 않음)"""
+        if self._pool is None:
+            with self._lock:
+                if self._pool is None:
+                    self._pool = self._pool_factory()
+        return self._pool
+
+    def mark_down(self, now):
+        self.down_until = now + self.retry_after
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.closeall()
+            self._pool = None
+
+
+class ReadRouter:
+    """GET 읽기를 복제본으로 보내고 필요하면 primary로 폴백"""
+
+    def __init__(self, replicas, max_lag=None, lag_check_interval=None, clock=time.monotonic):
+        self.replicas = list(replicas)
+        self.max_lag = float(os.getenv('DB_REPLICA_MAX_LAG', 10)) if max_lag is None else max_lag
+        self.lag_check_interval = (
+            float(os.getenv('DB_REPLICA_LAG_CHECK_INTERVAL', 5)) if lag_check_interval is None else lag_check_interval
+        )
+        self.clock = clock
+        self._turn = count()
+        self._order_lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls):
+        return cls([Replica(host) for host in read_hosts_from_env()])
+
+    def _candidates(self, now):
+        """이번 요청에서 시도할 복제본 순서 (라운드 로빈, 내려간/지연된 복제본 제외)"""
+        with self._order_lock:
+            start = next(self._turn) % len(self.replicas)
+        ordered = self.replicas[start:] + self.replicas[:start]
+        for replica in ordered:
+            if replica.down_until > now:
+                continue
+            lag_fresh = replica.lag_checked_at is not None and now - replica.lag_checked_at < self.lag_check_interval
+            if lag_fresh and replica.lag > self.max_lag:
+                continue
+            yield replica
+
+    def _measure_lag(self, replica, conn, now):
+        """복제 지연 측정 (주기가 지났을 때만)"""
+        if replica.lag_checked_at is not None and now - replica.lag_checked_at < self.lag_check_interval:
+            return replica.lag
+        with query_timer('replica_lag'), conn.cursor() as cursor:
+            cursor.execute(REPLICA_LAG_SQL)
+            lag = float(cursor.fetchone()[0])
+        conn.rollback()
+        replica.lag = lag
+        replica.lag_checked_at = now
+        DB_REPLICA_LAG.labels(replica=replica.host).set(lag)
+        return lag
+
+    def _checkout(self):
+        """사용 가능한 복제본 연결 (없으면 (None, None, 사유))"""
+        now = self.clock()
+        reason = 'lagging'
+        for replica in self._candidates(now):
+            try:
+                pool = replica.pool()
+                conn = pool.getconn()
+            except POOL_BUSY_ERRORS as e:
+                logger.info(f"Read replica {replica.host} pool is busy: {e}")
+                reason = 'busy'
+                continue
+            except (PoolError, psycopg2.OperationalError, psycopg2.InterfaceError) as e:
+                logger.warning(f"Read replica {replica.host} unavailable: {e}")
+                replica.mark_down(now)
+                reason = 'unavailable'
+                continue
+
+            try:
+                lag = self._measure_lag(replica, conn, now)
+            except psycopg2.Error as e:
+                logger.warning(f"Read replica {replica.host} lag check failed: {e}")
+                pool.putconn(conn, close=True)
+                replica.mark_down(now)
+                reason = 'unavailable'
+                continue
+
+            if lag > self.max_lag:
+                pool.putconn(conn)
+                reason = 'lagging'
+                continue
+            return replica, conn, 'ok'
+        return None, None, reason
+
+    @contextmanager
+    def connection(self, primary, prefer_primary=False):
+        """읽기용 연결
+
+        primary는 primary 연결을 주는 컨텍스트 매니저 함수입니다.
+        """
+        if not self.replicas or prefer_primary:
+            reason = 'read_your_writes' if prefer_primary and self.replicas else 'no_replicas'
+            DB_READ_ROUTE.labels(target='primary', reason=reason).inc()
+            with primary() as conn:
+                yield conn
+            return
+
+        replica, conn, reason = self._checkout()
+        if conn is None:
+            DB_READ_ROUTE.labels(target='primary', reason=reason).inc()
+            with primary() as conn:
+                yield conn
+            return
+
+        DB_READ_ROUTE.labels(target='replica', reason='ok').inc()
+        broken = False
+        try:
+            yield conn
+        except (psycopg2.OperationalError, psycopg2.InterfaceError):
+            broken = True
+            raise
+        finally:
+            replica.pool().putconn(conn, close=broken)
+
+    def close(self):
+        for replica in self.replicas:
+            replica.close()
+
+
+def wrote_recently(cookies, now=None):
+    """read-your-writes 쿠키가 아직 유효한지 확인"""
+    if not READ_YOUR_WRITES:
+        return False
+    try:
+        until = float(cookies.get(READ_YOUR_WRITES_COOKIE, 0))
+    except ValueError:
+        return False
+    return (time.time() if now is None else now) < until
+
+
+def mark_write(response, now=None):
+    """쓰기 응답에 read-your-writes 쿠키 설정"""
+    if READ_YOUR_WRITES:
+        until = (time.time() if now is None else now) + READ_YOUR_WRITES_WINDOW
+        response.set_cookie(
+            READ_YOUR_WRITES_COOKIE, f'{until:.3f}', max_age=int(READ_YOUR_WRITES_WINDOW) + 1, httponly=True
+        )
+    return response
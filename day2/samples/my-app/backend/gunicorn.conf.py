@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+gunicorn 프로덕션 설정
+
+- 워커/스레드: cgroup CPU 쿼터 기준 자동 계산 (GUNICORN_WORKERS / GUNICORN_THREADS로 재정의)
+- preload_app: 마스터에서 앱을 한 번만 import 하고 fork (DB 풀은 fork 이후 워커마다 생성)
+- worker_tmp_dir: 하트비트 파일을 tmpfs(/dev/shm)에 두어 디스크 I/O로 워커가 멈추지 않게 함
+- max_requests + jitter: 워커를 주기적으로 교체하되 동시에 재시작되지 않게 분산
+- Prometheus 멀티프로세스 모드: 모든 워커의 메트릭을 PROMETHEUS_MULTIPROC_DIR에 모아 합산
+"""
+
+import os
+import time
+
+from launcher import (
+    DEFAULT_METRICS_DIR, DEFAULT_OPS_THREADS, admission_settings, available_cpus, load_worker_processes, worker_settings,
+)
+
+# preload로 앱(prometheus_client)을 import 하기 전에 설정되어야 함
+# (디렉터리 초기화는 launcher.py가 gunicorn 실행 전에 한 번 수행)
+os.environ.setdefault('PROMETHEUS_MULTIPROC_DIR', DEFAULT_METRICS_DIR)
+os.makedirs(os.environ['PROMETHEUS_MULTIPROC_DIR'], exist_ok=True)
+
+bind = f"0.0.0.0:{os.getenv('PORT', 3000)}"
+
+workers, threads = worker_settings()
+worker_class = 'gthread'
+preload_app = True
+worker_tmp_dir = os.getenv('GUNICORN_WORKER_TMP_DIR', '/dev/shm' if os.path.isdir('/dev/shm') else None)
+
+timeout = int(os.getenv('GUNICORN_TIMEOUT', 30))
+graceful_timeout = int(os.getenv('GUNICORN_GRACEFUL_TIMEOUT', 30))
+keepalive = int(os.getenv('GUNICORN_KEEPALIVE', 5))
+
+max_requests = int(os.getenv('GUNICORN_MAX_REQUESTS', 1000))
+max_requests_jitter = int(os.getenv('GUNICORN_MAX_REQUESTS_JITTER', 100))
+
+accesslog = os.getenv('GUNICORN_ACCESS_LOG', '-')
+loglevel = os.getenv('GUNICORN_LOG_LEVEL', 'info')
+
+# 스레드마다 연결 하나를 쓸 수 있도록 워커당 풀 크기 기본값을 스레드 수에 맞춤
+os.environ.setdefault('DB_POOL_MAX', str(threads))
+
+# /api/load 프로세스 풀은 워커마다 따로 생기므로 CPU 수를 워커 수로 나눔 (워커마다 CPU 수만큼이면 N² 프로세스)
+os.environ.setdefault('LOAD_WORKERS', str(load_worker_processes(available_cpus(), workers)))
+
+# api + heavy 한도 합을 threads - GUNICORN_OPS_THREADS 이하로 두어 /livez, /readyz, /metrics용 스레드를 남김
+# (대기열에서 기다리는 요청도 gthread 스레드를 점유하므로 api/heavy 대기열은 0)
+ops_threads = int(os.getenv('GUNICORN_OPS_THREADS', DEFAULT_OPS_THREADS))
+for key, value in admission_settings(threads, ops_threads).items():
+    os.environ.setdefault(key, value)
+
+
+def when_ready(server):
+    server.log.info(f"Starting My App Backend with {workers} workers x {threads} threads")
+
+
+def post_fork(server, worker):
+    """워커마다 자기 DB 풀을 열고 워밍업 (프로세스 간 연결 공유 방지)"""
+    import app as backend
+
+    backend.reset_db_after_fork()
+    backend.app.start_time = time.time()
+    backend.start_background_tasks()
+
+
+def worker_exit(server, worker):
+    """워커 종료 시 부하 작업, 헬스 체크/테이블 버전 스레드와 연결 정리"""
+    import app as backend
+
+    backend.load_jobs.shutdown()
+    backend.health_monitor.stop(timeout=1)
+    backend.table_versions.stop(timeout=1)
+    backend.close_db()
+
+
+def child_exit(server, worker):
+    """종료된 워커의 live 게이지 파일 정리"""
+    from metrics import mark_worker_dead
+
+    mark_worker_dead(worker.pid)
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+헬스 체크 스냅샷
+
+Docker healthcheck, Kubernetes 프로브, 클라우드 로드밸런서가 /health를 호출할 때마다
+DB 연결을 빌려 SELECT 1을 돌리면 프로브 트래픽만으로 풀을 쓰고, 잠깐의 DB 장애가 liveness
+실패와 재시작 폭주로 번집니다. 그래서 다음과 같이 나눕니다.
+- /livez: I/O 없음, 프로세스가 응답하면 200
+- /readyz: 백그라운드 스레드가 HEALTH_CHECK_INTERVAL초마다 갱신한 DB 상태 스냅샷을 읽기만 함
+- /health?deep=1: 요청 시점에 직접 DB 확인 (수동 점검용)
+"""
+
+import os
+import time
+import logging
+import threading
+from collections import namedtuple
+
+from metrics import DB_HEALTH_UP
+
+logger = logging.getLogger(__name__)
+
+HEALTH_CHECK_INTERVAL = float(os.getenv('HEALTH_CHECK_INTERVAL', 5))
+# 마지막 확인이 이보다 오래되면 (검사 스레드가 멈춘 경우) not ready
+HEALTH_STALE_AFTER = float(os.getenv('HEALTH_STALE_AFTER', HEALTH_CHECK_INTERVAL * 3))
+
+HealthSnapshot = namedtuple('HealthSnapshot', 'ok error checked_at duration')
+
+
+class HealthMonitor:
+    """주기적으로 check()를 실행해 최근 결과를 보관
+
+    check는 인자 없이 호출되며 실패 시 예외를 던지는 함수입니다.
+    """
+
+    def __init__(self, check, interval=HEALTH_CHECK_INTERVAL, stale_after=HEALTH_STALE_AFTER,
+                 clock=time.monotonic):
+        self.check = check
+        self.interval = interval
+        self.stale_after = stale_after
+        self.clock = clock
+        self._snapshot = None
+        self._gate = None
+        self._thread = None
+        self._pid = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+
+    def wait_for(self, gate):
+        """gate()가 참이 될 때까지 not ready (예: 시작 워밍업 완료)"""
+        self._gate = gate
+
+    @property
+    def started(self):
+        """ready 판단 전에 끝나야 하는 시작 작업이 끝났는지"""
+        return self._gate is None or self._gate()
+
+    def snapshot(self):
+        """마지막 검사 결과 (아직 없으면 None)"""
+        return self._snapshot
+
+    def record(self, error=None, duration=0.0):
+        """검사 결과 저장 (asgi처럼 검사를 직접 돌리는 경우에도 사용)"""
+        self._snapshot = HealthSnapshot(error is None, error, self.clock(), duration)
+        DB_HEALTH_UP.set(1 if error is None else 0)
+        return self._snapshot
+
+    def refresh(self):
+        """check()를 한 번 실행하고 결과 저장"""
+        start = time.perf_counter()
+        try:
+            self.check()
+            error = None
+        except Exception as e:
+            error = str(e) or type(e).__name__
+            logger.warning(f"Background health check failed: {error}")
+        return self.record(error, time.perf_counter() - start)
+
+    def age(self, snapshot=None):
+        snapshot = snapshot or self._snapshot
+        return None if snapshot is None else self.clock() - snapshot.checked_at
+
+    def is_ready(self):
+        """시작 작업이 끝났고 마지막 검사가 성공했으며 오래되지 않았는지"""
+        snapshot = self._snapshot
+        return self.started and snapshot is not None and snapshot.ok and self.age(snapshot) <= self.stale_after
+
+    def status(self):
+        """/readyz 응답 본문"""
+        snapshot = self._snapshot
+        if snapshot is None:
+            return {'status': 'starting', 'database': 'unknown'}
+        if self.is_ready():
+            status = 'ready'
+        else:
+            status = 'not_ready' if self.started else 'warming_up'
+        body = {
+            'status': status,
+            'database': 'connected' if snapshot.ok else 'disconnected',
+            'checked_ago': round(self.age(snapshot), 3),
+            'check_duration': round(snapshot.duration, 6),
+        }
+        if snapshot.error:
+            body['error'] = snapshot.error
+        return body
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.refresh()
+            self._stop.wait(self.interval)
+
+    def start(self):
+        """검사 스레드 시작 (이미 돌고 있으면 무시, fork 후 자식에서는 새로 시작)"""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+                return
+            self._stop = threading.Event()
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name='health-monitor', daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout=None):
+        """검사 스레드 종료"""
+        self._stop.set()
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread() and self._pid == os.getpid():
+            thread.join(timeout)
+        self._thread = None
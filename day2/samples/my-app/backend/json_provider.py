@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+빠른 JSON 직렬화
+
+orjson이 설치되어 있으면 사용하고, 없으면 표준 json으로 동작합니다.
+두 경우 모두 datetime/date는 ISO 8601 문자열로 직렬화되므로 핸들러에서 행마다 isoformat()을 호출할 필요가 없습니다.
+"""
+
+import json
+from datetime import date, datetime
+from decimal import Decimal
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson 미설치 환경
+    orjson = None
+
+JSON_BACKEND = 'orjson' if orjson else 'json'
+
+# 직렬화기가 datetime을 직접 처리하는지 여부 (표준 json은 default 콜백을 거쳐 느림)
+NATIVE_DATETIME = orjson is not None
+
+
+def _default(obj):
+    """표준 json이 모르는 타입 처리"""
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if hasattr(obj, '__html__'):
+        return str(obj.__html__())
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+if orjson:
+    # dict/str/int 하위 클래스(OrderedDict, Counter, str Enum 등)는 orjson이 그대로 직렬화
+    _ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+    def dumps_bytes(obj):
+        """obj를 UTF-8 JSON bytes로 직렬화"""
+        return orjson.dumps(obj, default=_default, option=_ORJSON_OPTIONS)
+else:
+    def dumps_bytes(obj):
+        """obj를 UTF-8 JSON bytes로 직렬화"""
+        return json.dumps(obj, default=_default, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def dumps(obj):
+    """obj를 JSON 문자열로 직렬화"""
+    return dumps_bytes(obj).decode('utf-8')
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """Flask JSON 프로바이더 (jsonify / request.get_json 에서 사용)"""
+
+    def dumps(self, obj, **kwargs):
+        if kwargs.get('indent'):
+            kwargs.setdefault('default', _default)
+            kwargs.setdefault('ensure_ascii', False)
+            return json.dumps(obj, **kwargs)
+        return dumps(obj)
+
+    def loads(self, s, **kwargs):
+        if orjson and not kwargs:
+            return orjson.loads(s)
+        return json.loads(s, **kwargs)
+
+    def response(self, *args, **kwargs):
+        """직렬화 결과 bytes를 그대로 응답 본문으로 사용"""
+        obj = self._prepare_response_obj(args, kwargs)
+        if (self.compact is None and self._app.debug) or self.compact is False:
+            body = self.dumps(obj, indent=2).encode('utf-8')
+        else:
+            body = dumps_bytes(obj)
+        return self._app.response_class(body + b'\n', mimetype=self.mimetype)
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+My App Backend - 프로덕션 런처
+
+Flask 개발 서버(app.run) 대신 gunicorn.conf.py 설정으로 gunicorn을 실행합니다.
+워커/스레드 수는 컨테이너 cgroup CPU 쿼터 기준으로 계산합니다.
+
+실행:
+    python launcher.py            # gunicorn -c gunicorn.conf.py app:app 과 동일
+    python launcher.py --print    # 계산된 워커/스레드 수만 출력
+"""
+
+import os
+import sys
+import math
+import shutil
+import logging
+import tempfile
+
+logger = logging.getLogger(__name__)
+
+CGROUP_V2_CPU_MAX = '/sys/fs/cgroup/cpu.max'
+CGROUP_V1_QUOTA = '/sys/fs/cgroup/cpu/cpu.cfs_quota_us'
+CGROUP_V1_PERIOD = '/sys/fs/cgroup/cpu/cpu.cfs_period_us'
+
+DEFAULT_THREADS = 4
+DEFAULT_MAX_WORKERS = 12
+# /livez, /readyz, /metrics용으로 남겨 두는 워커당 스레드 수
+DEFAULT_OPS_THREADS = 1
+# admission.py의 heavy max_limit 기본값 (launcher는 Flask를 import 하지 않으므로 따로 둠)
+HEAVY_MAX_LIMIT = 4
+
+DEFAULT_METRICS_DIR = os.path.join(
+    '/dev/shm' if os.path.isdir('/dev/shm') else tempfile.gettempdir(), 'myapp-metrics'
+)
+
+
+def _read(path):
+    try:
+        with open(path) as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+def cgroup_cpu_limit(root=''):
+    """cgroup CPU 쿼터를 코어 수(소수 가능)로 반환, 제한이 없으면 None"""
+    cpu_max = _read(root + CGROUP_V2_CPU_MAX)
+    if cpu_max:
+        quota, _, period = cpu_max.partition(' ')
+        if quota != 'max' and period:
+            return int(quota) / int(period)
+        return None
+
+    quota = _read(root + CGROUP_V1_QUOTA)
+    period = _read(root + CGROUP_V1_PERIOD)
+    if quota and period and int(quota) > 0:
+        return int(quota) / int(period)
+    return None
+
+
+def available_cpus(root=''):
+    """프로세스가 실제로 쓸 수 있는 CPU 수 (쿼터와 affinity 중 작은 값)"""
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+
+    limit = cgroup_cpu_limit(root)
+    if limit is not None:
+        return min(float(cpus), limit)
+    return float(cpus)
+
+
+def recommended_workers(cpus, max_workers=DEFAULT_MAX_WORKERS):
+    """(2 x CPU) + 1 규칙, 최소 2 / 최대 max_workers"""
+    return max(2, min(int(math.ceil(cpus * 2)) + 1, max_workers))
+
+
+def worker_settings(environ=os.environ, root=''):
+    """환경 변수 우선, 없으면 CPU 쿼터로 계산한 (workers, threads)"""
+    if environ.get('GUNICORN_WORKERS') or environ.get('WEB_CONCURRENCY'):
+        workers = int(environ.get('GUNICORN_WORKERS') or environ['WEB_CONCURRENCY'])
+    else:
+        max_workers = int(environ.get('GUNICORN_MAX_WORKERS', DEFAULT_MAX_WORKERS))
+        workers = recommended_workers(available_cpus(root), max_workers)
+
+    threads = int(environ.get('GUNICORN_THREADS', DEFAULT_THREADS))
+    return workers, threads
+
+
+def load_worker_processes(cpus, workers):
+    """gunicorn 워커 하나가 만들 부하 프로세스 수 (모든 워커를 합쳐 CPU 수 정도, 최소 1)"""
+    return max(int(cpus) // max(workers, 1), 1)
+
+
+def admission_settings(threads, ops_threads=DEFAULT_OPS_THREADS):
+    """gthread 스레드 수에 맞춘 api/heavy 수락 제어 환경 변수 (ADMISSION_<CLASS>_<KEY>)
+
+    api + heavy 동시 처리 한도 합이 threads - ops_threads를 넘지 않게 해서 남은 스레드로
+    /livez, /readyz, /metrics가 항상 처리되게 합니다.
+    대기열에서 기다리는 요청도 스레드를 점유하므로 api/heavy 대기열은 0 (넘치면 바로 503).
+    """
+    # 스레드가 너무 적으면 api/heavy에 최소 1개씩은 줌 (이때는 ops 예약을 보장하지 못함)
+    budget = max(threads - ops_threads, 2)
+    heavy = max(1, min(HEAVY_MAX_LIMIT, budget // 4))
+    api = budget - heavy
+    return {
+        'ADMISSION_API_LIMIT': str(api),
+        'ADMISSION_API_MIN_LIMIT': str(min(2, api)),
+        'ADMISSION_API_MAX_LIMIT': str(api),
+        'ADMISSION_API_MAX_QUEUE': '0',
+        'ADMISSION_HEAVY_LIMIT': str(heavy),
+        'ADMISSION_HEAVY_MIN_LIMIT': '1',
+        'ADMISSION_HEAVY_MAX_LIMIT': str(heavy),
+        'ADMISSION_HEAVY_MAX_QUEUE': '0',
+    }
+
+
+def prepare_metrics_dir(path):
+    """Prometheus 멀티프로세스 디렉터리를 비우고 다시 생성
+
+    이전 실행의 죽은 워커 파일이 남아 있으면 카운터가 이중으로 합산되므로
+    gunicorn을 띄우기 전에 한 번만 정리합니다.
+    """
+    if os.path.isdir(path):
+        shutil.rmtree(path)
+    os.makedirs(path, exist_ok=True)
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if '--print' in argv:
+        workers, threads = worker_settings()
+        print(f"cpus={available_cpus():g} workers={workers} threads={threads}")
+        return
+
+    metrics_dir = os.environ.setdefault('PROMETHEUS_MULTIPROC_DIR', DEFAULT_METRICS_DIR)
+    prepare_metrics_dir(metrics_dir)
+
+    config = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'gunicorn.conf.py')
+    os.execvp('gunicorn', ['gunicorn', '--config', config, *argv, 'app:app'])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+부하 생성 작업 (/api/load)
+
+요청 스레드에서 CPU 루프를 돌리면 워커 하나가 통째로 빠지고 GIL 때문에 다른 스레드도 굶습니다.
+부하는 코어 수에 맞춘 별도 프로세스 풀(ProcessPoolExecutor)에서 돌리고 엔드포인트는 바로 반환합니다.
+- 풀 크기: LOAD_WORKERS (gunicorn에서는 CPU 수 / 워커 수, 단독 실행 시 CPU 수)
+- 목표 CPU 사용률: 코어당 cpu_percent%만큼만 계산하고 나머지는 sleep (duty cycle)
+- 최대 시간: LOAD_MAX_DURATION초를 넘는 요청은 잘라냄
+- 비동기 작업: 시작 → 상태 조회 → 취소 (공유 플래그로 0.1초 안에 협조적으로 중단)
+- 동시에 예약할 수 있는 작업 단위는 LOAD_MAX_TASKS개로 제한
+- CPU 외 프로필(memory/disk/db/latency, load_profiles)은 워커 프로세스의 스레드 풀에서 실행,
+  동시에 LOAD_MAX_PROFILE_JOBS개까지
+- 모든 프로필은 ramp_up / ramp_down / shape를 받고, 주입 중인 양을 게이지로 내보냄
+"""
+
+import os
+import time
+import uuid
+import logging
+import threading
+import multiprocessing
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import cpu_burn
+import load_profiles
+from launcher import available_cpus
+from load_profiles import GaugeShare, LatencyInjector, drive, shape_params, validate_profile
+from metrics import LOAD_CPU_PERCENT, LOAD_JOBS
+
+logger = logging.getLogger(__name__)
+
+LOAD_MAX_DURATION = float(os.getenv('LOAD_MAX_DURATION', 300))
+LOAD_WORKERS = int(os.getenv('LOAD_WORKERS', 0)) or max(int(available_cpus()), 1)
+LOAD_MAX_TASKS = int(os.getenv('LOAD_MAX_TASKS', LOAD_WORKERS * 2))
+LOAD_JOB_HISTORY = int(os.getenv('LOAD_JOB_HISTORY', 50))
+LOAD_MAX_PROFILE_JOBS = int(os.getenv('LOAD_MAX_PROFILE_JOBS', 4))
+
+PROFILES = ('cpu', 'memory', 'disk', 'db', 'latency')
+
+
+class LoadRejected(Exception):
+    """예약 가능한 작업 단위가 없음"""
+
+
+class LoadJob:
+    """부하 작업 하나 (작업 단위 future 여러 개)"""
+
+    def __init__(self, job_id, kind, params, created_at):
+        self.id = job_id
+        self.kind = kind
+        self.params = params
+        self.created_at = created_at
+        self.finished_at = None
+        self.futures = []
+        self.slots = []
+        self.cancel_requested = False
+        # 스레드 프로필과 CPU 게이지 드라이버의 중단 신호
+        self.stop = threading.Event()
+
+    @property
+    def done(self):
+        return all(f.done() for f in self.futures)
+
+    @property
+    def status(self):
+        if self.done:
+            if self.cancel_requested:
+                return 'cancelled'
+            if any(not f.cancelled() and f.exception() is not None for f in self.futures):
+                return 'failed'
+            return 'completed'
+        if any(f.running() or f.done() for f in self.futures):
+            return 'cancelling' if self.cancel_requested else 'running'
+        return 'queued'
+
+    def results(self):
+        return [f.result() for f in self.futures if f.done() and not f.cancelled() and f.exception() is None]
+
+    def to_dict(self):
+        body = {
+            'id': self.id,
+            'kind': self.kind,
+            'status': self.status,
+            'params': self.params,
+            'created_at': self.created_at,
+            'finished_at': self.finished_at,
+        }
+        results = self.results()
+        if results and self.kind == 'cpu':
+            body['result'] = {
+                'tasks': len(results),
+                'cpu_seconds': round(sum(r['cpu_seconds'] for r in results), 3),
+                'elapsed': round(max(r['elapsed'] for r in results), 3),
+            }
+        elif results:
+            body['result'] = {k: round(v, 3) if isinstance(v, float) else v for k, v in results[0].items()}
+        errors = [str(f.exception()) for f in self.futures if f.done() and not f.cancelled() and f.exception()]
+        if errors:
+            body['error'] = errors[0]
+        return body
+
+
+class LoadJobManager:
+    """프로세스 풀과 작업 목록 관리
+
+    풀은 처음 작업을 시작할 때 만들고 (gunicorn preload 후 fork된 워커마다 따로),
+    멀티스레드 워커에서 fork 하지 않도록 spawn 컨텍스트를 씁니다.
+    """
+
+    def __init__(self, max_workers=LOAD_WORKERS, max_tasks=LOAD_MAX_TASKS, max_duration=LOAD_MAX_DURATION,
+                 history=LOAD_JOB_HISTORY, max_profile_jobs=LOAD_MAX_PROFILE_JOBS, latency=None, runners=None,
+                 clock=time.time):
+        self.max_workers = max_workers
+        self.max_tasks = max(max_tasks, max_workers)
+        self.max_duration = max_duration
+        self.history = history
+        self.max_profile_jobs = max_profile_jobs
+        # 앱에 before_request 훅으로 등록할 지연 주입기
+        self.latency = latency or LatencyInjector()
+        self.runners = runners or {
+            'memory': load_profiles.run_memory,
+            'disk': load_profiles.run_disk,
+            'db': load_profiles.run_db,
+            'latency': lambda params, stop, job_id: load_profiles.run_latency(params, stop, self.latency, job_id),
+        }
+        self.clock = clock
+        self._jobs = OrderedDict()
+        self._free_slots = list(range(self.max_tasks))
+        self._executor = None
+        self._threads = None
+        self._threads_pid = None
+        self._cancel_flags = None
+        self._pid = None
+        # future.cancel()이 잠금을 잡은 채 완료 콜백을 바로 호출하므로 재진입 가능해야 함
+        self._lock = threading.RLock()
+
+    def _pool(self):
+        """현재 프로세스의 프로세스 풀 (없으면 생성)"""
+        if self._executor is None or self._pid != os.getpid():
+            context = multiprocessing.get_context('spawn')
+            self._cancel_flags = context.Array('b', self.max_tasks, lock=False)
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers, mp_context=context,
+                initializer=cpu_burn.init_worker, initargs=(self._cancel_flags,),
+            )
+            self._free_slots = list(range(self.max_tasks))
+            self._pid = os.getpid()
+        return self._executor
+
+    def _thread_pool(self):
+        """현재 프로세스의 프로필 스레드 풀 (없으면 생성)"""
+        if self._threads is None or self._threads_pid != os.getpid():
+            self._threads = ThreadPoolExecutor(max_workers=self.max_profile_jobs, thread_name_prefix='load-profile')
+            self._threads_pid = os.getpid()
+        return self._threads
+
+    def validate_cpu(self, cpu_percent, duration, workers):
+        """파라미터 검사 후 (cpu_percent, duration, workers) 반환 (duration/workers는 상한으로 잘라냄)"""
+        cpu_percent, duration, workers = float(cpu_percent), float(duration), int(workers)
+        if not 0 < cpu_percent <= 100:
+            raise ValueError('cpu_percent must be between 0 and 100')
+        if duration <= 0:
+            raise ValueError('duration must be positive')
+        if workers < 1:
+            raise ValueError('workers must be at least 1')
+        return cpu_percent, min(duration, self.max_duration), min(workers, self.max_workers)
+
+    def start(self, profile, data):
+        """프로필 이름과 요청 본문으로 작업 시작"""
+        if profile == 'cpu':
+            shape = shape_params(data, self.max_duration)
+            return self.start_cpu(
+                data.get('cpu_percent', 100), shape['duration'], data.get('workers', 1),
+                shape['ramp_up'], shape['ramp_down'], shape['shape'],
+            )
+        if profile not in self.runners:
+            raise ValueError(f"profile must be one of {', '.join(PROFILES)}")
+        return self.start_profile(profile, validate_profile(profile, data, self.max_duration))
+
+    def _remember(self, job):
+        """작업 등록 (오래된 완료 작업부터 정리)"""
+        self._jobs[job.id] = job
+        while len(self._jobs) > self.history:
+            oldest = next((j for j in self._jobs.values() if j.done), None)
+            if oldest is None:
+                break
+            del self._jobs[oldest.id]
+
+    def _on_task_done(self, job, slot):
+        def callback(future):
+            with self._lock:
+                if self._cancel_flags is not None:
+                    self._cancel_flags[slot] = 0
+                self._free_slots.append(slot)
+                self._finish(job)
+        return callback
+
+    def _finish(self, job):
+        if job.done and job.finished_at is None:
+            job.finished_at = self.clock()
+            job.stop.set()
+            LOAD_JOBS.labels(kind=job.kind, status=job.status).inc()
+
+    def start_cpu(self, cpu_percent=100, duration=10, workers=1, ramp_up=0.0, ramp_down=0.0, shape='linear'):
+        """CPU 부하 작업 시작 (바로 반환)"""
+        cpu_percent, duration, workers = self.validate_cpu(cpu_percent, duration, workers)
+        with self._lock:
+            pool = self._pool()
+            if len(self._free_slots) < workers:
+                LOAD_JOBS.labels(kind='cpu', status='rejected').inc()
+                raise LoadRejected(f"Only {len(self._free_slots)} load task slots are free")
+            job = LoadJob(uuid.uuid4().hex[:12], 'cpu', {
+                'cpu_percent': cpu_percent, 'duration': duration, 'workers': workers,
+                'ramp_up': ramp_up, 'ramp_down': ramp_down, 'shape': shape,
+            }, self.clock())
+            for _ in range(workers):
+                slot = self._free_slots.pop()
+                self._cancel_flags[slot] = 0
+                job.slots.append(slot)
+                job.futures.append(pool.submit(
+                    cpu_burn.burn_cpu, slot, cpu_percent, duration, ramp_up, ramp_down, shape,
+                ))
+            self._remember(job)
+        for slot, future in zip(job.slots, job.futures):
+            future.add_done_callback(self._on_task_done(job, slot))
+        threading.Thread(target=self._drive_cpu_gauge, args=(job,), name=f'load-cpu-{job.id}', daemon=True).start()
+        logger.info(f"Started load job {job.id}: {job.params}")
+        return job
+
+    def _drive_cpu_gauge(self, job):
+        """자식 프로세스와 같은 일정으로 주입 중인 CPU%를 게이지에 반영"""
+        share = GaugeShare(LOAD_CPU_PERCENT)
+        peak = job.params['cpu_percent'] * job.params['workers']
+        try:
+            drive(job.params, job.stop, lambda level, dt: share.set(peak * level))
+        finally:
+            share.set(0)
+
+    def start_profile(self, profile, params):
+        """스레드 프로필 작업 시작 (params는 validate_profile 결과)"""
+        with self._lock:
+            running = sum(1 for j in self._jobs.values() if j.kind != 'cpu' and not j.done)
+            if running >= self.max_profile_jobs:
+                LOAD_JOBS.labels(kind=profile, status='rejected').inc()
+                raise LoadRejected(f"{running} profile load jobs are already running")
+            job = LoadJob(uuid.uuid4().hex[:12], profile, params, self.clock())
+            run = self.runners[profile]
+            args = (params, job.stop, job.id) if profile == 'latency' else (params, job.stop)
+            job.futures.append(self._thread_pool().submit(run, *args))
+            self._remember(job)
+        job.futures[0].add_done_callback(lambda future: self._finish(job))
+        logger.info(f"Started {profile} load job {job.id}: {params}")
+        return job
+
+    def get(self, job_id):
+        return self._jobs.get(job_id)
+
+    def jobs(self):
+        return list(self._jobs.values())
+
+    def cancel(self, job_id):
+        """작업 취소 (대기 중이면 제거, 실행 중이면 취소 플래그 설정, 이미 끝났으면 그대로 반환)"""
+        job = self._jobs.get(job_id)
+        if job is None or job.done:
+            return job
+        job.cancel_requested = True
+        job.stop.set()
+        with self._lock:
+            for slot, future in zip(job.slots, job.futures):
+                if not future.cancel() and self._cancel_flags is not None and self._pid == os.getpid():
+                    self._cancel_flags[slot] = 1
+        return job
+
+    def shutdown(self):
+        """모든 작업 취소 후 풀 종료 (워커 종료 시)"""
+        for job in self.jobs():
+            if not job.done:
+                self.cancel(job.id)
+        if self._threads is not None and self._threads_pid == os.getpid():
+            self._threads.shutdown(wait=True, cancel_futures=True)
+            self._threads = None
+        if self._executor is not None and self._pid == os.getpid():
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+"""
+합성 부하 프로필 (autoscaling 훈련용)
+
+CPU 외에 메모리, 디스크 I/O, DB 부하, 응답 지연에 반응하는 스케일링 정책을 확인할 수 있도록
+프로필별 부하를 워커 프로세스 안의 스레드에서 만듭니다 (CPU는 load_jobs의 프로세스 풀).
+- memory: N MB 밸러스트를 잡고 유지
+- disk: 임시 파일에 초당 N MB 쓰기 + fsync (파일은 LOAD_IO_FILE_MAX에서 되감아 디스크를 채우지 않음)
+- db: users 테이블에 초당 N개 조회 (전용 연결 사용, 앱 풀과 별도)
+- latency: /api/ 요청에 N ms 지연 주입
+
+모든 프로필은 ramp_up / ramp_down / shape(load_shapes)를 따르고,
+지금 주입 중인 양을 Prometheus 게이지로 내보내 스케일링 반응과 자극을 나란히 볼 수 있습니다.
+"""
+
+import os
+import time
+import random
+import tempfile
+import threading
+
+import psycopg2
+
+from db_pool import dsn_from_env
+from load_shapes import SHAPES, load_level
+from metrics import LOAD_DB_QPS, LOAD_DISK_BYTES_PER_SECOND, LOAD_LATENCY_SECONDS, LOAD_MEMORY_BYTES
+from pagination import DEFAULT_PAGE_SIZE, build_page_query
+from stats import NEW_USERS_TODAY_SQL, TOTAL_USERS_SQL
+
+TICK_SECONDS = 0.1
+MEGABYTE = 1024 * 1024
+
+LOAD_MAX_MEMORY_MB = float(os.getenv('LOAD_MAX_MEMORY_MB', 1024))
+LOAD_MAX_DISK_MBPS = float(os.getenv('LOAD_MAX_DISK_MBPS', 200))
+LOAD_IO_DIR = os.getenv('LOAD_IO_DIR') or tempfile.gettempdir()
+LOAD_IO_FILE_MAX = int(float(os.getenv('LOAD_IO_FILE_MAX_MB', 64)) * MEGABYTE)
+LOAD_MAX_DB_QPS = float(os.getenv('LOAD_MAX_DB_QPS', 500))
+LOAD_MAX_DB_CONNECTIONS = int(os.getenv('LOAD_MAX_DB_CONNECTIONS', 8))
+LOAD_MAX_LATENCY_MS = float(os.getenv('LOAD_MAX_LATENCY_MS', 5000))
+
+# 지연 주입에서 제외 (부하 작업 취소/조회는 항상 빠르게)
+LATENCY_EXEMPT_PREFIXES = ('/api/load',)
+
+DB_STORM_QUERIES = (
+    ('users_page', build_page_query(DEFAULT_PAGE_SIZE)),
+    ('users_count_today', (NEW_USERS_TODAY_SQL, ())),
+    ('users_total_count', (TOTAL_USERS_SQL['count'], ())),
+)
+
+
+def shape_params(data, max_duration):
+    """duration / ramp_up / ramp_down / shape 검사"""
+    duration = min(float(data.get('duration', 60)), max_duration)
+    ramp_up = float(data.get('ramp_up', 0))
+    ramp_down = float(data.get('ramp_down', 0))
+    shape = data.get('shape', 'linear')
+    if duration <= 0:
+        raise ValueError('duration must be positive')
+    if ramp_up < 0 or ramp_down < 0:
+        raise ValueError('ramp_up and ramp_down must not be negative')
+    if shape not in SHAPES:
+        raise ValueError(f"shape must be one of {', '.join(SHAPES)}")
+    return {'duration': duration, 'ramp_up': ramp_up, 'ramp_down': ramp_down, 'shape': shape}
+
+
+def bounded(data, key, default, upper, lower=0.0):
+    """lower < 값 <= upper 검사"""
+    value = float(data.get(key, default))
+    if not lower < value <= upper:
+        raise ValueError(f"{key} must be greater than {lower:g} and at most {upper:g}")
+    return value
+
+
+class GaugeShare:
+    """여러 작업이 같은 게이지에 더하는 몫 (끝나면 0으로 되돌림)"""
+
+    def __init__(self, gauge):
+        self.gauge = gauge
+        self.value = 0.0
+
+    def set(self, value):
+        self.gauge.inc(value - self.value)
+        self.value = value
+
+
+def drive(params, stop, apply, clock=time.monotonic, tick=TICK_SECONDS):
+    """duration 동안 tick마다 apply(부하 비율, 지난 tick 길이) 호출, (취소 여부, 경과 시간) 반환"""
+    start = last = clock()
+    while True:
+        now = clock()
+        elapsed = now - start
+        if stop.is_set() or elapsed >= params['duration']:
+            return stop.is_set(), elapsed
+        apply(load_level(elapsed, params['duration'], params['ramp_up'], params['ramp_down'], params['shape']), now - last)
+        last = now
+        stop.wait(tick)
+
+
+class MemoryBallast:
+    """1MB 조각 목록으로 잡은 메모리 (페이지를 실제로 쓰도록 0이 아닌 값으로 채움)"""
+
+    def __init__(self):
+        self.chunks = []
+
+    @property
+    def size_bytes(self):
+        return len(self.chunks) * MEGABYTE
+
+    def resize(self, megabytes):
+        target = int(round(megabytes))
+        while len(self.chunks) < target:
+            self.chunks.append(bytearray(b'\x01') * MEGABYTE)
+        del self.chunks[target:]
+
+
+def run_memory(params, stop):
+    """메모리 밸러스트 프로필"""
+    ballast, share = MemoryBallast(), GaugeShare(LOAD_MEMORY_BYTES)
+    peak = 0
+
+    def apply(level, dt):
+        nonlocal peak
+        ballast.resize(params['megabytes'] * level)
+        share.set(ballast.size_bytes)
+        peak = max(peak, ballast.size_bytes)
+
+    try:
+        cancelled, elapsed = drive(params, stop, apply)
+    finally:
+        ballast.resize(0)
+        share.set(0)
+    return {'cancelled': cancelled, 'elapsed': elapsed, 'peak_bytes': peak}
+
+
+def run_disk(params, stop):
+    """디스크 쓰기 처리량 프로필"""
+    share = GaugeShare(LOAD_DISK_BYTES_PER_SECOND)
+    block = os.urandom(256 * 1024)
+    written = 0
+
+    with tempfile.TemporaryFile(dir=params['directory'], prefix='myapp-load-') as f:
+        def apply(level, dt):
+            nonlocal written
+            rate = params['mb_per_second'] * MEGABYTE * level
+            share.set(rate)
+            due = int(rate * (dt or TICK_SECONDS))
+            while due > 0:
+                if f.tell() >= LOAD_IO_FILE_MAX:
+                    f.seek(0)
+                chunk = block[:due]
+                f.write(chunk)
+                written += len(chunk)
+                due -= len(chunk)
+            f.flush()
+            os.fsync(f.fileno())
+
+        try:
+            cancelled, elapsed = drive(params, stop, apply)
+        finally:
+            share.set(0)
+    return {'cancelled': cancelled, 'elapsed': elapsed, 'bytes_written': written}
+
+
+def run_db(params, stop, connect=None):
+    """users 테이블 조회 폭주 프로필
+
+    connections개 스레드가 각자 전용 연결로, 드라이버가 tick마다 나눠 주는 토큰만큼 쿼리를 실행합니다.
+    """
+    connect = connect or (lambda: psycopg2.connect(**dsn_from_env()))
+    share = GaugeShare(LOAD_DB_QPS)
+    tokens = threading.Semaphore(0)
+    finished = threading.Event()
+    counts = {'queries': 0, 'errors': 0}
+    lock = threading.Lock()
+    pending = 0
+
+    def worker(offset):
+        nonlocal pending
+        conn = None
+        try:
+            conn = connect()
+            conn.autocommit = True
+            index = offset
+            while not finished.is_set():
+                if not tokens.acquire(timeout=TICK_SECONDS):
+                    continue
+                with lock:
+                    pending -= 1
+                _, (sql, args) = DB_STORM_QUERIES[index % len(DB_STORM_QUERIES)]
+                index += 1
+                try:
+                    with conn.cursor() as cursor:
+                        cursor.execute(sql, args)
+                        cursor.fetchall()
+                    key = 'queries'
+                except psycopg2.Error:
+                    key = 'errors'
+                with lock:
+                    counts[key] += 1
+        except Exception:
+            with lock:
+                counts['errors'] += 1
+        finally:
+            if conn is not None:
+                conn.close()
+
+    carry = 0.0
+
+    def apply(level, dt):
+        nonlocal carry, pending
+        rate = params['qps'] * level
+        share.set(rate)
+        carry += rate * (dt or TICK_SECONDS)
+        due, carry = int(carry), carry - int(carry)
+        with lock:
+            # 쿼리가 밀리면 토큰을 쌓아 두지 않음 (1초 분량까지만)
+            due = max(min(due, int(params['qps']) - pending), 0)
+            pending += due
+        for _ in range(due):
+            tokens.release()
+
+    threads = [threading.Thread(target=worker, args=(i,), daemon=True) for i in range(params['connections'])]
+    for t in threads:
+        t.start()
+    try:
+        cancelled, elapsed = drive(params, stop, apply)
+    finally:
+        finished.set()
+        share.set(0)
+        for t in threads:
+            t.join(5)
+    return {'cancelled': cancelled, 'elapsed': elapsed, **counts}
+
+
+class LatencyInjector:
+    """진행 중인 latency 프로필의 지연을 요청에 주입하는 Flask before_request 훅"""
+
+    def __init__(self, app=None, sleep=time.sleep, rand=random.random):
+        self.sleep = sleep
+        self.rand = rand
+        # 작업 id -> (지연 초, 확률, 경로 접두사)
+        self.active = {}
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.before_request(self.before_request)
+
+    def update(self, job_id, delay, probability, prefix):
+        with self._lock:
+            self.active[job_id] = (delay, probability, prefix)
+            LOAD_LATENCY_SECONDS.set(max(d for d, _, _ in self.active.values()))
+
+    def remove(self, job_id):
+        with self._lock:
+            self.active.pop(job_id, None)
+            LOAD_LATENCY_SECONDS.set(max((d for d, _, _ in self.active.values()), default=0))
+
+    def delay_for(self, path):
+        """path에 적용할 지연 (해당 없으면 0)"""
+        if not self.active or path.startswith(LATENCY_EXEMPT_PREFIXES):
+            return 0.0
+        delay = 0.0
+        for d, probability, prefix in list(self.active.values()):
+            if path.startswith(prefix) and self.rand() < probability:
+                delay = max(delay, d)
+        return delay
+
+    def before_request(self):
+        from flask import request
+
+        delay = self.delay_for(request.path)
+        if delay > 0:
+            self.sleep(delay)
+
+
+def run_latency(params, stop, injector, job_id):
+    """응답 지연 주입 프로필"""
+    def apply(level, dt):
+        injector.update(job_id, params['latency_ms'] / 1000 * level, params['probability'], params['path_prefix'])
+
+    try:
+        cancelled, elapsed = drive(params, stop, apply)
+    finally:
+        injector.remove(job_id)
+    return {'cancelled': cancelled, 'elapsed': elapsed}
+
+
+def validate_profile(profile, data, max_duration):
+    """프로필별 파라미터 검사 후 정규화된 dict 반환"""
+    params = shape_params(data, max_duration)
+    if profile == 'memory':
+        params['megabytes'] = bounded(data, 'megabytes', 256, LOAD_MAX_MEMORY_MB)
+    elif profile == 'disk':
+        params['mb_per_second'] = bounded(data, 'mb_per_second', 10, LOAD_MAX_DISK_MBPS)
+        params['directory'] = LOAD_IO_DIR
+    elif profile == 'db':
+        params['qps'] = bounded(data, 'qps', 50, LOAD_MAX_DB_QPS)
+        params['connections'] = int(bounded(data, 'connections', 2, LOAD_MAX_DB_CONNECTIONS))
+    elif profile == 'latency':
+        params['latency_ms'] = bounded(data, 'latency_ms', 200, LOAD_MAX_LATENCY_MS)
+        params['probability'] = bounded(data, 'probability', 1.0, 1.0)
+        params['path_prefix'] = str(data.get('path_prefix', '/api/'))
+    else:
+        raise ValueError(f"Unknown load profile: {profile}")
+    return params
+
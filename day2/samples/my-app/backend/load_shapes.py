@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+부하 프로필 모양 (ramp-up / 유지 / ramp-down)
+
+cpu_burn 자식 프로세스에서도 import 하므로 표준 라이브러리만 사용합니다.
+"""
+
+import math
+
+SHAPES = ('linear', 'smooth', 'step')
+STEP_COUNT = 4
+
+
+def ramp_fraction(elapsed, duration, ramp_up=0.0, ramp_down=0.0):
+    """0~1 진행률: ramp_up 동안 0→1, 유지 구간 1, 마지막 ramp_down 동안 1→0"""
+    if elapsed < 0 or elapsed >= duration:
+        return 0.0
+    # 두 구간이 전체 시간을 넘으면 비율대로 줄임
+    total = ramp_up + ramp_down
+    if total > duration:
+        ramp_up, ramp_down = ramp_up * duration / total, ramp_down * duration / total
+    if ramp_up > 0 and elapsed < ramp_up:
+        return elapsed / ramp_up
+    remaining = duration - elapsed
+    if ramp_down > 0 and remaining < ramp_down:
+        return remaining / ramp_down
+    return 1.0
+
+
+def load_level(elapsed, duration, ramp_up=0.0, ramp_down=0.0, shape='linear'):
+    """시각 elapsed의 부하 비율 (0~1)
+
+    - linear: 직선 증감
+    - smooth: 코사인 곡선 (시작/끝이 완만)
+    - step: STEP_COUNT 단계 계단
+    """
+    x = ramp_fraction(elapsed, duration, ramp_up, ramp_down)
+    if shape == 'smooth':
+        return (1 - math.cos(math.pi * x)) / 2
+    if shape == 'step':
+        return math.ceil(x * STEP_COUNT) / STEP_COUNT
+    return x
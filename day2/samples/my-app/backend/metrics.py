@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Prometheus 메트릭 정의
+
+app.py와 DB 계층이 같은 메트릭 객체를 공유하도록 한 곳에서 정의합니다.
+
+gunicorn처럼 워커 프로세스가 여러 개이면 PROMETHEUS_MULTIPROC_DIR을 지정합니다.
+각 워커가 그 디렉터리에 값을 기록하고 /metrics는 모든 워커의 값을 합쳐서 응답합니다.
+(prometheus_client를 import 하기 전에 환경 변수가 설정되어 있어야 합니다.)
+"""
+
+import os
+import time
+from contextlib import contextmanager
+
+from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram, REGISTRY, generate_latest
+from prometheus_client import multiprocess
+
+
+def buckets_from_env(name, default):
+    """쉼표로 구분된 히스토그램 버킷 환경 변수 파싱"""
+    value = os.getenv(name)
+    if not value:
+        return default
+    return tuple(sorted(float(b) for b in value.split(',') if b.strip()))
+
+
+HTTP_DURATION_BUCKETS = buckets_from_env(
+    'HTTP_DURATION_BUCKETS',
+    (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+)
+
+# HTTP 요청 (endpoint 라벨은 라우트 템플릿, 예: /api/users)
+REQUEST_COUNT = Counter('http_requests_total', 'Total HTTP requests', ['method', 'endpoint', 'status'])
+REQUEST_DURATION = Histogram(
+    'http_request_duration_seconds', 'HTTP request duration', ['method', 'endpoint'],
+    buckets=HTTP_DURATION_BUCKETS
+)
+
+# 요청 수락 제어 (route_class: api / heavy / ops)
+ADMISSION_LIMIT = Gauge(
+    'http_admission_limit', 'Current concurrency limit per route class', ['route_class'], multiprocess_mode='livesum'
+)
+ADMISSION_IN_FLIGHT = Gauge(
+    'http_admission_in_flight', 'Admitted requests in progress', ['route_class'], multiprocess_mode='livesum'
+)
+ADMISSION_QUEUED = Gauge(
+    'http_admission_queued', 'Requests waiting for admission', ['route_class'], multiprocess_mode='livesum'
+)
+ADMISSION_REJECTED = Counter(
+    'http_admission_rejected_total', 'Requests shed with 503 by reason (queue_full/deadline)', ['route_class', 'reason']
+)
+ADMISSION_QUEUE_WAIT = Histogram(
+    'http_admission_queue_wait_seconds', 'Time queued requests waited for admission', ['route_class'],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+)
+
+# 응답 캐시
+RESPONSE_CACHE_REQUESTS = Counter(
+    'http_response_cache_total', 'Response cache lookups by result (hit/miss/not_modified/bypass)', ['route', 'result']
+)
+REQUEST_COALESCING = Counter(
+    'http_request_coalescing_total', 'Coalesced GET requests by role (leader/follower/timeout)', ['route', 'role']
+)
+RESPONSE_CACHE_BYTES = Gauge('http_response_cache_bytes', 'Bytes held in the response cache', multiprocess_mode='livesum')
+SHARED_CACHE_OPERATIONS = Counter(
+    'shared_cache_operations_total', 'Shared (Redis protocol) cache calls by operation and result', ['operation', 'result']
+)
+
+# 부하 생성 작업
+LOAD_JOBS = Counter('load_jobs_total', 'Load generation jobs by kind and final status', ['kind', 'status'])
+# 지금 주입 중인 부하 (ramp 반영, 여러 작업이면 합계 / 지연은 최댓값)
+LOAD_CPU_PERCENT = Gauge(
+    'load_cpu_percent_injected', 'Target CPU percent currently injected (sum over load tasks)', multiprocess_mode='livesum'
+)
+LOAD_MEMORY_BYTES = Gauge('load_memory_ballast_bytes', 'Memory ballast currently held', multiprocess_mode='livesum')
+LOAD_DISK_BYTES_PER_SECOND = Gauge(
+    'load_disk_io_bytes_per_second', 'Target disk write throughput currently injected', multiprocess_mode='livesum'
+)
+LOAD_DB_QPS = Gauge('load_db_queries_per_second', 'Target database query rate currently injected', multiprocess_mode='livesum')
+LOAD_LATENCY_SECONDS = Gauge(
+    'load_latency_injected_seconds', 'Request latency currently injected', multiprocess_mode='livemax'
+)
+
+# 요청 프로파일링 (trigger: sampled / header)
+PROFILED_REQUESTS = Counter('http_profiled_requests_total', 'Requests captured by the sampling profiler', ['endpoint', 'trigger'])
+PROFILE_SAMPLES = Counter('http_profile_samples_total', 'Stack samples taken by the sampling profiler')
+PROFILING_ENABLED = Gauge('http_profiling_enabled', 'Sampled request profiling switched on (1) or off (0)', multiprocess_mode='livemax')
+
+# 데이터베이스 쿼리
+DB_CONNECTION_COUNT = Counter('db_connections_total', 'Total database connections opened', ['pool'])
+DB_QUERY_DURATION = Histogram('db_query_duration_seconds', 'Database query duration', ['statement'])
+
+# prepared statement 캐시
+PREPARED_STATEMENT_HITS = Counter(
+    'db_prepared_statement_hits_total', 'Executions of an already prepared statement', ['statement']
+)
+PREPARED_STATEMENT_PREPARES = Counter(
+    'db_prepared_statement_prepares_total', 'PREPARE calls by reason (first use or re-prepare)', ['statement', 'reason']
+)
+
+# 읽기 복제본 라우팅
+DB_READ_ROUTE = Counter('db_read_routing_total', 'Read connections by target and reason', ['target', 'reason'])
+DB_REPLICA_LAG = Gauge(
+    'db_replica_lag_seconds', 'Last measured replication lag per read replica', ['replica'], multiprocess_mode='livemax'
+)
+
+# 시작 워밍업과 헬스 체크
+WARMUP_DURATION = Histogram(
+    'db_warmup_duration_seconds', 'Duration of startup warmup steps', ['step'],
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+)
+DB_HEALTH_UP = Gauge('db_health_up', 'Result of the last background database health check (1 = ok)', multiprocess_mode='livemin')
+
+# 연결 풀
+DB_POOL_SIZE = Gauge('db_pool_max_connections', 'Configured maximum pool connections', ['pool'], multiprocess_mode='livesum')
+DB_POOL_IN_USE = Gauge('db_pool_connections_in_use', 'Connections checked out of the pool', ['pool'], multiprocess_mode='livesum')
+DB_POOL_IDLE = Gauge('db_pool_connections_idle', 'Open connections idle in the pool', ['pool'], multiprocess_mode='livesum')
+DB_POOL_WAITING = Gauge('db_pool_waiting_requests', 'Requests waiting for a pool connection', ['pool'], multiprocess_mode='livesum')
+DB_POOL_CHECKOUT_DURATION = Histogram(
+    'db_pool_checkout_duration_seconds', 'Time spent waiting for a pool connection', ['pool'],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+)
+DB_POOL_EXHAUSTED = Counter(
+    'db_pool_exhausted_total', 'Checkouts rejected because the pool was saturated', ['pool', 'reason']
+)
+DB_CONNECTION_AGE = Histogram(
+    'db_connection_age_seconds', 'Age of database connections when they are closed', ['pool'],
+    buckets=(1, 10, 60, 300, 600, 1800, 3600, 7200, 86400)
+)
+
+
+@contextmanager
+def query_timer(statement):
+    """쿼리 실행 시간을 statement 라벨로 기록"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        DB_QUERY_DURATION.labels(statement=statement).observe(time.perf_counter() - start)
+
+
+def multiprocess_dir():
+    """멀티프로세스 메트릭 디렉터리 (설정되지 않았으면 None)"""
+    return os.environ.get('PROMETHEUS_MULTIPROC_DIR') or None
+
+
+def mark_worker_dead(pid):
+    """종료된 워커의 live 게이지 파일 제거
+
+    카운터/히스토그램 파일은 누적값 유지를 위해 남겨 둡니다.
+    """
+    path = multiprocess_dir()
+    if path:
+        multiprocess.mark_process_dead(pid, path)
+
+
+def collect_latest():
+    """/metrics 응답 본문 (멀티프로세스 모드면 모든 워커 값을 합산)"""
+    if multiprocess_dir():
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry)
+    return generate_latest(REGISTRY)
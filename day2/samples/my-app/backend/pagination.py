@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+사용자 목록 키셋(커서) 페이지네이션
+
+OFFSET 대신 (created_at, id) 시크 조건으로 idx_users_created_at_id 인덱스를 타므로
+클라이언트가 몇 페이지를 넘기든 조회 시간이 일정하게 유지됩니다.
+
+쿼리 전략 (QUERY_STRATEGY 환경 변수 또는 ?strategy=)
+- rows: 행을 가져와 Python에서 dict로 변환 후 직렬화
+- json: Postgres가 json_agg로 완성된 JSON 배열을 만들어 주고 Python은 그대로 응답에 붙임
+"""
+
+import os
+import base64
+import binascii
+from datetime import datetime
+
+# 페이지 크기 설정
+DEFAULT_PAGE_SIZE = int(os.getenv('USERS_PAGE_SIZE', 50))
+MAX_PAGE_SIZE = int(os.getenv('USERS_PAGE_SIZE_MAX', 500))
+
+USER_COLUMNS = 'id, name, email, created_at'
+
+QUERY_STRATEGIES = ('rows', 'json')
+QUERY_STRATEGY = os.getenv('QUERY_STRATEGY', 'rows')
+
+
+class PaginationError(ValueError):
+    """잘못된 페이지네이션 파라미터"""
+
+
+def encode_cursor(created_at, user_id):
+    """(created_at, id) 위치를 불투명한 커서 문자열로 인코딩"""
+    raw = f"{created_at.isoformat()}|{user_id}".encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor):
+    """커서 문자열을 (created_at, id) 튜플로 디코딩"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode('ascii')).decode('utf-8')
+        created_at, user_id = raw.rsplit('|', 1)
+        return datetime.fromisoformat(created_at), int(user_id)
+    except (ValueError, UnicodeError, binascii.Error) as e:
+        raise PaginationError(f"Invalid cursor: {cursor}") from e
+
+
+def parse_page_args(args):
+    """요청 파라미터에서 (limit, after, before) 추출"""
+    try:
+        limit = int(args.get('limit', DEFAULT_PAGE_SIZE))
+    except ValueError as e:
+        raise PaginationError('limit must be an integer') from e
+    if limit < 1:
+        raise PaginationError('limit must be positive')
+    limit = min(limit, MAX_PAGE_SIZE)
+
+    after = args.get('cursor') or args.get('after')
+    before = args.get('before')
+    if after and before:
+        raise PaginationError('cursor and before are mutually exclusive')
+
+    return (
+        limit,
+        decode_cursor(after) if after else None,
+        decode_cursor(before) if before else None,
+    )
+
+
+def build_page_query(limit, after=None, before=None):
+    """키셋 시크 쿼리와 파라미터 생성
+
+    다음 페이지는 (created_at, id) < 커서를 내림차순으로, 이전 페이지는
+    (created_at, id) > 커서를 오름차순으로 읽은 뒤 뒤집습니다.
+    다음 페이지 존재 여부 확인을 위해 limit + 1 행을 읽습니다.
+    """
+    if before is not None:
+        sql = (
+            f'SELECT {USER_COLUMNS} FROM users '
+            'WHERE (created_at, id) > (%s, %s) '
+            'ORDER BY created_at ASC, id ASC LIMIT %s'
+        )
+        return sql, (before[0], before[1], limit + 1)
+
+    if after is not None:
+        sql = (
+            f'SELECT {USER_COLUMNS} FROM users '
+            'WHERE (created_at, id) < (%s, %s) '
+            'ORDER BY created_at DESC, id DESC LIMIT %s'
+        )
+        return sql, (after[0], after[1], limit + 1)
+
+    sql = (
+        f'SELECT {USER_COLUMNS} FROM users '
+        'ORDER BY created_at DESC, id DESC LIMIT %s'
+    )
+    return sql, (limit + 1,)
+
+
+def build_page_json_query(limit, after=None, before=None):
+    """json_agg 전략용 쿼리 생성
+
+    build_page_query의 시크 결과를 감싸 한 행을 반환합니다:
+    (users JSON 배열 텍스트, 읽은 행 수, 첫 행 created_at, 첫 행 id, 마지막 행 created_at, 마지막 행 id)
+    배열과 경계 행은 created_at DESC, id DESC 기준입니다.
+    """
+    seek_sql, params = build_page_query(limit, after, before)
+    scan_order = 'ASC' if before is not None else 'DESC'
+    sql = (
+        'WITH fetched AS ('
+        f'SELECT s.*, row_number() OVER (ORDER BY created_at {scan_order}, id {scan_order}) AS rn '
+        f'FROM ({seek_sql}) s'
+        '), page AS (SELECT * FROM fetched WHERE rn <= %s) '
+        'SELECT '
+        "COALESCE(json_agg(json_build_object('id', id, 'name', name, 'email', email, 'created_at', created_at) "
+        "ORDER BY created_at DESC, id DESC), '[]'::json)::text, "
+        '(SELECT COUNT(*) FROM fetched), '
+        '(array_agg(created_at ORDER BY created_at DESC, id DESC))[1], '
+        '(array_agg(id ORDER BY created_at DESC, id DESC))[1], '
+        '(array_agg(created_at ORDER BY created_at ASC, id ASC))[1], '
+        '(array_agg(id ORDER BY created_at ASC, id ASC))[1] '
+        'FROM page'
+    )
+    return sql, params + (limit,)
+
+
+def page_info(limit, fetched, first, last, after=None, before=None):
+    """페이지 경계 행 (created_at, id)로 next/prev 커서 계산
+
+    fetched는 limit + 1 로 읽은 실제 행 수, first/last는 DESC 기준 첫/마지막 행이며
+    빈 페이지면 None입니다.
+    """
+    has_more = fetched > limit
+    if before is not None:
+        has_next = True
+        has_prev = has_more
+    else:
+        has_next = has_more
+        has_prev = after is not None
+
+    next_cursor = None
+    prev_cursor = None
+    if first is not None:
+        if has_next:
+            next_cursor = encode_cursor(*last)
+        if has_prev:
+            prev_cursor = encode_cursor(*first)
+
+    return {
+        'limit': limit,
+        'next_cursor': next_cursor,
+        'prev_cursor': prev_cursor,
+    }
+
+
+def paginate_rows(rows, limit, after=None, before=None):
+    """조회 결과를 페이지로 자르고 next/prev 커서 계산
+
+    반환되는 행은 항상 created_at DESC, id DESC 순서입니다.
+    """
+    fetched = len(rows)
+    rows = list(rows[:limit])
+    if before is not None:
+        rows.reverse()
+
+    first = (rows[0][3], rows[0][0]) if rows else None
+    last = (rows[-1][3], rows[-1][0]) if rows else None
+    return rows, page_info(limit, fetched, first, last, after, before)
+
+
+def paginate_json(row, limit, after=None, before=None):
+    """json_agg 쿼리 결과 한 행을 (users JSON 텍스트, 페이지 정보)로 변환"""
+    users_json, fetched, first_at, first_id, last_at, last_id = row
+    first = (first_at, first_id) if first_id is not None else None
+    last = (last_at, last_id) if last_id is not None else None
+    return users_json, page_info(limit, fetched, first, last, after, before)
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+연결별 prepared statement 캐시
+
+자주 실행되는 쿼리를 연결마다 한 번만 PREPARE 하고 이후에는 EXECUTE로 이름만 보내
+매 호출의 파싱/플래닝 비용을 줄입니다.
+
+- 연결 객체에 약한 참조로 묶여 있어 풀이 연결을 교체하면 캐시도 함께 사라집니다.
+- 서버 쪽에서 prepared statement가 사라진 경우(DISCARD ALL 등) 한 번 다시 PREPARE 합니다.
+- PgBouncer transaction pooling처럼 세션이 유지되지 않는 환경에서는 PREPARED_STATEMENTS=false로 끕니다.
+"""
+
+import os
+import re
+import zlib
+import weakref
+import threading
+
+from psycopg2 import errors
+
+from metrics import PREPARED_STATEMENT_HITS, PREPARED_STATEMENT_PREPARES
+
+PREPARED_STATEMENTS = os.getenv('PREPARED_STATEMENTS', 'true').lower() == 'true'
+
+# 연결 -> 이미 PREPARE 된 이름 집합
+_registry = weakref.WeakKeyDictionary()
+_registry_lock = threading.Lock()
+
+
+def numbered_placeholders(sql):
+    """psycopg2의 %s 플레이스홀더를 $1, $2 ... 로 변환"""
+    counter = iter(range(1, sql.count('%s') + 1))
+    return re.sub(r'%s', lambda _: f'${next(counter)}', sql)
+
+
+def statement_name(label, sql):
+    """라벨과 SQL 본문으로 statement 이름 생성 (같은 라벨의 다른 SQL도 구분)"""
+    return f"ps_{label}_{zlib.crc32(sql.encode('utf-8')):08x}"
+
+
+def prepared_names(conn):
+    """연결에 PREPARE 된 이름 집합"""
+    with _registry_lock:
+        names = _registry.get(conn)
+        if names is None:
+            names = _registry[conn] = set()
+        return names
+
+
+def invalidate(conn):
+    """연결의 캐시 제거 (연결 폐기/재사용 전)"""
+    with _registry_lock:
+        _registry.pop(conn, None)
+
+
+def _prepare(cursor, name, sql, label, reason):
+    cursor.execute(f'PREPARE {name} AS {numbered_placeholders(sql)}')
+    PREPARED_STATEMENT_PREPARES.labels(statement=label, reason=reason).inc()
+
+
+def prepare(cursor, label, sql):
+    """실행하지 않고 PREPARE만 (워밍업용, 이미 준비되었으면 무시)"""
+    if not PREPARED_STATEMENTS:
+        return
+    names = prepared_names(cursor.connection)
+    name = statement_name(label, sql)
+    if name not in names:
+        _prepare(cursor, name, sql, label, 'warmup')
+        names.add(name)
+
+
+def execute(cursor, label, sql, params=()):
+    """sql을 prepared statement로 실행
+
+    비활성화되어 있으면 일반 execute와 같습니다.
+    """
+    if not PREPARED_STATEMENTS:
+        cursor.execute(sql, params)
+        return
+
+    conn = cursor.connection
+    names = prepared_names(conn)
+    name = statement_name(label, sql)
+    execute_sql = f"EXECUTE {name}({', '.join(['%s'] * len(params))})" if params else f'EXECUTE {name}'
+
+    if name in names:
+        try:
+            cursor.execute(execute_sql, params)
+            PREPARED_STATEMENT_HITS.labels(statement=label).inc()
+            return
+        except errors.InvalidSqlStatementName:
+            # 서버 세션에서 사라짐: 트랜잭션을 정리하고 다시 PREPARE
+            conn.rollback()
+            names.clear()
+            _prepare(cursor, name, sql, label, 'reprepare')
+    else:
+        _prepare(cursor, name, sql, label, 'first')
+
+    names.add(name)
+    cursor.execute(execute_sql, params)
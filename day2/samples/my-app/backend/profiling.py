@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+"""
+요청 샘플링 프로파일러 (flamegraph용 스택 수집)
+
+운영 중인 파드가 느릴 때 app.py 핸들러 안에서 시간이 어디에 쓰이는지 보기 위한 선택 기능입니다.
+- 켜는 방법: PROFILING=true (시작 시), POST /admin/profiling (실행 중), X-Profile 헤더 (요청 하나)
+- 켜져 있으면 요청의 sample_rate 비율만 골라, 백그라운드 스레드가 interval마다 그 요청 스레드의 스택을 읽음
+  (sys._current_frames, 요청 스레드는 멈추지 않음)
+- 스택은 "GET /api/users;full_dispatch_request (app.py:...);..." 모양으로 합쳐 횟수를 셈
+- 결과는 /admin/profiling/profile에서 collapsed stack(flamegraph.pl, speedscope) 또는 speedscope JSON으로 받음
+- 꺼져 있으면 before_request에서 속성 하나와 헤더 하나만 확인하고 돌아감
+
+관리 경로와 X-Profile 헤더는 PROFILING_TOKEN이 설정된 경우에만 쓸 수 있습니다 (헤더 값 / X-Profiling-Token).
+상태는 워커 프로세스마다 따로이므로 gunicorn 워커가 여럿이면 PROFILING 환경 변수로 모두 켜는 편이 확실합니다.
+"""
+
+import os
+import sys
+import hmac
+import time
+import random
+import threading
+from collections import Counter
+
+from flask import Blueprint, Response, g, jsonify, request
+
+from metrics import PROFILE_SAMPLES, PROFILED_REQUESTS, PROFILING_ENABLED
+
+PROFILING = os.getenv('PROFILING', 'false').lower() == 'true'
+PROFILING_SAMPLE_RATE = float(os.getenv('PROFILING_SAMPLE_RATE', 0.01))
+PROFILING_INTERVAL = float(os.getenv('PROFILING_INTERVAL', 0.005))
+PROFILING_MAX_STACKS = int(os.getenv('PROFILING_MAX_STACKS', 10000))
+PROFILING_TOKEN = os.getenv('PROFILING_TOKEN', '')
+
+PROFILE_HEADER = 'X-Profile'
+TOKEN_HEADER = 'X-Profiling-Token'
+PROFILE_FORMATS = ('collapsed', 'speedscope')
+
+# 스택을 이 함수에서 자름 (그 위는 WSGI 서버/werkzeug 프레임)
+ROOT_FUNCTION = 'full_dispatch_request'
+TRUNCATED_STACK = '[truncated]'
+
+TRUE_VALUES = ('true', '1', 'yes', 'on')
+FALSE_VALUES = ('false', '0', 'no', 'off')
+
+
+def parse_bool(value):
+    """JSON/폼 값을 bool로 ("false" 같은 문자열도 처리), 알 수 없는 값이면 ValueError"""
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, int) and value in (0, 1):
+        return bool(value)
+    if isinstance(value, str):
+        if value.strip().lower() in TRUE_VALUES:
+            return True
+        if value.strip().lower() in FALSE_VALUES:
+            return False
+    raise ValueError(f'enabled must be a boolean, got {value!r}')
+
+
+def frame_name(code):
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+def collapse(frame, label):
+    """프레임에서 바깥쪽으로 올라가며 만든 세미콜론 구분 스택 (가장 바깥이 먼저)"""
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(frame_name(code))
+        if code.co_name == ROOT_FUNCTION:
+            break
+        frame = frame.f_back
+    names.append(label)
+    names.reverse()
+    return ';'.join(names)
+
+
+class SamplingProfiler:
+    """프로파일 대상 요청 스레드의 스택을 주기적으로 모으는 프로파일러"""
+
+    def __init__(self, enabled=PROFILING, sample_rate=PROFILING_SAMPLE_RATE, interval=PROFILING_INTERVAL,
+                 max_stacks=PROFILING_MAX_STACKS, rand=random.random):
+        self.enabled = enabled
+        self.sample_rate = sample_rate
+        self.interval = interval
+        self.max_stacks = max_stacks
+        self.rand = rand
+        self.stacks = Counter()
+        self.requests = 0
+        self.started_at = time.time()
+        # 스레드 id -> 스택 맨 위 라벨 ("GET /api/users")
+        self._targets = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+        self._pid = None
+        PROFILING_ENABLED.set(1 if enabled else 0)
+
+    def configure(self, enabled=None, sample_rate=None, interval=None):
+        """실행 중 설정 변경 (값이 하나라도 잘못되면 아무것도 바꾸지 않음)"""
+        if enabled is not None:
+            enabled = parse_bool(enabled)
+        if sample_rate is not None:
+            if not 0 <= sample_rate <= 1:
+                raise ValueError('sample_rate must be between 0 and 1')
+            self.sample_rate = sample_rate
+        if interval is not None:
+            if not 0.001 <= interval <= 1:
+                raise ValueError('interval must be between 0.001 and 1 seconds')
+            self.interval = interval
+        if enabled is not None:
+            self.enabled = enabled
+            PROFILING_ENABLED.set(1 if self.enabled else 0)
+
+    def should_profile(self):
+        return self.enabled and self.sample_rate > 0 and self.rand() < self.sample_rate
+
+    def begin(self, label, thread_id=None):
+        """현재(또는 thread_id) 스레드를 샘플링 대상으로 등록"""
+        self._ensure_thread()
+        with self._lock:
+            self._targets[thread_id or threading.get_ident()] = label
+            self.requests += 1
+        self._wake.set()
+
+    def end(self, thread_id=None):
+        with self._lock:
+            self._targets.pop(thread_id or threading.get_ident(), None)
+
+    def _ensure_thread(self):
+        """샘플러 스레드 시작 (fork 후 자식에서는 새로 시작)"""
+        if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name='request-profiler', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            self._wake.wait()
+            if not self.sample_once():
+                # 대상이 없으면 다음 begin()까지 잠듦
+                self._wake.clear()
+                if self._targets:
+                    self._wake.set()
+                continue
+            time.sleep(self.interval)
+
+    def sample_once(self):
+        """대상 스레드마다 스택 하나씩 기록, 기록한 수 반환"""
+        with self._lock:
+            targets = list(self._targets.items())
+        if not targets:
+            return 0
+        frames = sys._current_frames()
+        taken = 0
+        for thread_id, label in targets:
+            frame = frames.get(thread_id)
+            if frame is None:
+                continue
+            stack = collapse(frame, label)
+            with self._lock:
+                if stack not in self.stacks and len(self.stacks) >= self.max_stacks:
+                    stack = f'{label};{TRUNCATED_STACK}'
+                self.stacks[stack] += 1
+            taken += 1
+        del frames
+        PROFILE_SAMPLES.inc(taken)
+        return taken
+
+    def reset(self):
+        with self._lock:
+            self.stacks = Counter()
+            self.requests = 0
+            self.started_at = time.time()
+
+    def status(self):
+        # 샘플러 스레드가 stacks를 바꾸는 중에 순회하지 않도록 잠금 안에서 계산
+        with self._lock:
+            samples, distinct = sum(self.stacks.values()), len(self.stacks)
+        return {
+            'enabled': self.enabled,
+            'sample_rate': self.sample_rate,
+            'interval': self.interval,
+            'profiled_requests': self.requests,
+            'samples': samples,
+            'distinct_stacks': distinct,
+            'since': self.started_at,
+            'pid': os.getpid(),
+        }
+
+    def collapsed(self):
+        """flamegraph.pl / speedscope가 읽는 collapsed stack 텍스트"""
+        with self._lock:
+            items = sorted(self.stacks.items())
+        return ''.join(f'{stack} {count}\n' for stack, count in items)
+
+    def speedscope(self, name='my-app backend'):
+        """speedscope 파일 형식 (sampled 프로필 하나, 가중치는 초)"""
+        with self._lock:
+            items = sorted(self.stacks.items())
+        frames, index, samples, weights = [], {}, [], []
+        for stack, count in items:
+            sample = []
+            for frame in stack.split(';'):
+                if frame not in index:
+                    index[frame] = len(frames)
+                    frames.append({'name': frame})
+                sample.append(index[frame])
+            samples.append(sample)
+            weights.append(round(count * self.interval, 6))
+        return {
+            '$schema': 'https://www.speedscope.app/file-format-schema.json',
+            'name': name,
+            'exporter': 'my-app profiling',
+            'activeProfileIndex': 0,
+            'shared': {'frames': frames},
+            'profiles': [{
+                'type': 'sampled',
+                'name': name,
+                'unit': 'seconds',
+                'startValue': 0,
+                'endValue': round(sum(weights), 6),
+                'samples': samples,
+                'weights': weights,
+            }],
+        }
+
+
+def token_matches(value, token=None):
+    # compare_digest는 ASCII가 아닌 str에 TypeError를 내므로 바이트로 비교
+    token = PROFILING_TOKEN if token is None else token
+    return bool(token) and bool(value) and hmac.compare_digest(value.encode('utf-8'), token.encode('utf-8'))
+
+
+class ProfilingMiddleware:
+    """Flask before/teardown_request 훅으로 샘플링 대상 요청 선택"""
+
+    def __init__(self, app=None, profiler=None, token=None):
+        self.profiler = profiler or SamplingProfiler()
+        self.token = PROFILING_TOKEN if token is None else token
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.before_request(self.before_request)
+        app.teardown_request(self.teardown_request)
+        app.register_blueprint(admin_blueprint(self))
+
+    def before_request(self):
+        if self.profiler.enabled and self.profiler.should_profile():
+            trigger = 'sampled'
+        elif self.token and token_matches(request.headers.get(PROFILE_HEADER), self.token):
+            trigger = 'header'
+        else:
+            return None
+        if request.path.startswith('/admin/profiling'):
+            return None
+        rule = request.url_rule.rule if request.url_rule is not None else '<unmatched>'
+        g._profiling = (rule, trigger)
+        self.profiler.begin(f'{request.method} {rule}')
+        return None
+
+    def teardown_request(self, exc=None):
+        profiling = g.pop('_profiling', None)
+        if profiling is not None:
+            self.profiler.end()
+            rule, trigger = profiling
+            PROFILED_REQUESTS.labels(endpoint=rule, trigger=trigger).inc()
+
+
+def admin_blueprint(middleware):
+    """프로파일러 관리 경로 (/admin/profiling)"""
+    blueprint = Blueprint('profiling', __name__, url_prefix='/admin/profiling')
+    profiler = middleware.profiler
+
+    @blueprint.before_request
+    def require_token():
+        if not middleware.token:
+            return jsonify({'error': 'Profiling admin is disabled (PROFILING_TOKEN is not set)'}), 404
+        if not token_matches(request.headers.get(TOKEN_HEADER), middleware.token):
+            return jsonify({'error': 'Invalid profiling token'}), 403
+        return None
+
+    @blueprint.route('', methods=['GET'])
+    def status():
+        """프로파일러 상태"""
+        return jsonify(profiler.status()), 200
+
+    @blueprint.route('', methods=['POST'])
+    def configure():
+        """켜기/끄기와 샘플링 비율, 간격 변경"""
+        data = request.get_json(silent=True) or {}
+        try:
+            profiler.configure(
+                enabled=data.get('enabled'),
+                sample_rate=float(data['sample_rate']) if 'sample_rate' in data else None,
+                interval=float(data['interval']) if 'interval' in data else None,
+            )
+        except (TypeError, ValueError) as e:
+            return jsonify({'error': str(e)}), 400
+        return jsonify(profiler.status()), 200
+
+    @blueprint.route('/profile', methods=['GET'])
+    def download():
+        """수집한 프로필 내려받기 (format=collapsed | speedscope)"""
+        fmt = request.args.get('format', 'collapsed')
+        if fmt not in PROFILE_FORMATS:
+            return jsonify({'error': f"Unsupported format: {fmt}"}), 400
+        stamp = time.strftime('%Y%m%d-%H%M%S')
+        if fmt == 'speedscope':
+            return jsonify(profiler.speedscope()), 200, {
+                'Content-Disposition': f'attachment; filename=profile-{os.getpid()}-{stamp}.speedscope.json',
+            }
+        return Response(profiler.collapsed(), mimetype='text/plain', headers={
+            'Content-Disposition': f'attachment; filename=profile-{os.getpid()}-{stamp}.collapsed.txt',
+        })
+
+    @blueprint.route('/profile', methods=['DELETE'])
+    def reset():
+        """수집한 스택 비우기"""
+        profiler.reset()
+        return jsonify(profiler.status()), 200
+
+    return blueprint
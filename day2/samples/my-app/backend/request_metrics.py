@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+HTTP 요청 타이밍 미들웨어
+
+- time.perf_counter_ns 기반 (단조 증가 시계, 시스템 시간 변경 영향 없음)
+- endpoint 라벨은 매칭된 라우트 템플릿, 매칭 실패(404 등)는 하나의 고정 라벨로 묶어 카디널리티 제한
+- /metrics, /health, /livez, /readyz 같은 경로는 측정 제외 (REQUEST_TIMING_EXCLUDE)
+"""
+
+import os
+import time
+
+from flask import g, request
+
+from metrics import REQUEST_COUNT, REQUEST_DURATION
+
+UNMATCHED_ENDPOINT = '<unmatched>'
+KNOWN_METHODS = frozenset({'GET', 'HEAD', 'POST', 'PUT', 'PATCH', 'DELETE', 'OPTIONS'})
+
+DEFAULT_EXCLUDE = '/metrics,/health,/livez,/readyz'
+
+
+def excluded_paths_from_env():
+    """측정 제외 경로 목록"""
+    value = os.getenv('REQUEST_TIMING_EXCLUDE', DEFAULT_EXCLUDE)
+    return frozenset(p.strip() for p in value.split(',') if p.strip())
+
+
+class RequestTimer:
+    """Flask before/after_request 훅으로 요청 수와 처리 시간을 기록"""
+
+    def __init__(self, app=None, exclude=None):
+        self.exclude = excluded_paths_from_env() if exclude is None else frozenset(exclude)
+        # 라벨 자식 객체 캐시: labels() 조회 비용을 요청마다 반복하지 않음
+        self._duration_children = {}
+        self._count_children = {}
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.before_request(self.before_request)
+        app.after_request(self.after_request)
+
+    def before_request(self):
+        """요청 시작 시각 기록"""
+        if request.path not in self.exclude:
+            g._request_start_ns = time.perf_counter_ns()
+
+    def labels(self):
+        """(method, endpoint) 라벨 계산"""
+        method = request.method if request.method in KNOWN_METHODS else 'OTHER'
+        rule = request.url_rule
+        return method, rule.rule if rule is not None else UNMATCHED_ENDPOINT
+
+    def after_request(self, response):
+        """처리 시간과 요청 수 기록"""
+        start_ns = g.pop('_request_start_ns', None)
+        if start_ns is None:
+            return response
+
+        duration = (time.perf_counter_ns() - start_ns) / 1e9
+        key = self.labels()
+        child = self._duration_children.get(key)
+        if child is None:
+            child = self._duration_children[key] = REQUEST_DURATION.labels(method=key[0], endpoint=key[1])
+        child.observe(duration)
+
+        count_key = key + (response.status_code,)
+        counter = self._count_children.get(count_key)
+        if counter is None:
+            counter = self._count_children[count_key] = REQUEST_COUNT.labels(
+                method=key[0], endpoint=key[1], status=response.status_code
+            )
+        counter.inc()
+        return response
@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+"""
+응답 캐시 (in-process LRU + ETag)
+
+대시보드와 프론트엔드가 폴링하는 /api/users, /api/stats 응답을 직렬화된 bytes로 보관합니다.
+- 키: 라우트 + 정렬된 쿼리 문자열
+- 무효화: 테이블 버전 카운터 (create_user 등 쓰기에서 bump), TTL, 항목 수/바이트 상한 LRU 퇴출
+- ETag: 본문 해시 (strong), 워커/파드가 달라도 같은 본문이면 같은 값이므로 If-None-Match 일치 시 DB/직렬화 없이 304
+
+테이블 버전 (RESPONSE_CACHE_VERSIONS)
+- db (기본): user_counters의 '<table>_version' 행을 트리거가 쓰기 문장마다 올리고, 워커의 백그라운드 스레드가
+  그 값을 RESPONSE_CACHE_VERSION_TTL초마다 다시 읽음 → 다른 워커/파드의 쓰기도 그 시간 안에 무효화
+  (요청 경로에서는 DB를 읽지 않음, 읽기에 실패하면 RESPONSE_CACHE_VERSION_MAX_BACKOFF초까지 간격을 늘림)
+  비용: 트리거가 users 쓰기 문장마다 같은 행 하나를 UPDATE 하므로 동시에 쓰는 트랜잭션은 그 행에서 순서대로 커밋됨
+  (대량 등록은 배치 문장마다 한 번). 쓰기 동시성이 더 중요하면 local로 두고 init.sql의 users_version_bump 트리거를 지움
+- local: 프로세스 안의 카운터만 사용 → gunicorn 워커가 여럿이면 다른 워커의 쓰기는
+  RESPONSE_CACHE_TTL초(항목 만료)가 지나야 보이므로 TTL을 짧게 유지
+CACHE_BACKEND=redis이면 버전은 L2의 INCR 키로 공유합니다 (shared_cache.py).
+"""
+
+import os
+import time
+import hashlib
+import logging
+import threading
+from collections import OrderedDict, namedtuple
+from contextlib import nullcontext
+from functools import wraps
+from urllib.parse import urlencode
+
+from flask import current_app, request
+
+from metrics import RESPONSE_CACHE_BYTES, RESPONSE_CACHE_REQUESTS, query_timer
+
+logger = logging.getLogger(__name__)
+
+RESPONSE_CACHE_TTL = float(os.getenv('RESPONSE_CACHE_TTL', 5))
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv('RESPONSE_CACHE_MAX_ENTRIES', 1024))
+RESPONSE_CACHE_MAX_BYTES = int(os.getenv('RESPONSE_CACHE_MAX_BYTES', 64 * 1024 * 1024))
+RESPONSE_CACHE_VERSIONS = os.getenv('RESPONSE_CACHE_VERSIONS', 'db')
+RESPONSE_CACHE_VERSION_TTL = float(os.getenv('RESPONSE_CACHE_VERSION_TTL', 0.5))
+RESPONSE_CACHE_VERSION_MAX_BACKOFF = float(os.getenv('RESPONSE_CACHE_VERSION_MAX_BACKOFF', 30))
+
+VERSION_SOURCES = ('db', 'local')
+TABLE_VERSION_SQL = 'SELECT name, value FROM user_counters WHERE name = ANY(%s)'
+
+CacheEntry = namedtuple('CacheEntry', 'body etag mimetype version expires')
+
+
+class TableVersions:
+    """테이블별 버전 카운터 (쓰기마다 증가, 프로세스 안에서만 유효)"""
+
+    def __init__(self):
+        self._versions = {}
+        self._lock = threading.Lock()
+
+    def get(self, table):
+        return self._versions.get(table, 0)
+
+    def bump(self, table):
+        with self._lock:
+            self._versions[table] = self._versions.get(table, 0) + 1
+            return self._versions[table]
+
+    def start(self):
+        """공유할 버전이 없으므로 할 일 없음 (DatabaseTableVersions와 같은 인터페이스)"""
+
+    def stop(self, timeout=None):
+        """start()와 같음"""
+
+
+class DatabaseTableVersions:
+    """user_counters의 '<table>_version' 행으로 워커/파드 사이에 공유하는 테이블 버전
+
+    connection은 primary 연결을 주는 컨텍스트 매니저 함수입니다 (복제본은 지연될 수 있으므로 사용하지 않음).
+    get()/bump()는 DB를 읽지 않고, 백그라운드 스레드(start)가 interval초마다 get()으로 조회된 테이블의
+    버전을 한 번의 쿼리로 다시 읽습니다. 읽기에 실패하면 (user_counters가 없는 이전 볼륨 등) 마지막 값을 계속 쓰고
+    다음 시도까지 간격을 max_backoff초까지 두 배씩 늘립니다.
+    같은 프로세스의 쓰기는 bump()의 로컬 증가분으로 바로 반영됩니다 (버전 행이 없는 이전 스키마도 동작).
+    """
+
+    def __init__(self, connection, interval=RESPONSE_CACHE_VERSION_TTL, max_backoff=RESPONSE_CACHE_VERSION_MAX_BACKOFF):
+        self.connection = connection
+        self.interval = interval
+        self.max_backoff = max(max_backoff, interval)
+        self.failures = 0
+        self._shared = {}
+        self._bumps = {}
+        self._tables = set()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._pid = None
+        self._stop = threading.Event()
+
+    def _fetch(self, tables):
+        with self.connection() as conn:
+            with query_timer('table_version'), conn.cursor() as cursor:
+                cursor.execute(TABLE_VERSION_SQL, ([f'{table}_version' for table in tables],))
+                rows = cursor.fetchall()
+            conn.rollback()
+        return {name[:-len('_version')]: int(value) for name, value in rows}
+
+    def refresh(self):
+        """조회된 적 있는 테이블의 버전을 DB에서 다시 읽기 (성공 여부 반환)"""
+        with self._lock:
+            tables = sorted(self._tables)
+        if not tables:
+            return True
+        try:
+            values = self._fetch(tables)
+        except Exception as e:
+            if self.failures == 0:
+                logger.warning(f"Failed to read table versions, keeping the last ones: {e}")
+            self.failures += 1
+            return False
+        if self.failures:
+            logger.info(f"Table versions readable again after {self.failures} failed attempts")
+        self.failures = 0
+        self._shared.update(values)
+        return True
+
+    def next_delay(self):
+        """다음 refresh까지 기다릴 시간 (연속 실패마다 두 배, 최대 max_backoff)"""
+        if not self.failures:
+            return self.interval
+        return min(self.interval * 2 ** min(self.failures, 16), self.max_backoff)
+
+    def get(self, table):
+        if table not in self._tables:
+            with self._lock:
+                self._tables.add(table)
+        return self._shared.get(table, 0) + self._bumps.get(table, 0)
+
+    def bump(self, table):
+        """쓰기 후 무효화 (이 프로세스에는 바로, 다른 워커에는 다음 refresh에 반영)"""
+        with self._lock:
+            self._bumps[table] = self._bumps.get(table, 0) + 1
+        return self.get(table)
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.refresh()
+            self._stop.wait(self.next_delay())
+
+    def start(self):
+        """갱신 스레드 시작 (이미 돌고 있으면 무시, fork 후 자식에서는 새로 시작)"""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+                return
+            self._stop = threading.Event()
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name='table-versions', daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout=None):
+        """갱신 스레드 종료"""
+        self._stop.set()
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread() and self._pid == os.getpid():
+            thread.join(timeout)
+        self._thread = None
+
+
+def build_table_versions(connection, source=RESPONSE_CACHE_VERSIONS):
+    """RESPONSE_CACHE_VERSIONS 설정에 맞는 in-process 캐시용 테이블 버전"""
+    if source not in VERSION_SOURCES:
+        raise ValueError(f"Unknown RESPONSE_CACHE_VERSIONS: {source}")
+    if source == 'local':
+        return TableVersions()
+    return DatabaseTableVersions(connection)
+
+
+def make_etag(body):
+    """본문 해시로 strong ETag 값 생성 (따옴표 제외)"""
+    return hashlib.sha1(body).hexdigest()[:20]
+
+
+class ResponseCache:
+    """TTL + 크기 제한 LRU 캐시"""
+
+    def __init__(self, ttl=RESPONSE_CACHE_TTL, max_entries=RESPONSE_CACHE_MAX_ENTRIES,
+                 max_bytes=RESPONSE_CACHE_MAX_BYTES, clock=time.monotonic, versions=None):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.clock = clock
+        self.versions = versions if versions is not None else TableVersions()
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        return self.ttl > 0 and self.max_entries > 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def size_bytes(self):
+        return self._bytes
+
+    def _remove(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= len(entry.body)
+
+    def get(self, key, version):
+        """유효한 항목 반환 (만료되었거나 테이블 버전이 바뀌었으면 제거 후 None)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry.version != version or entry.expires <= self.clock():
+                self._remove(key)
+                RESPONSE_CACHE_BYTES.set(self._bytes)
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key, version, body, mimetype):
+        """항목 저장 후 상한을 넘으면 오래된 항목부터 퇴출"""
+        entry = CacheEntry(body, make_etag(body), mimetype, version, self.clock() + self.ttl)
+        if len(body) > self.max_bytes:
+            return entry
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = entry
+            self._bytes += len(body)
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+            RESPONSE_CACHE_BYTES.set(self._bytes)
+        return entry
+
+    def fill_lock(self, key, version):
+        """미스 시 응답 생성 구간 (in-process 캐시는 대기 없이 바로 생성)"""
+        return nullcontext()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            RESPONSE_CACHE_BYTES.set(0)
+
+
+def request_cache_key():
+    """라우트 + 정렬된 쿼리 문자열"""
+    args = sorted(request.args.items(multi=True))
+    return f'{request.path}?{urlencode(args)}' if args else request.path
+
+
+def _entry_response(entry, status=200):
+    response = current_app.response_class(entry.body if status == 200 else b'', status=status, mimetype=entry.mimetype)
+    response.set_etag(entry.etag)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+
+def _fill(cache, key, version, view, args, kwargs):
+    """뷰를 실행하고 200 응답이면 캐시에 저장"""
+    response = current_app.make_response(view(*args, **kwargs))
+    if response.status_code != 200 or response.is_streamed:
+        return response
+
+    entry = cache.put(key, version, response.get_data(), response.mimetype)
+    if entry.etag in request.if_none_match:
+        return _entry_response(entry, status=304)
+    response.set_etag(entry.etag)
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Cache'] = 'MISS'
+    return response
+
+
+def cached_response(cache, table, bypass=None):
+    """GET 응답 캐시 데코레이터
+
+    cache는 ResponseCache 또는 shared_cache.SharedResponseCache입니다.
+    table 버전이 바뀌면 항목이 무효화됩니다. bypass()가 참이면 캐시를 건너뜁니다
+    (예: 방금 쓴 세션의 read-your-writes).
+    """
+    def decorator(view):
+        route = view.__name__
+
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if not cache.enabled or (bypass is not None and bypass()):
+                RESPONSE_CACHE_REQUESTS.labels(route=route, result='bypass').inc()
+                return view(*args, **kwargs)
+
+            key = request_cache_key()
+            version = cache.versions.get(table)
+            entry = cache.get(key, version)
+            if entry is None:
+                # 공유 캐시에서는 같은 키를 만드는 요청이 하나뿐이도록 락을 잡고, 기다리는 동안 채워지면 그 항목 사용
+                with cache.fill_lock(key, version) as entry:
+                    if entry is None:
+                        RESPONSE_CACHE_REQUESTS.labels(route=route, result='miss').inc()
+                        return _fill(cache, key, version, view, args, kwargs)
+
+            if entry.etag in request.if_none_match:
+                RESPONSE_CACHE_REQUESTS.labels(route=route, result='not_modified').inc()
+                return _entry_response(entry, status=304)
+            RESPONSE_CACHE_REQUESTS.labels(route=route, result='hit').inc()
+            response = _entry_response(entry)
+            response.headers['X-Cache'] = 'HIT'
+            return response
+        return wrapper
+    return decorator
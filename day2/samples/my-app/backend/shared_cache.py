@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+공유 응답 캐시 (Redis 프로토콜, 선택 사항)
+
+워커/파드마다 따로 있는 in-process 캐시는 로드밸런서 뒤 여러 파드 사이에서 일관되지 않습니다.
+CACHE_BACKEND=redis로 켜면 응답 캐시 앞에 다음 계층이 붙습니다.
+- L1: 기존 in-process ResponseCache (적중 시 네트워크 왕복 없음)
+- L2: Redis 프로토콜 서버 (Redis, KeyDB, Valkey 등)에 같은 항목을 TTL과 함께 저장
+- 테이블 버전을 L2의 INCR 키로 공유해 create_user 등의 쓰기가 모든 파드의 항목을 무효화
+- 스탬피드 방지: 미스 시 SET NX 락을 잡은 요청만 DB를 조회하고 나머지는 L2에 채워지길 잠시 대기
+
+L2 오류 시에는 SHARED_CACHE_RETRY_AFTER초 동안 L2를 건너뛰고 L1만으로 동작합니다.
+redis 패키지가 없거나 CACHE_BACKEND=memory(기본값)이면 in-process 캐시만 사용합니다.
+"""
+
+import os
+import time
+import uuid
+import logging
+import threading
+from contextlib import contextmanager
+
+from metrics import SHARED_CACHE_OPERATIONS
+from response_cache import CacheEntry, ResponseCache
+
+try:
+    import redis
+except ImportError:  # pragma: no cover - redis 미설치 환경
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+CACHE_BACKEND = os.getenv('CACHE_BACKEND', 'memory')
+REDIS_URL = os.getenv('REDIS_URL', 'redis://localhost:6379/0')
+SHARED_CACHE_PREFIX = os.getenv('SHARED_CACHE_PREFIX', 'myapp')
+SHARED_CACHE_TIMEOUT = float(os.getenv('SHARED_CACHE_TIMEOUT', 0.25))
+SHARED_CACHE_RETRY_AFTER = float(os.getenv('SHARED_CACHE_RETRY_AFTER', 5))
+SHARED_CACHE_VERSION_TTL = float(os.getenv('SHARED_CACHE_VERSION_TTL', 0.5))
+SHARED_CACHE_LOCK_TTL = float(os.getenv('SHARED_CACHE_LOCK_TTL', 5))
+SHARED_CACHE_LOCK_WAIT = float(os.getenv('SHARED_CACHE_LOCK_WAIT', 1))
+SHARED_CACHE_LOCK_POLL = 0.05
+
+CACHE_BACKENDS = ('memory', 'redis')
+
+
+class SharedCacheUnavailable(Exception):
+    """L2 서버에 접근할 수 없음"""
+
+
+class SharedStore:
+    """Redis 클라이언트 래퍼 (오류가 나면 retry_after 동안 호출을 건너뜀)"""
+
+    def __init__(self, client, prefix=SHARED_CACHE_PREFIX, retry_after=SHARED_CACHE_RETRY_AFTER,
+                 clock=time.monotonic):
+        self.client = client
+        self.prefix = prefix
+        self.retry_after = retry_after
+        self.clock = clock
+        self._down_until = 0.0
+
+    def key(self, *parts):
+        return ':'.join((self.prefix,) + tuple(str(p) for p in parts))
+
+    @property
+    def available(self):
+        return self.clock() >= self._down_until
+
+    def call(self, operation, *args, **kwargs):
+        """클라이언트 명령 실행 (실패 시 SharedCacheUnavailable)"""
+        if not self.available:
+            SHARED_CACHE_OPERATIONS.labels(operation=operation, result='skipped').inc()
+            raise SharedCacheUnavailable('shared cache marked down')
+        try:
+            result = getattr(self.client, operation)(*args, **kwargs)
+        except Exception as e:
+            self._down_until = self.clock() + self.retry_after
+            SHARED_CACHE_OPERATIONS.labels(operation=operation, result='error').inc()
+            logger.warning(f"Shared cache {operation} failed, using local cache for {self.retry_after}s: {e}")
+            raise SharedCacheUnavailable(str(e)) from e
+        SHARED_CACHE_OPERATIONS.labels(operation=operation, result='ok').inc()
+        return result
+
+
+class SharedTableVersions:
+    """L2의 INCR 키로 공유하는 테이블 버전
+
+    매 요청마다 왕복하지 않도록 읽은 값을 local_ttl초 동안 재사용합니다.
+    같은 프로세스의 쓰기는 INCR 결과로 즉시 갱신됩니다.
+    """
+
+    def __init__(self, store, local_ttl=SHARED_CACHE_VERSION_TTL, on_unavailable=None):
+        self.store = store
+        self.local_ttl = local_ttl
+        self.on_unavailable = on_unavailable
+        self._local = {}
+        self._lock = threading.Lock()
+
+    def get(self, table):
+        version, fetched_at = self._local.get(table, (0, None))
+        now = self.store.clock()
+        if fetched_at is not None and now - fetched_at < self.local_ttl:
+            return version
+        try:
+            value = self.store.call('get', self.store.key('version', table))
+        except SharedCacheUnavailable:
+            return version
+        version = int(value) if value is not None else 0
+        self._local[table] = (version, now)
+        return version
+
+    def bump(self, table):
+        """쓰기 후 무효화 (L2 INCR, 실패하면 로컬 L1만 비움)"""
+        try:
+            version = int(self.store.call('incr', self.store.key('version', table)))
+        except SharedCacheUnavailable:
+            if self.on_unavailable is not None:
+                self.on_unavailable()
+            return self._local.get(table, (0, None))[0]
+        with self._lock:
+            current, _ = self._local.get(table, (0, None))
+            # 다른 파드가 더 올렸을 수도 있으므로 큰 값 유지
+            self._local[table] = (max(current, version), self.store.clock())
+        return version
+
+
+def encode_entry(entry):
+    """L2 저장 형식: etag\\nmimetype\\nbody"""
+    return f'{entry.etag}\n{entry.mimetype}\n'.encode() + entry.body
+
+
+def decode_entry(raw, version, expires):
+    etag, mimetype, body = raw.split(b'\n', 2)
+    return CacheEntry(body, etag.decode(), mimetype.decode(), version, expires)
+
+
+class SharedResponseCache:
+    """L1(in-process) + L2(Redis 프로토콜) 응답 캐시
+
+    ResponseCache와 같은 인터페이스(get/put/versions/fill_lock)를 제공하므로
+    cached_response 데코레이터에 그대로 넘길 수 있습니다.
+    """
+
+    def __init__(self, client, l1=None, prefix=SHARED_CACHE_PREFIX, retry_after=SHARED_CACHE_RETRY_AFTER,
+                 version_ttl=SHARED_CACHE_VERSION_TTL, lock_ttl=SHARED_CACHE_LOCK_TTL,
+                 lock_wait=SHARED_CACHE_LOCK_WAIT, clock=time.monotonic, sleep=time.sleep):
+        self.l1 = l1 if l1 is not None else ResponseCache(clock=clock)
+        self.store = SharedStore(client, prefix, retry_after, clock)
+        self.versions = SharedTableVersions(self.store, version_ttl, on_unavailable=self.l1.clear)
+        self.lock_ttl = lock_ttl
+        self.lock_wait = lock_wait
+        self.sleep = sleep
+
+    @property
+    def ttl(self):
+        return self.l1.ttl
+
+    @property
+    def enabled(self):
+        return self.l1.enabled
+
+    def __len__(self):
+        return len(self.l1)
+
+    @property
+    def size_bytes(self):
+        return self.l1.size_bytes
+
+    def _entry_key(self, key, version):
+        return self.store.key('resp', version, key)
+
+    def _get_remote(self, key, version):
+        """L2 조회 후 적중하면 L1에 채움"""
+        try:
+            raw = self.store.call('get', self._entry_key(key, version))
+        except SharedCacheUnavailable:
+            return None
+        if raw is None:
+            SHARED_CACHE_OPERATIONS.labels(operation='lookup', result='miss').inc()
+            return None
+        SHARED_CACHE_OPERATIONS.labels(operation='lookup', result='hit').inc()
+        entry = decode_entry(raw, version, self.l1.clock() + self.ttl)
+        self.l1.put(key, version, entry.body, entry.mimetype)
+        return entry
+
+    def get(self, key, version):
+        entry = self.l1.get(key, version)
+        if entry is not None:
+            return entry
+        return self._get_remote(key, version)
+
+    def put(self, key, version, body, mimetype):
+        entry = self.l1.put(key, version, body, mimetype)
+        try:
+            self.store.call('set', self._entry_key(key, version), encode_entry(entry),
+                            px=max(int(self.ttl * 1000), 1))
+        except SharedCacheUnavailable:
+            pass
+        return entry
+
+    def clear(self):
+        """L1만 비움 (L2 항목은 버전 bump 또는 TTL로 만료)"""
+        self.l1.clear()
+
+    @contextmanager
+    def fill_lock(self, key, version):
+        """스탬피드 방지 락
+
+        락을 잡으면 None을 넘겨 호출자가 응답을 만들게 하고, 다른 요청이 이미 만드는 중이면
+        lock_wait초까지 L2를 폴링해 채워진 항목을 넘깁니다. 끝내 안 채워지면 None (직접 생성).
+        """
+        lock_key = self.store.key('lock', version, key)
+        token = uuid.uuid4().hex
+        try:
+            acquired = self.store.call('set', lock_key, token, nx=True, px=max(int(self.lock_ttl * 1000), 1))
+        except SharedCacheUnavailable:
+            yield None
+            return
+
+        if not acquired:
+            SHARED_CACHE_OPERATIONS.labels(operation='lock', result='wait').inc()
+            deadline = self.store.clock() + self.lock_wait
+            while self.store.clock() < deadline:
+                self.sleep(SHARED_CACHE_LOCK_POLL)
+                entry = self._get_remote(key, version)
+                if entry is not None:
+                    yield entry
+                    return
+            SHARED_CACHE_OPERATIONS.labels(operation='lock', result='timeout').inc()
+            yield None
+            return
+
+        try:
+            yield None
+        finally:
+            # 락이 만료되어 다른 요청이 다시 잡았으면 지우지 않음
+            try:
+                if self.store.call('get', lock_key) == token.encode():
+                    self.store.call('delete', lock_key)
+            except SharedCacheUnavailable:
+                pass
+
+
+def build_response_cache(backend=CACHE_BACKEND, url=REDIS_URL, versions=None):
+    """CACHE_BACKEND 설정에 맞는 응답 캐시 생성
+
+    versions는 in-process 캐시가 쓸 테이블 버전입니다 (redis 백엔드는 L2 INCR 키를 사용).
+    """
+    if backend not in CACHE_BACKENDS:
+        raise ValueError(f"Unknown CACHE_BACKEND: {backend}")
+    if backend == 'memory':
+        return ResponseCache(versions=versions)
+    if redis is None:
+        logger.warning("CACHE_BACKEND=redis but the redis package is not installed; using in-process cache")
+        return ResponseCache(versions=versions)
+    client = redis.Redis.from_url(
+        url, socket_timeout=SHARED_CACHE_TIMEOUT, socket_connect_timeout=SHARED_CACHE_TIMEOUT
+    )
+    logger.info("Shared response cache enabled")
+    return SharedResponseCache(client)
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+동일 요청 합치기 (single-flight)
+
+트래픽이 몰릴 때 같은 GET /api/users, /api/stats 요청이 동시에 들어오면 각각 쿼리를 돌립니다.
+같은 키(라우트 + 정렬된 쿼리 문자열)로 이미 처리 중인 요청이 있으면 새 요청은 기다렸다가
+그 결과(직렬화된 본문)를 함께 받습니다. 진행 중인 요청만 공유하므로 오래된 응답이 생기지 않습니다.
+"""
+
+import os
+import logging
+import threading
+from functools import wraps
+
+from flask import current_app
+
+from metrics import REQUEST_COALESCING
+from response_cache import request_cache_key
+
+logger = logging.getLogger(__name__)
+
+REQUEST_COALESCING_ENABLED = os.getenv('REQUEST_COALESCING', 'true').lower() == 'true'
+REQUEST_COALESCING_TIMEOUT = float(os.getenv('REQUEST_COALESCING_TIMEOUT', 10))
+
+# 다른 요청에 복사하지 않는 헤더 (세션별 값)
+PRIVATE_HEADERS = frozenset({'set-cookie', 'content-length'})
+
+
+class _Call:
+    """진행 중인 호출 하나"""
+
+    __slots__ = ('done', 'value', 'error', 'followers')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+        self.followers = 0
+
+
+class SingleFlight:
+    """키별로 동시에 한 번만 fn을 실행하고 결과를 대기자와 공유"""
+
+    def __init__(self, timeout=REQUEST_COALESCING_TIMEOUT):
+        self.timeout = timeout
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._calls)
+
+    def do(self, key, fn):
+        """(결과, 역할) 반환. 역할은 leader / follower / timeout
+
+        follower는 leader의 예외도 그대로 받습니다. leader가 timeout 안에 끝나지 않으면
+        기다리던 요청은 직접 fn을 실행합니다 (timeout).
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = self._calls[key] = _Call()
+                leader = True
+            else:
+                call.followers += 1
+                leader = False
+
+        if not leader:
+            if not call.done.wait(self.timeout):
+                return fn(), 'timeout'
+            if call.error is not None:
+                raise call.error
+            return call.value, 'follower'
+
+        try:
+            call.value = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.value, 'leader'
+
+
+def _snapshot(response):
+    """다른 요청에 넘길 (status, headers, body). 스트리밍 응답은 공유하지 않음"""
+    if response.is_streamed:
+        return None
+    headers = [(k, v) for k, v in response.headers.items() if k.lower() not in PRIVATE_HEADERS]
+    return response.status_code, headers, response.get_data()
+
+
+def coalesce_requests(flight, bypass=None, enabled=REQUEST_COALESCING_ENABLED):
+    """동시에 들어온 같은 GET 요청이 하나의 뷰 실행을 공유하게 하는 데코레이터
+
+    bypass()가 참인 요청(예: 방금 쓴 세션)은 앞서 시작된 실행에 합류하지 않고 직접 실행합니다.
+    """
+    def decorator(view):
+        route = view.__name__
+
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if not enabled or (bypass is not None and bypass()):
+                return view(*args, **kwargs)
+
+            holder = {}
+
+            def run():
+                response = current_app.make_response(view(*args, **kwargs))
+                holder['response'] = response
+                return _snapshot(response)
+
+            shared, role = flight.do(request_cache_key(), run)
+            REQUEST_COALESCING.labels(route=route, role=role).inc()
+            if 'response' in holder:
+                return holder['response']
+            if shared is None:
+                # leader 응답이 스트리밍이라 공유할 수 없음
+                return view(*args, **kwargs)
+            status, headers, body = shared
+            return current_app.response_class(body, status=status, headers=headers)
+        return wrapper
+    return decorator
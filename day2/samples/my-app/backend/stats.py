@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+/api/stats 통계 조회와 캐시
+
+- TTL 캐시: 대시보드 폴링이 매번 COUNT(*)를 돌리지 않도록 결과를 STATS_CACHE_TTL초 동안 재사용
+- single-flight: 캐시가 만료됐을 때 동시에 들어온 요청은 한 번의 재계산을 공유
+- counter 모드: 트리거로 관리하는 user_counters 테이블에서 전체 사용자 수를 O(1)로 읽고,
+  최근 1일 가입자는 idx_users_created_at_id 범위 스캔으로 계산해 테이블 크기와 무관하게 응답
+- json 전략 (QUERY_STRATEGY=json): 두 값을 json_build_object 한 번의 왕복으로 조회
+"""
+
+import os
+import json
+import time
+import threading
+
+import prepared
+from metrics import query_timer
+
+STATS_CACHE_TTL = float(os.getenv('STATS_CACHE_TTL', 5))
+STATS_MODE = os.getenv('STATS_MODE', 'count')
+STATS_QUERY_STRATEGY = os.getenv('QUERY_STRATEGY', 'rows')
+
+STATS_MODES = ('count', 'counter')
+
+TOTAL_USERS_SQL = {
+    'count': 'SELECT COUNT(*) FROM users',
+    'counter': "SELECT value FROM user_counters WHERE name = 'total_users'",
+}
+NEW_USERS_TODAY_SQL = "SELECT COUNT(*) FROM users WHERE created_at > NOW() - INTERVAL '1 day'"
+
+
+def build_stats_json_query(mode):
+    """두 통계를 한 번에 JSON 객체로 반환하는 쿼리"""
+    return (
+        "SELECT json_build_object("
+        f"'total_users', COALESCE(({TOTAL_USERS_SQL[mode]}), 0), "
+        f"'new_users_today', ({NEW_USERS_TODAY_SQL})"
+        ")::text"
+    )
+
+
+def load_stats(conn, mode=STATS_MODE, strategy=STATS_QUERY_STRATEGY):
+    """DB에서 통계 계산"""
+    if mode not in STATS_MODES:
+        raise ValueError(f"Unknown STATS_MODE: {mode}")
+
+    if strategy == 'json':
+        with conn.cursor() as cursor, query_timer(f'stats_json_{mode}'):
+            prepared.execute(cursor, f'stats_json_{mode}', build_stats_json_query(mode))
+            return json.loads(cursor.fetchone()[0])
+
+    with conn.cursor() as cursor:
+        with query_timer(f'users_total_{mode}'):
+            prepared.execute(cursor, f'users_total_{mode}', TOTAL_USERS_SQL[mode])
+            row = cursor.fetchone()
+            total_users = row[0] if row else 0
+
+        with query_timer('users_count_today'):
+            prepared.execute(cursor, 'users_count_today', NEW_USERS_TODAY_SQL)
+            new_users_today = cursor.fetchone()[0]
+
+    return {
+        'total_users': total_users,
+        'new_users_today': new_users_today,
+    }
+
+
+class StatsCache:
+    """TTL + single-flight 캐시
+
+    loader는 인자 없이 통계 dict를 반환하는 함수입니다. ttl이 0이면 캐시하지 않습니다.
+    쓰기가 있어도 TTL 전에는 다시 계산하지 않습니다 (쓰기가 잦아도 COUNT는 TTL마다 한 번).
+    """
+
+    def __init__(self, loader, ttl=STATS_CACHE_TTL, clock=time.monotonic):
+        self.loader = loader
+        self.ttl = ttl
+        self.clock = clock
+        self._value = None
+        self._loaded_at = None
+        self._refresh_lock = threading.Lock()
+
+    def _fresh(self):
+        """캐시된 값이 TTL 안에 있는지 확인"""
+        return self._loaded_at is not None and self.clock() - self._loaded_at < self.ttl
+
+    def get(self):
+        """캐시된 통계 반환 (만료 시 한 요청만 재계산)"""
+        if self.ttl <= 0:
+            return self.loader()
+        if self._fresh():
+            return self._value
+
+        with self._refresh_lock:
+            # 대기하는 동안 다른 요청이 이미 갱신했으면 그 결과를 사용
+            if self._fresh():
+                return self._value
+            value = self.loader()
+            self._value = value
+            self._loaded_at = self.clock()
+            return value
+
+    def invalidate(self):
+        """캐시 무효화"""
+        self._loaded_at = None
@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+백엔드 테스트 공통 설정
+
+DB 연결/커서 대역은 benchmarks/fake_db.py (벤치마크와 공유), 시계 대역은 여기에 두고
+테스트는 픽스처로 가져다 씁니다.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# 백엔드 모듈과 벤치마크 보조 모듈 import 경로 추가
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'benchmarks'))
+
+from fake_db import FakeConnection  # noqa: E402
+
+
+class FakeClock:
+    """테스트가 직접 움직이는 monotonic 시계 대역"""
+
+    def __init__(self, now=0.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    """0초에서 시작하는 FakeClock"""
+    return FakeClock()
+
+
+@pytest.fixture
+def fake_connection():
+    """FakeConnection 생성 함수 (FakeConnection(rows=None, respond=None, name=None, record=True))"""
+    return FakeConnection
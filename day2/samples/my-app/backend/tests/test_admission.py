@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+요청 수락 제어 테스트
+"""
+
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from flask import Flask, jsonify
+
+from admission import (
+    ROUTE_CLASS_DEFAULTS, AdaptiveLimiter, AdmissionController, AdmissionRejected, limiter_settings_from_env,
+)
+from launcher import admission_settings
+
+
+class TestAdaptiveLimiter:
+    """한도 / 대기열 / 마감 / AIMD 테스트"""
+
+    def test_queue_full_rejects_immediately(self):
+        limiter = AdaptiveLimiter('t', limit=1, min_limit=1, max_queue=0)
+        limiter.acquire()
+        start = time.perf_counter()
+        with pytest.raises(AdmissionRejected) as e:
+            limiter.acquire()
+        assert e.value.reason == 'queue_full'
+        assert time.perf_counter() - start < 0.1
+
+    def test_deadline(self):
+        limiter = AdaptiveLimiter('t', limit=1, min_limit=1, max_queue=1, queue_timeout=0.05)
+        limiter.acquire()
+        with pytest.raises(AdmissionRejected) as e:
+            limiter.acquire()
+        assert e.value.reason == 'deadline'
+        assert limiter.queued == 0
+
+    def test_queued_request_admitted_on_release(self):
+        limiter = AdaptiveLimiter('t', limit=1, min_limit=1, max_queue=1, queue_timeout=2)
+        limiter.acquire()
+        waited = []
+        waiter = threading.Thread(target=lambda: waited.append(limiter.acquire()))
+        waiter.start()
+        while limiter.queued == 0:
+            time.sleep(0.001)
+        limiter.release()
+        waiter.join(2)
+        assert waited and limiter.in_flight == 1
+
+    def test_slow_window_decreases_limit(self):
+        limiter = AdaptiveLimiter('t', limit=10, min_limit=2, target_latency=0.1, window=4, backoff=0.5)
+        for _ in range(4):
+            limiter.acquire()
+            limiter.release(1.0)
+        assert limiter.limit == 5
+        for _ in range(12):
+            limiter.acquire()
+            limiter.release(1.0)
+        assert limiter.limit == 2
+
+    def test_saturated_fast_window_increases_limit(self):
+        limiter = AdaptiveLimiter('t', limit=2, max_limit=3, target_latency=0.1, window=2)
+        limiter.acquire()
+        limiter.acquire()
+        limiter.release(0.01)
+        limiter.release(0.01)
+        assert limiter.limit == 3
+        # 한도까지 차지 않았으면 늘리지 않음
+        for _ in range(2):
+            limiter.acquire()
+            limiter.release(0.01)
+        assert limiter.limit == 3
+
+    def test_fixed_budget_is_not_adaptive(self):
+        limiter = AdaptiveLimiter('ops', **limiter_settings_from_env('ops'))
+        for _ in range(50):
+            limiter.acquire()
+            limiter.release(10.0)
+        assert limiter.limit == 4
+
+    def test_env_override(self, monkeypatch):
+        monkeypatch.setenv('ADMISSION_API_LIMIT', '3')
+        monkeypatch.setenv('ADMISSION_API_QUEUE_TIMEOUT', '0.2')
+        settings = limiter_settings_from_env('api')
+        assert settings['limit'] == 3 and settings['queue_timeout'] == 0.2
+
+
+class TestAdmissionController:
+    """Flask 훅 테스트"""
+
+    @pytest.fixture
+    def app(self):
+        app = Flask('admission-test')
+        app.release = threading.Event()
+        limiters = {
+            'api': AdaptiveLimiter('api', limit=1, min_limit=1, max_queue=0),
+            'ops': AdaptiveLimiter('ops', limit=1, min_limit=1, max_queue=0, window=0),
+        }
+        app.admission = AdmissionController(app, limiters=limiters, route_classes={'health': 'ops'}, enabled=True)
+
+        @app.route('/slow')
+        def slow():
+            app.release.wait(2)
+            return jsonify({'ok': True})
+
+        @app.route('/health')
+        def health():
+            return jsonify({'status': 'healthy'})
+
+        return app
+
+    def test_overload_sheds_api_but_not_ops(self, app):
+        busy = threading.Thread(target=lambda: app.test_client().get('/slow'))
+        busy.start()
+        while app.admission.limiters['api'].in_flight == 0:
+            time.sleep(0.001)
+        try:
+            client = app.test_client()
+            rejected = client.get('/slow')
+            assert rejected.status_code == 503
+            assert rejected.headers['Retry-After'] == '1'
+            assert rejected.get_json()['reason'] == 'queue_full'
+            assert client.get('/health').status_code == 200
+        finally:
+            app.release.set()
+            busy.join()
+        assert app.admission.limiters['api'].in_flight == 0
+        assert app.test_client().get('/slow').status_code == 200
+
+    def test_unmatched_routes_skip_admission(self, app):
+        assert app.test_client().get('/missing').status_code == 404
+        assert app.admission.limiters['api'].in_flight == 0
+
+    def test_saturated_api_leaves_thread_for_ops(self, monkeypatch):
+        # gthread 워커처럼 스레드 수가 고정된 풀에서 api/heavy를 넘치게 보내도 ops는 처리됨
+        threads = 4
+        for key, value in admission_settings(threads).items():
+            monkeypatch.setenv(key, value)
+        limiters = {name: AdaptiveLimiter(name, **limiter_settings_from_env(name)) for name in ROUTE_CLASS_DEFAULTS}
+        app = Flask('admission-threads')
+        admission = AdmissionController(
+            app, limiters=limiters, route_classes={'health': 'ops', 'export': 'heavy'}, enabled=True,
+        )
+        release = threading.Event()
+
+        @app.route('/slow')
+        def slow():
+            release.wait(5)
+            return jsonify({'ok': True})
+
+        @app.route('/export')
+        def export():
+            release.wait(5)
+            return jsonify({'ok': True})
+
+        @app.route('/health')
+        def health():
+            return jsonify({'status': 'healthy'})
+
+        def get(path):
+            return app.test_client().get(path).status_code
+
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            try:
+                flood = [pool.submit(get, path) for path in ['/slow'] * 20 + ['/export'] * 5]
+                assert pool.submit(get, '/health').result(timeout=2) == 200
+                assert admission.limiters['api'].in_flight + admission.limiters['heavy'].in_flight < threads
+            finally:
+                release.set()
+            codes = [f.result(timeout=5) for f in flood]
+        assert 503 in codes and codes.count(200) >= 2
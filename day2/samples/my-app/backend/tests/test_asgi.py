@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""
+ASGI 서빙 모드 테스트
+"""
+
+import pytest
+
+pytest.importorskip('asyncpg')
+pytest.importorskip('httpx')
+
+from starlette.testclient import TestClient
+
+import asgi
+
+
+class TestAsgi:
+    """Flask 앱과 같은 JSON 계약 확인"""
+
+    def test_routes_without_database(self, monkeypatch):
+        """DB가 없으면 Flask 앱처럼 400/503 응답"""
+        async def no_db():
+            return None
+
+        monkeypatch.setattr(asgi, 'init_db', no_db)
+        with TestClient(asgi.app) as client:
+            assert client.get('/').json()['version'] == '2.0.0'
+            assert client.get('/health').status_code == 503
+            assert client.get('/health?deep=1').status_code == 503
+            assert client.get('/livez').status_code == 200
+            assert client.get('/readyz').status_code == 503
+            assert client.get('/api/users').status_code == 503
+            assert client.get('/api/users?limit=abc').status_code == 400
+            assert client.post('/api/users', json={'name': 'a'}).status_code == 400
+            assert client.get('/api/stats').status_code == 503
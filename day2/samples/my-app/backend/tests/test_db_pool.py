@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+연결 풀 테스트
+"""
+
+import threading
+
+import psycopg2
+import pytest
+from prometheus_client import REGISTRY
+from psycopg2 import extensions
+
+from db_pool import ConnectionPool, PoolExhaustedError, PoolTimeoutError, PrefillConnectionPool
+
+
+class FakeThreadedPool(PrefillConnectionPool):
+    """FakeConnection을 여는 PrefillConnectionPool
+
+    반환/폐기는 psycopg2 ThreadedConnectionPool 코드를 그대로 타므로, 유휴가 minconn개 이상일 때
+    반환된 연결을 닫는 동작도 실제 풀과 같습니다. keep을 주면 그 값을 minconn으로 써서
+    prefill 보정 전의 psycopg2 풀처럼 동작합니다.
+    """
+
+    def __init__(self, minconn, maxconn, connect, keep=None):
+        super().__init__(minconn, maxconn)
+        self.connect = connect
+        self.created = 0
+        if keep is not None:
+            self.minconn = keep
+
+    def _connect(self, key=None):
+        self.created += 1
+        conn = self.connect()
+        if key is not None:
+            self._used[key] = conn
+            self._rused[id(conn)] = key
+        else:
+            self._pool.append(conn)
+        return conn
+
+
+@pytest.fixture
+def make_pool(fake_connection):
+    """FakeThreadedPool 위에 만든 ConnectionPool 생성 함수 (keep: FakeThreadedPool 참고)"""
+    def make(keep=None, **kwargs):
+        options = {
+            'minconn': 1, 'maxconn': 2, 'timeout': 0.05,
+            'pool_factory': lambda minconn, maxconn, **dsn: FakeThreadedPool(minconn, maxconn, fake_connection, keep),
+        }
+        options.update(kwargs)
+        return ConnectionPool(**options)
+    return make
+
+
+class TestCheckout:
+    """체크아웃/반환 테스트"""
+
+    def test_connection_returned_on_exception(self, make_pool):
+        """컨텍스트 매니저는 예외가 나도 연결 반환"""
+        pool = make_pool()
+        for _ in range(5):
+            with pytest.raises(RuntimeError):
+                with pool.connection():
+                    raise RuntimeError('handler failed')
+        assert pool.in_use == 0
+        with pool.connection() as conn:
+            assert conn is not None
+
+    def test_open_transaction_rolled_back(self, make_pool):
+        """반환 시 진행 중인 트랜잭션 롤백"""
+        pool = make_pool()
+        with pool.connection() as conn:
+            conn.info.transaction_status = extensions.TRANSACTION_STATUS_INTRANS
+        assert conn.rollbacks == 1
+
+    def test_broken_connection_discarded(self, make_pool):
+        """OperationalError가 난 연결은 폐기"""
+        pool = make_pool()
+        with pytest.raises(psycopg2.OperationalError):
+            with pool.connection() as conn:
+                raise psycopg2.OperationalError('connection reset')
+        assert conn.closed
+        with pool.connection() as other:
+            assert other is not conn
+
+
+    def test_concurrent_checkouts_reuse_connections(self, make_pool):
+        """동시에 빌린 연결도 반환 후 닫지 않고 재사용 (minconn개를 넘어도)"""
+        pool = make_pool(minconn=1, maxconn=10)
+        for _ in range(50):
+            first, second = pool.getconn(), pool.getconn()
+            pool.putconn(first)
+            pool.putconn(second)
+        assert pool._pool.created == 2
+        assert not first.closed and not second.closed
+        assert len(pool._born) == 2
+
+    def test_connection_closed_by_psycopg2_is_forgotten(self, make_pool):
+        """psycopg2 풀이 반환받으며 닫은 연결은 생성/사용 시각 기록도 지움"""
+        pool = make_pool(keep=1)
+        first, second = pool.getconn(), pool.getconn()
+        pool.putconn(first)
+        pool.putconn(second)
+        assert second.closed and not first.closed
+        assert list(pool._born) == [first] and list(pool._last_used) == [first]
+
+
+class TestLimits:
+    """대기열/타임아웃 테스트"""
+
+    def test_timeout_when_saturated(self, make_pool):
+        """모든 연결이 사용 중이면 타임아웃"""
+        pool = make_pool(maxconn=1)
+        conn = pool.getconn()
+        with pytest.raises(PoolTimeoutError):
+            pool.getconn()
+        pool.putconn(conn)
+        pool.putconn(pool.getconn())
+
+    def test_wait_queue_bound(self, make_pool):
+        """대기열이 가득 차면 즉시 거절"""
+        pool = make_pool(maxconn=1, max_waiters=1, timeout=2)
+        conn = pool.getconn()
+        waiting = threading.Thread(target=lambda: pool.putconn(pool.getconn()))
+        waiting.start()
+        while pool.waiting == 0:
+            pass
+        with pytest.raises(PoolExhaustedError):
+            pool.getconn()
+        pool.putconn(conn)
+        waiting.join()
+        assert pool.in_use == 0
+
+
+class TestHealth:
+    """헬스 체크/수명 테스트"""
+
+    def test_idle_connection_pinged(self, make_pool):
+        """ping_interval이 지난 연결만 SELECT 1로 확인하고 깨진 연결은 교체"""
+        pool = make_pool(ping_interval=0)
+        conn = pool.getconn()
+        pool.putconn(conn)
+        conn.broken = True
+
+        fresh = pool.getconn()
+        assert fresh is not conn
+        assert conn.closed and len(conn.executed) == 1
+        pool.putconn(fresh)
+
+    def test_recent_connection_not_pinged(self, make_pool):
+        """최근 사용한 연결은 확인 없이 재사용"""
+        pool = make_pool(ping_interval=60)
+        conn = pool.getconn()
+        pool.putconn(conn)
+        assert pool.getconn() is conn
+        assert conn.executed == []
+
+    def test_max_lifetime(self, make_pool):
+        """최대 수명이 지난 연결은 반환 시 폐기"""
+        pool = make_pool(max_lifetime=1e-9)
+        conn = pool.getconn()
+        pool.putconn(conn)
+        assert conn.closed
+
+
+class TestMetrics:
+    """풀 메트릭 테스트"""
+
+    def sample(self, name, **labels):
+        return REGISTRY.get_sample_value(name, labels) or 0
+
+    def test_checkout_gauges_and_latency(self, make_pool):
+        """사용 중/유휴 게이지와 체크아웃 지연 히스토그램"""
+        pool = make_pool(name='metrics-gauges')
+        conn = pool.getconn()
+        assert self.sample('db_pool_connections_in_use', pool='metrics-gauges') == 1
+        assert self.sample('db_pool_checkout_duration_seconds_count', pool='metrics-gauges') == 1
+        assert self.sample('db_connections_total', pool='metrics-gauges') == 1
+
+        pool.putconn(conn)
+        assert self.sample('db_pool_connections_in_use', pool='metrics-gauges') == 0
+        assert self.sample('db_pool_connections_idle', pool='metrics-gauges') == 1
+
+    def test_exhaustion_counted(self, make_pool):
+        """타임아웃 고갈 이벤트 카운트"""
+        pool = make_pool(name='metrics-exhausted', maxconn=1)
+        conn = pool.getconn()
+        with pytest.raises(PoolTimeoutError):
+            pool.getconn()
+        pool.putconn(conn)
+        assert self.sample('db_pool_exhausted_total', pool='metrics-exhausted', reason='timeout') == 1
+
+    def test_connection_age_on_discard(self, make_pool):
+        """폐기된 연결의 수명 기록"""
+        pool = make_pool(name='metrics-age')
+        pool.putconn(pool.getconn(), close=True)
+        assert self.sample('db_connection_age_seconds_count', pool='metrics-age') == 1
+
+    def test_metrics_follow_pool_when_connections_close(self, make_pool):
+        """반환 시 연결을 닫는 풀에서도 연결 수/유휴/수명 메트릭이 실제 풀과 일치"""
+        pool = make_pool(name='metrics-churn', keep=1, maxconn=10)
+        for _ in range(20):
+            first, second = pool.getconn(), pool.getconn()
+            pool.putconn(first)
+            pool.putconn(second)
+        assert pool._pool.created == 21
+        assert self.sample('db_connections_total', pool='metrics-churn') == 21
+        assert self.sample('db_connection_age_seconds_count', pool='metrics-churn') == 20
+        assert self.sample('db_pool_connections_idle', pool='metrics-churn') == pool._pool.idle_count == 1
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+읽기 복제본 라우팅 테스트
+"""
+
+from contextlib import contextmanager
+
+import psycopg2
+import pytest
+
+from db_pool import PoolExhaustedError, PoolTimeoutError
+from db_router import ReadRouter, Replica, mark_write, wrote_recently
+
+
+class FakePool:
+    """ConnectionPool 대역 (연결 하나를 계속 빌려주고, fail이 있으면 그 예외를 발생)"""
+
+    def __init__(self, conn, fail=None):
+        self.conn = conn
+        self.fail = fail
+        self.returned = []
+
+    def getconn(self):
+        if self.fail is not None:
+            raise self.fail
+        return self.conn
+
+    def putconn(self, conn, close=False):
+        self.returned.append((conn, close))
+
+    def closeall(self):
+        pass
+
+
+@pytest.fixture
+def replica(fake_connection):
+    """이름과 복제 지연(초)으로 FakePool 생성"""
+    def make(name, lag=0.0, fail=None):
+        return FakePool(fake_connection(rows=[(lag,)], name=name), fail=fail)
+    return make
+
+
+@pytest.fixture
+def make_router(fake_connection, clock):
+    """FakePool 복제본으로 만든 (ReadRouter, FakeClock, primary 연결 컨텍스트)"""
+    primary_conn = fake_connection(name='primary')
+    clock.now = 100.0
+
+    @contextmanager
+    def primary():
+        yield primary_conn
+
+    def make(*pools, max_lag=5, interval=10):
+        replicas = [Replica(f'r{i}', pool_factory=lambda p=p: p) for i, p in enumerate(pools)]
+        return ReadRouter(replicas, max_lag=max_lag, lag_check_interval=interval, clock=clock), clock, primary
+    return make
+
+
+def read_name(router, primary, **kwargs):
+    with router.connection(primary, **kwargs) as conn:
+        return conn.name
+
+
+class TestReadRouter:
+    """라우팅 규칙 테스트"""
+
+    def test_no_replicas_uses_primary(self, make_router, replica):
+        router, _, primary = make_router()
+        assert read_name(router, primary) == 'primary'
+
+    def test_round_robin(self, make_router, replica):
+        router, _, primary = make_router(replica('a'), replica('b'))
+        assert [read_name(router, primary) for _ in range(4)] == ['a', 'b', 'a', 'b']
+
+    def test_lagging_replica_skipped(self, make_router, replica):
+        """지연이 큰 복제본은 건너뛰고, 측정은 주기마다 한 번"""
+        lagging = replica('a', lag=30)
+        router, clock, primary = make_router(lagging, replica('b'))
+        assert [read_name(router, primary) for _ in range(4)] == ['b', 'b', 'b', 'b']
+        assert len(lagging.conn.executed) == 1
+
+        lagging.conn.rows = [(0.0,)]
+        clock.now += 10
+        assert 'a' in [read_name(router, primary) for _ in range(2)]
+
+    def test_all_lagging_falls_back_to_primary(self, make_router, replica):
+        router, _, primary = make_router(replica('a', lag=30))
+        assert read_name(router, primary) == 'primary'
+
+    def test_unavailable_replica_backs_off(self, make_router, replica):
+        down = replica('a', fail=psycopg2.OperationalError('could not connect to server'))
+        router, clock, primary = make_router(down, replica('b'))
+        assert read_name(router, primary) == 'b'
+        down.fail = None
+        assert [read_name(router, primary) for _ in range(2)] == ['b', 'b']
+        clock.now += 60
+        assert 'a' in [read_name(router, primary) for _ in range(2)]
+
+    def test_busy_replica_is_not_ejected(self, make_router, replica):
+        """풀이 가득 찬 복제본은 그 요청만 primary로 보내고 다음 요청에서 다시 사용"""
+        busy = replica('a', fail=PoolTimeoutError('Timed out after 5s waiting for a connection'))
+        router, _, primary = make_router(busy)
+        assert read_name(router, primary) == 'primary'
+        busy.fail = PoolExhaustedError('Connection wait queue is full (50)')
+        assert read_name(router, primary) == 'primary'
+        busy.fail = None
+        assert read_name(router, primary) == 'a'
+        assert router.replicas[0].down_until == 0
+
+    def test_prefer_primary(self, make_router, replica):
+        router, _, primary = make_router(replica('a'))
+        assert read_name(router, primary, prefer_primary=True) == 'primary'
+
+    def test_broken_replica_connection_discarded(self, make_router, replica):
+        pool = replica('a')
+        router, _, primary = make_router(pool)
+        try:
+            with router.connection(primary):
+                raise psycopg2.OperationalError('replica went away')
+        except psycopg2.OperationalError:
+            pass
+        assert pool.returned[-1] == (pool.conn, True)
+
+
+class FakeResponse:
+    def __init__(self):
+        self.cookies = {}
+
+    def set_cookie(self, key, value, **kwargs):
+        self.cookies[key] = value
+
+
+class TestReadYourWrites:
+    """read-your-writes 쿠키 테스트"""
+
+    def test_cookie_window(self):
+        response = mark_write(FakeResponse(), now=1000.0)
+        assert wrote_recently(response.cookies, now=1001.0)
+        assert not wrote_recently(response.cookies, now=1010.0)
+        assert not wrote_recently({'myapp_ryw': 'garbage'}, now=0)
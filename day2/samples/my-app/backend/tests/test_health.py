@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+헬스 체크 스냅샷 / 프로브 엔드포인트 테스트
+"""
+
+import threading
+
+import pytest
+
+from health import HealthMonitor
+
+
+def failing_check():
+    raise RuntimeError('db down')
+
+
+class TestHealthMonitor:
+    """스냅샷 / 만료 / 스레드 테스트"""
+
+    def test_starting_until_first_check(self, clock):
+        monitor = HealthMonitor(lambda: None, clock=clock)
+        assert not monitor.is_ready()
+        assert monitor.status()['status'] == 'starting'
+
+    def test_refresh_records_result(self, clock):
+        monitor = HealthMonitor(failing_check, clock=clock)
+        snapshot = monitor.refresh()
+        assert not snapshot.ok and snapshot.error == 'db down'
+        assert monitor.status()['database'] == 'disconnected'
+
+        monitor.check = lambda: None
+        assert monitor.refresh().ok
+        assert monitor.is_ready()
+
+    def test_stale_snapshot_is_not_ready(self, clock):
+        monitor = HealthMonitor(lambda: None, stale_after=15, clock=clock)
+        monitor.refresh()
+        clock.now = 16
+        assert not monitor.is_ready()
+        assert monitor.status()['status'] == 'not_ready'
+
+    def test_background_thread(self):
+        checked = threading.Event()
+        monitor = HealthMonitor(checked.set, interval=60)
+        monitor.start()
+        monitor.start()
+        try:
+            assert checked.wait(2)
+            assert monitor.is_ready()
+        finally:
+            monitor.stop(timeout=2)
+        assert monitor._thread is None
+
+
+class TestProbeRoutes:
+    """Flask 앱의 /livez, /readyz, /health 테스트"""
+
+    @pytest.fixture
+    def client(self, monkeypatch):
+        import app as backend
+
+        calls = []
+        monitor = HealthMonitor(lambda: calls.append(1))
+        monkeypatch.setattr(monitor, 'start', lambda: None)
+        monkeypatch.setattr(backend, 'health_monitor', monitor)
+        monkeypatch.setattr(backend, 'ping_database', lambda: calls.append(1))
+        client = backend.app.test_client()
+        client.calls = calls
+        client.monitor = monitor
+        return client
+
+    def test_livez_does_no_io(self, client):
+        assert client.get('/livez').status_code == 200
+        assert client.calls == []
+
+    def test_readyz_reads_snapshot(self, client):
+        assert client.get('/readyz').status_code == 503
+        client.monitor.refresh()
+        response = client.get('/readyz')
+        assert response.status_code == 200
+        assert response.get_json()['status'] == 'ready'
+        assert len(client.calls) == 1
+
+    def test_health_uses_snapshot_unless_deep(self, client):
+        client.monitor.refresh()
+        assert client.get('/health').status_code == 200
+        assert len(client.calls) == 1
+        assert client.get('/health?deep=1').status_code == 200
+        assert len(client.calls) == 2
+
+    def test_unhealthy_snapshot(self, client):
+        client.monitor.record('db down')
+        response = client.get('/health')
+        assert response.status_code == 503
+        assert response.get_json()['error'] == 'db down'
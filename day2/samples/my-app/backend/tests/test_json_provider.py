@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+JSON 직렬화 테스트
+"""
+
+import json
+from collections import Counter, OrderedDict, defaultdict
+from datetime import datetime
+from enum import Enum, IntEnum
+
+from flask import Flask, jsonify
+from flask.json.provider import DefaultJSONProvider
+
+from json_provider import FastJSONProvider, dumps
+from user_export import rows_to_users
+
+ROWS = [
+    (2, '김철수', 'kim@example.com', datetime(2024, 1, 2, 3, 4, 5, 600)),
+    (1, 'John Doe', 'john@example.com', None),
+]
+
+
+class Color(str, Enum):
+    RED = 'red'
+
+
+class Level(IntEnum):
+    HIGH = 3
+
+
+class TestJsonProvider:
+    """프로바이더 테스트"""
+
+    def test_datetime_as_isoformat(self):
+        """datetime은 기존 isoformat() 출력과 동일"""
+        value = datetime(2024, 1, 2, 3, 4, 5, 600)
+        assert json.loads(dumps({'at': value})) == {'at': value.isoformat()}
+
+    def test_jsonify_uses_provider(self):
+        """jsonify 응답에 비ASCII 문자와 datetime 처리"""
+        app = Flask('json-provider-test')
+        app.json = FastJSONProvider(app)
+        with app.app_context():
+            response = jsonify({'users': rows_to_users(ROWS)})
+        body = json.loads(response.get_data())
+        assert response.mimetype == 'application/json'
+        assert body['users'][0] == {
+            'id': 2, 'name': '김철수', 'email': 'kim@example.com', 'created_at': '2024-01-02T03:04:05.000600'
+        }
+        assert body['users'][1]['created_at'] is None
+
+    def test_bulk_conversion_paths_match(self):
+        """네이티브/폴백 변환 결과의 직렬화 결과가 같음"""
+        assert json.loads(dumps(rows_to_users(ROWS, native_datetime=True))) == \
+            json.loads(dumps(rows_to_users(ROWS, native_datetime=False)))
+
+    def test_builtin_subclasses_match_flask_default(self):
+        """dict/str/int 하위 클래스도 Flask 기본 프로바이더와 같은 결과"""
+        counts = defaultdict(list, {'a': [1]})
+        value = {
+            'ordered': OrderedDict([('b', 1), ('a', 2)]),
+            'counts': counts,
+            'counter': Counter('aab'),
+            'color': Color.RED,
+            'level': Level.HIGH,
+        }
+        app = Flask('json-provider-default')
+        expected = json.loads(DefaultJSONProvider(app).dumps(value))
+        assert json.loads(dumps(value)) == expected
+        assert expected['color'] == 'red' and expected['level'] == 3
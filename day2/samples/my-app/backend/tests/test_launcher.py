@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+프로덕션 런처 테스트
+"""
+
+from launcher import admission_settings, cgroup_cpu_limit, load_worker_processes, recommended_workers, worker_settings
+
+
+def write_cgroup(tmp_path, relpath, content):
+    path = tmp_path / relpath.lstrip('/')
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content)
+
+
+class TestCpuLimit:
+    """cgroup CPU 쿼터 파싱 테스트"""
+
+    def test_cgroup_v2_quota(self, tmp_path):
+        write_cgroup(tmp_path, '/sys/fs/cgroup/cpu.max', '250000 100000\n')
+        assert cgroup_cpu_limit(str(tmp_path)) == 2.5
+
+    def test_cgroup_v2_unlimited(self, tmp_path):
+        write_cgroup(tmp_path, '/sys/fs/cgroup/cpu.max', 'max 100000\n')
+        assert cgroup_cpu_limit(str(tmp_path)) is None
+
+    def test_cgroup_v1_quota(self, tmp_path):
+        write_cgroup(tmp_path, '/sys/fs/cgroup/cpu/cpu.cfs_quota_us', '50000')
+        write_cgroup(tmp_path, '/sys/fs/cgroup/cpu/cpu.cfs_period_us', '100000')
+        assert cgroup_cpu_limit(str(tmp_path)) == 0.5
+
+    def test_no_cgroup(self, tmp_path):
+        assert cgroup_cpu_limit(str(tmp_path)) is None
+
+
+class TestWorkers:
+    """워커 수 계산 테스트"""
+
+    def test_recommended_workers(self):
+        assert recommended_workers(0.5) == 2
+        assert recommended_workers(2) == 5
+        assert recommended_workers(64) == 12
+
+    def test_env_override(self):
+        assert worker_settings({'GUNICORN_WORKERS': '7', 'GUNICORN_THREADS': '8'}) == (7, 8)
+        assert worker_settings({'WEB_CONCURRENCY': '3'})[0] == 3
+
+    def test_load_processes_split_across_workers(self):
+        assert load_worker_processes(8, 4) == 2
+        assert load_worker_processes(2.5, 5) == 1
+        assert load_worker_processes(16, 1) == 16
+        # 워커를 모두 합쳐도 CPU 수를 넘지 않음
+        for cpus in (2, 4, 8, 16):
+            workers = recommended_workers(cpus)
+            assert load_worker_processes(cpus, workers) * workers <= max(cpus, workers)
+
+    def test_admission_budget_leaves_ops_threads(self):
+        for threads in (3, 4, 8, 16, 32):
+            env = admission_settings(threads, ops_threads=1)
+            assert int(env['ADMISSION_API_MAX_LIMIT']) + int(env['ADMISSION_HEAVY_MAX_LIMIT']) <= threads - 1
+            assert int(env['ADMISSION_API_LIMIT']) <= int(env['ADMISSION_API_MAX_LIMIT'])
+            assert env['ADMISSION_API_MAX_QUEUE'] == env['ADMISSION_HEAVY_MAX_QUEUE'] == '0'
+        assert admission_settings(4) == {
+            'ADMISSION_API_LIMIT': '2', 'ADMISSION_API_MIN_LIMIT': '2', 'ADMISSION_API_MAX_LIMIT': '2',
+            'ADMISSION_API_MAX_QUEUE': '0', 'ADMISSION_HEAVY_LIMIT': '1', 'ADMISSION_HEAVY_MIN_LIMIT': '1',
+            'ADMISSION_HEAVY_MAX_LIMIT': '1', 'ADMISSION_HEAVY_MAX_QUEUE': '0',
+        }
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+부하 생성 작업 테스트
+"""
+
+import time
+
+import pytest
+
+import cpu_burn
+from load_jobs import LoadJobManager, LoadRejected
+
+
+def wait_until(predicate, timeout=20):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+class TestBurnCpu:
+    """duty cycle / 취소 테스트 (현재 프로세스에서 직접 실행)"""
+
+    def test_duty_cycle_limits_cpu(self):
+        result = cpu_burn.burn_cpu(0, 30, 0.5)
+        assert not result['cancelled']
+        assert result['elapsed'] == pytest.approx(0.5, abs=0.15)
+        assert result['cpu_seconds'] < 0.35
+
+    def test_cancel_flag(self, monkeypatch):
+        monkeypatch.setattr(cpu_burn, '_cancel_flags', [1])
+        start = time.monotonic()
+        assert cpu_burn.burn_cpu(0, 100, 5)['cancelled']
+        assert time.monotonic() - start < 0.5
+
+
+class TestLoadJobManager:
+    """프로세스 풀 작업 테스트"""
+
+    @pytest.fixture
+    def manager(self):
+        manager = LoadJobManager(max_workers=2, max_tasks=2, max_duration=1)
+        yield manager
+        manager.shutdown()
+
+    def test_start_returns_immediately_and_completes(self, manager):
+        start = time.monotonic()
+        job = manager.start_cpu(cpu_percent=50, duration=0.3, workers=1)
+        assert time.monotonic() - start < 0.3
+        assert job.status in ('queued', 'running')
+
+        assert wait_until(lambda: job.done)
+        body = job.to_dict()
+        assert body['status'] == 'completed'
+        assert body['result']['tasks'] == 1
+        assert job.finished_at is not None
+
+    def test_cancel_running_job(self, manager):
+        job = manager.start_cpu(cpu_percent=100, duration=30, workers=1)
+        assert job.params['duration'] == 1
+        assert wait_until(lambda: job.status == 'running')
+        manager.cancel(job.id)
+        assert wait_until(lambda: job.done, timeout=5)
+        assert job.status == 'cancelled'
+
+    def test_cancel_finished_job_is_noop(self, manager):
+        job = manager.start_cpu(cpu_percent=50, duration=0.1, workers=1)
+        assert wait_until(lambda: job.done)
+        assert manager.cancel(job.id) is job
+        assert job.cancel_requested is False and job.status == 'completed'
+
+    def test_slots_are_bounded(self, manager):
+        manager.start_cpu(cpu_percent=10, duration=0.5, workers=2)
+        with pytest.raises(LoadRejected):
+            manager.start_cpu(cpu_percent=10, duration=0.5, workers=1)
+
+    def test_validation(self, manager):
+        with pytest.raises(ValueError):
+            manager.start_cpu(cpu_percent=0)
+        with pytest.raises(ValueError):
+            manager.start_cpu(duration=-1)
+        assert manager.validate_cpu(100, 10, 99) == (100.0, 1.0, 2)
+
+
+class TestLoadRoutes:
+    """/api/load 엔드포인트 테스트"""
+
+    @pytest.fixture
+    def client(self, monkeypatch):
+        import app as backend
+
+        manager = LoadJobManager(max_workers=1, max_tasks=1, max_duration=5)
+        monkeypatch.setattr(backend, 'load_jobs', manager)
+        yield backend.app.test_client()
+        manager.shutdown()
+
+    def test_start_poll_cancel(self, client):
+        response = client.get('/api/load?duration=5&intensity=1')
+        assert response.status_code == 202
+        location = response.headers['Location']
+
+        assert client.get(location).get_json()['id'] == response.get_json()['id']
+        assert client.post('/api/load/jobs', json={'duration': 1}).status_code == 503
+        assert client.delete(location).status_code == 200
+        assert client.get('/api/load/jobs/missing').status_code == 404
+
+    def test_bad_parameters(self, client):
+        assert client.get('/api/load?duration=abc').status_code == 400
+        assert client.post('/api/load/jobs', json={'cpu_percent': 150}).status_code == 400
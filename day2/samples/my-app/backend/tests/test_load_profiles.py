@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+부하 프로필 (memory / disk / db / latency)과 ramp 모양 테스트
+"""
+
+import time
+import threading
+
+import pytest
+from flask import Flask, jsonify
+
+import load_profiles
+from load_jobs import LoadJobManager, LoadRejected
+from load_profiles import LatencyInjector, MemoryBallast, run_db, run_disk, run_memory, validate_profile
+from load_shapes import load_level
+from metrics import LOAD_MEMORY_BYTES
+
+
+def profile_params(profile, **data):
+    return validate_profile(profile, {'duration': 0.3, **data}, max_duration=5)
+
+
+class TestLoadShapes:
+    """ramp_up / 유지 / ramp_down 비율 테스트"""
+
+    def test_linear_ramps(self):
+        assert load_level(0, 10, ramp_up=2) == 0
+        assert load_level(1, 10, ramp_up=2) == pytest.approx(0.5)
+        assert load_level(5, 10, ramp_up=2, ramp_down=2) == 1
+        assert load_level(9, 10, ramp_down=2) == pytest.approx(0.5)
+        assert load_level(10, 10) == 0
+
+    def test_shapes(self):
+        assert load_level(1, 10, ramp_up=4, shape='step') == 0.25
+        assert load_level(1, 10, ramp_up=4, shape='smooth') < 0.25
+        assert load_level(2, 10, ramp_up=4, shape='smooth') == pytest.approx(0.5)
+
+    def test_ramps_longer_than_duration_are_scaled(self):
+        assert load_level(5, 10, ramp_up=10, ramp_down=10) == pytest.approx(1.0)
+
+
+class TestProfiles:
+    """프로필 실행기 테스트"""
+
+    def test_memory_ballast_resize(self):
+        ballast = MemoryBallast()
+        ballast.resize(3)
+        assert ballast.size_bytes == 3 * load_profiles.MEGABYTE
+        ballast.resize(1)
+        assert len(ballast.chunks) == 1
+
+    def test_memory_profile_releases_ballast(self):
+        before = LOAD_MEMORY_BYTES._value.get()
+        result = run_memory(profile_params('memory', megabytes=4), threading.Event())
+        assert result['peak_bytes'] == 4 * load_profiles.MEGABYTE
+        assert LOAD_MEMORY_BYTES._value.get() == before
+
+    def test_disk_profile_writes_at_rate(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(load_profiles, 'LOAD_IO_DIR', str(tmp_path))
+        result = run_disk(profile_params('disk', mb_per_second=2), threading.Event())
+        assert 0.2 * load_profiles.MEGABYTE < result['bytes_written'] <= 2 * load_profiles.MEGABYTE
+        # 임시 파일은 끝나면 사라짐
+        assert list(tmp_path.iterdir()) == []
+
+    def test_db_profile_runs_queries_on_dedicated_connections(self, fake_connection):
+        connections = []
+
+        def connect():
+            conn = fake_connection(rows=[])
+            connections.append(conn)
+            return conn
+
+        result = run_db(profile_params('db', qps=50, connections=2), threading.Event(), connect=connect)
+        assert result['errors'] == 0
+        assert 5 <= result['queries'] <= 20
+        statements = [sql for conn in connections for sql in conn.statements]
+        assert result['queries'] == len(statements)
+        assert any('FROM users' in sql for sql in statements)
+        assert len(connections) == 2 and all(conn.closed for conn in connections)
+
+    def test_cancel_stops_profile(self):
+        stop = threading.Event()
+        stop.set()
+        start = time.monotonic()
+        assert run_memory(profile_params('memory', megabytes=1, duration=5), stop)['cancelled']
+        assert time.monotonic() - start < 0.2
+
+    def test_validation(self):
+        with pytest.raises(ValueError):
+            profile_params('memory', megabytes=load_profiles.LOAD_MAX_MEMORY_MB + 1)
+        with pytest.raises(ValueError):
+            profile_params('latency', probability=0)
+        with pytest.raises(ValueError):
+            profile_params('disk', shape='square')
+        with pytest.raises(ValueError):
+            profile_params('gpu')
+
+
+class TestLatencyInjector:
+    """지연 주입 훅 테스트"""
+
+    @pytest.fixture
+    def app(self):
+        app = Flask('latency-test')
+        app.slept = []
+        app.injector = LatencyInjector(app, sleep=app.slept.append, rand=lambda: 0.5)
+
+        @app.route('/api/users')
+        def users():
+            return jsonify([])
+
+        @app.route('/api/load/jobs')
+        def jobs():
+            return jsonify([])
+
+        return app
+
+    def test_injects_matching_paths_only(self, app):
+        client = app.test_client()
+        client.get('/api/users')
+        assert app.slept == []
+
+        app.injector.update('job', 0.2, 1.0, '/api/')
+        client.get('/api/users')
+        client.get('/api/load/jobs')
+        assert app.slept == [0.2]
+
+        app.injector.remove('job')
+        client.get('/api/users')
+        assert app.slept == [0.2]
+
+    def test_probability(self, app):
+        app.injector.update('job', 0.2, 0.25, '/api/')
+        app.test_client().get('/api/users')
+        assert app.slept == []
+
+
+class TestProfileJobs:
+    """LoadJobManager 스레드 프로필 작업 테스트"""
+
+    @pytest.fixture
+    def manager(self):
+        manager = LoadJobManager(max_workers=1, max_tasks=1, max_duration=5, max_profile_jobs=1)
+        yield manager
+        manager.shutdown()
+
+    def test_profile_job_lifecycle(self, manager):
+        job = manager.start('memory', {'megabytes': 1, 'duration': 5, 'ramp_up': 1})
+        assert job.kind == 'memory' and job.params['ramp_up'] == 1
+        with pytest.raises(LoadRejected):
+            manager.start('latency', {'duration': 1})
+
+        manager.cancel(job.id)
+        deadline = time.monotonic() + 2
+        while not job.done and time.monotonic() < deadline:
+            time.sleep(0.02)
+        body = job.to_dict()
+        assert body['status'] == 'cancelled'
+        assert body['result']['cancelled'] is True
+
+    def test_latency_job_registers_injection(self, manager):
+        job = manager.start('latency', {'latency_ms': 100, 'duration': 5})
+        deadline = time.monotonic() + 2
+        while not manager.latency.active and time.monotonic() < deadline:
+            time.sleep(0.02)
+        assert manager.latency.active[job.id][0] == pytest.approx(0.1)
+        manager.cancel(job.id)
+        while not job.done and time.monotonic() < deadline:
+            time.sleep(0.02)
+        assert manager.latency.active == {}
+
+    def test_unknown_profile(self, manager):
+        with pytest.raises(ValueError):
+            manager.start('gpu', {})
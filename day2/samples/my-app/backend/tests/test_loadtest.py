@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+HTTP 부하 테스트 도구 (benchmarks/loadtest.py) 테스트
+"""
+
+import sys
+import json
+import asyncio
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'benchmarks'))
+
+import loadtest  # noqa: E402
+from loadtest import LatencyHistogram, LoadTest, Scenario  # noqa: E402
+
+SCENARIOS = Path(__file__).resolve().parent.parent / 'benchmarks' / 'scenarios'
+
+
+async def serve(delays, received):
+    """경로별 지연을 두고 200을 돌려주는 keep-alive HTTP 서버 (한 번에 한 요청씩 처리)"""
+    lock = asyncio.Lock()
+
+    async def handle(reader, writer):
+        try:
+            await respond(reader, writer)
+        except (asyncio.CancelledError, ConnectionError, asyncio.IncompleteReadError):
+            pass
+        writer.close()
+
+    async def respond(reader, writer):
+        while True:
+            request_line = await reader.readline()
+            if not request_line:
+                break
+            length = 0
+            while True:
+                line = await reader.readline()
+                if line in (b'\r\n', b''):
+                    break
+                if line.lower().startswith(b'content-length'):
+                    length = int(line.split(b':')[1])
+            body = await reader.readexactly(length)
+            method, path = request_line.decode().split()[:2]
+            received.append((method, path, body))
+            async with lock:
+                delay = delays.get(path, 0)
+                if callable(delay):
+                    delay = delay()
+                await asyncio.sleep(delay)
+            payload = b'{"ok":true}'
+            writer.write(b'HTTP/1.1 200 OK\r\nContent-Length: %d\r\n\r\n%s' % (len(payload), payload))
+            await writer.drain()
+
+    return await asyncio.start_server(handle, '127.0.0.1', 0)
+
+
+def run_scenario(delays, **settings):
+    received = []
+
+    async def main():
+        server = await serve(delays, received)
+        port = server.sockets[0].getsockname()[1]
+        scenario = Scenario.from_dict({
+            'name': 'test',
+            'requests': [
+                {'name': 'list', 'path': '/api/users', 'weight': 3},
+                {'name': 'create', 'method': 'POST', 'path': '/api/users/new', 'json': {'email': 'u{n}-{run}@x.io'}},
+            ],
+        }, base_url=f'http://127.0.0.1:{port}', warmup=0, **{'timeout': 2, **settings})
+        async with server:
+            return await LoadTest(scenario, seed=1).run()
+
+    return asyncio.run(main()), received
+
+
+class TestLatencyHistogram:
+    """HDR 방식 히스토그램 테스트"""
+
+    def test_percentiles_within_precision(self):
+        histogram = LatencyHistogram()
+        for ms in range(1, 1001):
+            histogram.record(ms / 1000)
+        assert histogram.percentile(50) == pytest.approx(0.5, rel=0.002)
+        assert histogram.percentile(99) == pytest.approx(0.99, rel=0.002)
+        assert histogram.percentile(99.9) == pytest.approx(0.999, rel=0.002)
+        assert histogram.percentile(100) == pytest.approx(1.0)
+
+    def test_corrected_recording_backfills_missed_samples(self):
+        histogram = LatencyHistogram()
+        histogram.record_corrected(0.1, expected_interval=0.01)
+        assert histogram.total == 10
+        assert histogram.percentile(10) == pytest.approx(0.01, rel=0.01)
+
+    def test_merge_and_round_trip(self):
+        a, b = LatencyHistogram(), LatencyHistogram()
+        a.record(0.001)
+        b.record(0.002, count=3)
+        merged = LatencyHistogram.from_dict(json.loads(json.dumps(a.merge(b).to_dict())))
+        assert merged.total == 4
+        assert merged.percentile(50) == pytest.approx(0.002, rel=0.002)
+
+
+class TestScenario:
+    """시나리오 파일 테스트"""
+
+    @pytest.mark.parametrize('path', sorted(SCENARIOS.glob('*.json')), ids=lambda p: p.stem)
+    def test_bundled_scenarios_load(self, path):
+        scenario = Scenario.load(path)
+        assert scenario.requests
+        assert scenario.settings['mode'] in loadtest.MODES
+
+    def test_overrides_and_templates(self):
+        scenario = Scenario.from_dict(
+            {'requests': [{'path': '/a/{n}', 'json': {'email': 'u{n}@{run}'}}], 'rate': 5}, rate=20,
+        )
+        assert scenario.settings['rate'] == 20
+        method, path, headers, body = scenario.requests[0].build({'n': 7, 'run': 'r1'})
+        assert (method, path) == ('GET', '/a/7')
+        assert json.loads(body) == {'email': 'u7@r1'}
+        assert headers['Content-Type'] == 'application/json'
+
+    def test_rejects_unknown_settings(self):
+        with pytest.raises(ValueError):
+            Scenario.from_dict({'requests': [{'path': '/'}], 'rps': 5})
+
+
+class TestLoadTest:
+    """로컬 asyncio 서버 대상 실행 테스트"""
+
+    def test_rate_mode_report(self):
+        # 공유 CI 장비의 스케줄링 지연으로 오탐하지 않도록 늦음 기준을 넉넉히
+        report, received = run_scenario({}, mode='rate', rate=100, duration=0.5, lag_threshold_ms=50)
+        totals = report['totals']
+        assert 40 <= totals['requests'] <= 60
+        assert totals['errors'] == 0
+        assert set(report['requests']) == {'list', 'create'}
+        assert {'p50', 'p90', 'p99', 'p99.9'} <= set(report['latency_ms'])
+        assert report['coordinated_omission']['detected'] is False
+        posts = [body for method, _, body in received if method == 'POST']
+        assert posts and len(set(posts)) == len(posts)
+        json.dumps(report)
+
+    def test_rate_mode_detects_stall(self):
+        # 서버가 요청을 하나씩만 처리하고 0.3초 멈추면 뒤 요청들은 예정보다 늦게 나감
+        stalled = iter([0.3])
+        report, _ = run_scenario(
+            {'/api/users': lambda: next(stalled, 0)}, mode='rate', rate=100, duration=0.6, max_connections=1,
+        )
+        co = report['coordinated_omission']
+        assert co['detected'] is True
+        assert co['max_schedule_lag_ms'] > 100
+        assert report['latency_ms']['p99'] > report['service_time_ms']['p99']
+
+    def test_rate_mode_counts_unfinished_requests(self):
+        # 연결 하나로 느린 서버에 보내면 뒤 요청은 슬롯을 기다리다 실행이 끝난 뒤에도 남음
+        slow = {'/api/users': 1.0, '/api/users/new': 1.0}
+        report, _ = run_scenario(slow, mode='rate', rate=10, duration=0.35, max_connections=1, timeout=0.3)
+        totals = report['totals']
+        assert totals['requests'] == totals['errors'] == 4
+        assert totals['statuses'] == {'timeout': 4}
+
+    def test_concurrency_mode_without_interval_is_flagged(self):
+        report, _ = run_scenario({}, mode='concurrency', concurrency=2, duration=0.3)
+        assert report['totals']['requests'] > 0
+        assert report['coordinated_omission']['detected'] is None
+
+    def test_connection_errors_are_counted(self):
+        scenario = Scenario.from_dict(
+            {'requests': [{'path': '/'}]}, base_url='http://127.0.0.1:1', warmup=0, duration=0.2, rate=20,
+        )
+        report = asyncio.run(LoadTest(scenario).run())
+        assert report['totals']['errors'] == report['totals']['requests'] > 0
+        assert report['totals']['statuses'] == {'error': report['totals']['requests']}
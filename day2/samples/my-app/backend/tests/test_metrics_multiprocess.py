@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+멀티프로세스 메트릭 합산 테스트
+
+prometheus_client는 import 시점에 PROMETHEUS_MULTIPROC_DIR을 읽으므로
+워커와 수집기를 각각 별도 프로세스로 실행합니다.
+"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+WORKER = """
+import sys
+from metrics import DB_POOL_IN_USE, REQUEST_COUNT
+for _ in range(int(sys.argv[1])):
+    REQUEST_COUNT.labels(method='GET', endpoint='get_users', status=200).inc()
+DB_POOL_IN_USE.labels(pool='primary').set(2)
+"""
+
+COLLECTOR = """
+import sys
+from metrics import collect_latest, mark_worker_dead
+for pid in sys.argv[1:]:
+    mark_worker_dead(int(pid))
+sys.stdout.write(collect_latest().decode())
+"""
+
+
+def run(code, metrics_dir, *args):
+    env = dict(os.environ, PROMETHEUS_MULTIPROC_DIR=str(metrics_dir), PYTHONPATH=str(BACKEND_DIR))
+    return subprocess.run(
+        [sys.executable, '-c', code, *map(str, args)],
+        env=env, check=True, capture_output=True, text=True,
+    )
+
+
+def start_worker(metrics_dir, count):
+    env = dict(os.environ, PROMETHEUS_MULTIPROC_DIR=str(metrics_dir), PYTHONPATH=str(BACKEND_DIR))
+    return subprocess.Popen([sys.executable, '-c', WORKER, str(count)], env=env)
+
+
+def sample(output, prefix):
+    for line in output.splitlines():
+        if line.startswith(prefix):
+            return float(line.rsplit(' ', 1)[1])
+    return None
+
+
+class TestMultiprocessMetrics:
+    """여러 워커 값 합산 테스트"""
+
+    def test_counters_merged_across_workers(self, tmp_path):
+        """모든 워커의 카운터가 합산되고 죽은 워커의 live 게이지는 제외"""
+        workers = [start_worker(tmp_path, count) for count in (5, 7, 11)]
+        for worker in workers:
+            assert worker.wait(timeout=30) == 0
+
+        output = run(COLLECTOR, tmp_path).stdout
+        assert sample(output, 'http_requests_total{endpoint="get_users",method="GET",status="200"}') == 23
+        assert sample(output, 'db_pool_connections_in_use{pool="primary"}') == 6
+
+        output = run(COLLECTOR, tmp_path, workers[0].pid).stdout
+        assert sample(output, 'http_requests_total{endpoint="get_users",method="GET",status="200"}') == 23
+        assert sample(output, 'db_pool_connections_in_use{pool="primary"}') == 4
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+키셋 페이지네이션 테스트
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from pagination import (
+    MAX_PAGE_SIZE, PaginationError, build_page_json_query, build_page_query, decode_cursor,
+    encode_cursor, paginate_json, paginate_rows, parse_page_args,
+)
+
+BASE = datetime(2024, 1, 1, 12, 0, 0, 500)
+
+
+def make_rows(ids):
+    """id가 클수록 최신인 (id, name, email, created_at) 행 생성"""
+    return [(i, f'user{i}', f'user{i}@example.com', BASE + timedelta(seconds=i)) for i in ids]
+
+
+class TestCursor:
+    """커서 인코딩 테스트"""
+
+    def test_round_trip(self):
+        """인코딩한 커서가 원래 위치로 디코딩되는지 확인"""
+        assert decode_cursor(encode_cursor(BASE, 42)) == (BASE, 42)
+
+    def test_invalid_cursor(self):
+        """잘못된 커서는 PaginationError"""
+        with pytest.raises(PaginationError):
+            decode_cursor('not-a-cursor')
+
+
+class TestPageArgs:
+    """요청 파라미터 파싱 테스트"""
+
+    def test_limit_is_capped(self):
+        """페이지 크기 상한 적용"""
+        limit, after, before = parse_page_args({'limit': str(MAX_PAGE_SIZE * 10)})
+        assert limit == MAX_PAGE_SIZE
+        assert after is None and before is None
+
+    def test_invalid_limit(self):
+        """0 이하 또는 숫자가 아닌 limit 거부"""
+        for value in ('0', '-1', 'abc'):
+            with pytest.raises(PaginationError):
+                parse_page_args({'limit': value})
+
+    def test_cursor_and_before_exclusive(self):
+        """cursor와 before 동시 사용 거부"""
+        cursor = encode_cursor(BASE, 1)
+        with pytest.raises(PaginationError):
+            parse_page_args({'cursor': cursor, 'before': cursor})
+
+
+class TestPaging:
+    """페이지 분할 테스트"""
+
+    def test_seek_query_uses_row_comparison(self):
+        """OFFSET 없이 (created_at, id) 시크 조건 사용"""
+        sql, params = build_page_query(10, after=(BASE, 7))
+        assert '(created_at, id) < (%s, %s)' in sql
+        assert 'OFFSET' not in sql
+        assert params == (BASE, 7, 11)
+
+    def test_first_page(self):
+        """첫 페이지는 next 커서만 존재"""
+        rows, page = paginate_rows(make_rows([5, 4, 3, 2]), 3)
+        assert [r[0] for r in rows] == [5, 4, 3]
+        assert decode_cursor(page['next_cursor'])[1] == 3
+        assert page['prev_cursor'] is None
+
+    def test_last_page(self):
+        """마지막 페이지는 next 커서 없음"""
+        rows, page = paginate_rows(make_rows([2, 1]), 3, after=(BASE, 3))
+        assert [r[0] for r in rows] == [2, 1]
+        assert page['next_cursor'] is None
+        assert decode_cursor(page['prev_cursor'])[1] == 2
+
+    def test_previous_page_is_reversed(self):
+        """이전 페이지는 오름차순으로 읽은 뒤 내림차순으로 반환"""
+        rows, page = paginate_rows(make_rows([4, 5, 6, 7]), 3, before=(BASE, 3))
+        assert [r[0] for r in rows] == [6, 5, 4]
+        assert decode_cursor(page['next_cursor'])[1] == 4
+        assert decode_cursor(page['prev_cursor'])[1] == 6
+
+
+class TestJsonStrategy:
+    """json_agg 전략 테스트"""
+
+    def test_json_query_wraps_seek_query(self):
+        """시크 쿼리를 감싸고 페이지 크기 파라미터를 뒤에 추가"""
+        sql, params = build_page_json_query(10, before=(BASE, 7))
+        assert 'json_agg' in sql
+        assert 'ORDER BY created_at ASC, id ASC) AS rn' in sql
+        assert params == (BASE, 7, 11, 10)
+
+    def test_matches_rows_strategy(self):
+        """같은 페이지에 대해 rows 전략과 같은 커서 계산"""
+        rows = make_rows([5, 4, 3, 2])
+        _, expected = paginate_rows(rows, 3, after=(BASE, 9))
+        json_row = ('[...]', 4, rows[0][3], 5, rows[2][3], 3)
+        users_json, page = paginate_json(json_row, 3, after=(BASE, 9))
+        assert users_json == '[...]'
+        assert page == expected
+
+    def test_empty_page(self):
+        """빈 페이지는 커서 없음"""
+        _, page = paginate_json(('[]', 0, None, None, None, None), 3, after=(BASE, 1))
+        assert page['next_cursor'] is None and page['prev_cursor'] is None
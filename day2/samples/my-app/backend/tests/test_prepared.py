@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+prepared statement 캐시 테스트
+"""
+
+import gc
+
+import pytest
+from psycopg2 import errors
+from prometheus_client import REGISTRY
+
+import db_pool
+import prepared
+
+
+@pytest.fixture(autouse=True)
+def enabled(monkeypatch):
+    monkeypatch.setattr(prepared, 'PREPARED_STATEMENTS', True)
+
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+class TestPrepared:
+    """PREPARE / EXECUTE 테스트"""
+
+    def test_placeholders(self):
+        assert prepared.numbered_placeholders('WHERE (a, b) < (%s, %s) LIMIT %s') == 'WHERE (a, b) < ($1, $2) LIMIT $3'
+
+    def test_prepare_once_per_connection(self, fake_connection):
+        """연결마다 한 번만 PREPARE 하고 이후에는 EXECUTE"""
+        conn = fake_connection()
+        sql = 'INSERT INTO users (name, email) VALUES (%s, %s) RETURNING id'
+        hits = sample('db_prepared_statement_hits_total', statement='t_insert')
+
+        for i in range(3):
+            prepared.execute(conn.cursor(), 't_insert', sql, (f'u{i}', f'u{i}@x'))
+
+        statements = [s for s, _ in conn.executed]
+        assert len([s for s in statements if s.startswith('PREPARE')]) == 1
+        assert 'VALUES ($1, $2)' in statements[0]
+        assert statements[1].startswith('EXECUTE ps_t_insert_') and statements[1].endswith('(%s, %s)')
+        assert conn.executed[-1][1] == ('u2', 'u2@x')
+        assert sample('db_prepared_statement_hits_total', statement='t_insert') - hits == 2
+
+        other = fake_connection()
+        prepared.execute(other.cursor(), 't_insert', sql, ('a', 'a@x'))
+        assert other.executed[0][0].startswith('PREPARE')
+
+    def test_no_params(self, fake_connection):
+        conn = fake_connection()
+        prepared.execute(conn.cursor(), 't_ping', 'SELECT 1')
+        assert conn.executed[-1][0].startswith('EXECUTE ps_t_ping_')
+        assert '(' not in conn.executed[-1][0]
+
+    def test_reprepare_when_lost(self, fake_connection):
+        """서버에서 사라진 statement는 롤백 후 다시 PREPARE"""
+        conn = fake_connection()
+        prepared.execute(conn.cursor(), 't_lost', 'SELECT 1')
+        conn.fail_next('EXECUTE', errors.InvalidSqlStatementName('prepared statement does not exist'))
+        before = sample('db_prepared_statement_prepares_total', statement='t_lost', reason='reprepare')
+
+        prepared.execute(conn.cursor(), 't_lost', 'SELECT 1')
+
+        assert conn.rollbacks == 1
+        assert [s.split()[0] for s, _ in conn.executed] == ['PREPARE', 'EXECUTE', 'EXECUTE', 'PREPARE', 'EXECUTE']
+        assert sample('db_prepared_statement_prepares_total', statement='t_lost', reason='reprepare') - before == 1
+
+    def test_invalidate(self, fake_connection):
+        """폐기된 연결의 캐시 제거"""
+        conn = fake_connection()
+        prepared.execute(conn.cursor(), 't_inv', 'SELECT 1')
+        prepared.invalidate(conn)
+        prepared.execute(conn.cursor(), 't_inv', 'SELECT 1')
+        assert len([s for s, _ in conn.executed if s.startswith('PREPARE')]) == 2
+
+    def test_registry_released_with_connection(self, fake_connection):
+        """연결 객체가 사라지면 캐시도 사라짐"""
+        conn = fake_connection()
+        prepared.execute(conn.cursor(), 't_gc', 'SELECT 1')
+        size = len(prepared._registry)
+        del conn
+        gc.collect()
+        assert len(prepared._registry) == size - 1
+
+    def test_disabled(self, monkeypatch, fake_connection):
+        monkeypatch.setattr(prepared, 'PREPARED_STATEMENTS', False)
+        conn = fake_connection()
+        prepared.execute(conn.cursor(), 't_off', 'SELECT %s', (1,))
+        assert conn.executed == [('SELECT %s', (1,))]
+
+    def test_pooled_connections_keep_their_statements(self, monkeypatch, fake_connection):
+        """풀이 연결을 닫지 않고 재사용하므로 연결마다 PREPARE는 한 번, 나머지는 모두 hit"""
+        monkeypatch.setattr(db_pool.psycopg2, 'connect', lambda *args, **kwargs: fake_connection())
+        pool = db_pool.ConnectionPool(minconn=1, maxconn=4, name='prepared-reuse', host='db')
+        prepares = sample('db_prepared_statement_prepares_total', statement='t_pooled', reason='first')
+        hits = sample('db_prepared_statement_hits_total', statement='t_pooled')
+
+        for _ in range(30):
+            conns = [pool.getconn() for _ in range(3)]
+            for conn in conns:
+                prepared.execute(conn.cursor(), 't_pooled', 'SELECT 1')
+            for conn in conns:
+                pool.putconn(conn)
+
+        assert sample('db_prepared_statement_prepares_total', statement='t_pooled', reason='first') - prepares == 3
+        assert sample('db_prepared_statement_hits_total', statement='t_pooled') - hits == 87
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+요청 샘플링 프로파일러 테스트
+"""
+
+import sys
+import time
+import threading
+
+import pytest
+from flask import Flask, jsonify
+
+from profiling import PROFILE_HEADER, TOKEN_HEADER, ProfilingMiddleware, SamplingProfiler, collapse
+
+
+def busy_handler(seconds):
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        sum(i * i for i in range(200))
+
+
+class TestSamplingProfiler:
+    """스택 수집과 출력 형식 테스트"""
+
+    def test_collapse_stops_at_dispatch_root(self):
+        def full_dispatch_request():
+            return inner()
+
+        def inner():
+            return collapse(sys._getframe(), 'GET /x')
+
+        frames = full_dispatch_request().split(';')
+        assert frames[0] == 'GET /x'
+        assert frames[1].startswith('full_dispatch_request (test_profiling.py:')
+        assert frames[-1].startswith('inner (test_profiling.py:')
+
+    def test_samples_registered_thread(self):
+        profiler = SamplingProfiler(enabled=True, interval=0.001)
+        started, release = threading.Event(), threading.Event()
+
+        def work():
+            profiler.begin('GET /work')
+            started.set()
+            release.wait(2)
+            profiler.end()
+
+        worker = threading.Thread(target=work)
+        worker.start()
+        started.wait(2)
+        try:
+            assert profiler.sample_once() == 1
+        finally:
+            release.set()
+            worker.join()
+        assert profiler.sample_once() == 0
+        # 백그라운드 샘플러 스레드도 같은 스택을 셈
+        (stack, count), = profiler.stacks.items()
+        assert stack.startswith('GET /work;') and 'work (test_profiling.py:' in stack
+        assert profiler.collapsed() == f'{stack} {count}\n'
+
+    def test_max_stacks_truncates(self):
+        profiler = SamplingProfiler(max_stacks=1)
+        profiler.stacks['GET /a;f (a.py:1)'] = 1
+        profiler.begin('GET /b')
+        try:
+            profiler.sample_once()
+        finally:
+            profiler.end()
+        assert profiler.stacks['GET /b;[truncated]'] == 1
+
+    def test_speedscope_format(self):
+        profiler = SamplingProfiler(interval=0.01)
+        profiler.stacks.update({'GET /a;f (a.py:1);g (a.py:5)': 3, 'GET /a;f (a.py:1)': 1})
+        data = profiler.speedscope()
+        frames = [f['name'] for f in data['shared']['frames']]
+        assert frames == ['GET /a', 'f (a.py:1)', 'g (a.py:5)']
+        profile = data['profiles'][0]
+        assert profile['type'] == 'sampled'
+        assert profile['samples'] == [[0, 1], [0, 1, 2]]
+        assert profile['weights'] == [0.01, 0.03]
+        assert profile['endValue'] == pytest.approx(0.04)
+
+    def test_configure_validation(self):
+        profiler = SamplingProfiler()
+        with pytest.raises(ValueError):
+            profiler.configure(sample_rate=2)
+        with pytest.raises(ValueError):
+            profiler.configure(interval=0)
+        profiler.configure(enabled=True, sample_rate=0.5)
+        assert profiler.enabled and profiler.sample_rate == 0.5
+        profiler.configure(enabled='false')
+        assert profiler.enabled is False
+        profiler.configure(enabled='on')
+        assert profiler.enabled is True
+        with pytest.raises(ValueError):
+            profiler.configure(enabled='maybe')
+        assert profiler.enabled is True
+
+    def test_status_reads_stacks_under_lock(self):
+        """status()는 샘플러와 같은 잠금 안에서 stacks를 읽음"""
+        profiler = SamplingProfiler()
+        profiler.stacks['GET /x;f (a.py:1)'] = 2
+        result = []
+        with profiler._lock:
+            reader = threading.Thread(target=lambda: result.append(profiler.status()))
+            reader.start()
+            reader.join(0.1)
+            assert result == []
+        reader.join(2)
+        assert result[0]['samples'] == 2 and result[0]['distinct_stacks'] == 1
+
+
+class TestProfilingMiddleware:
+    """Flask 훅과 관리 경로 테스트"""
+
+    @pytest.fixture
+    def app(self):
+        app = Flask('profiling-test')
+        profiler = SamplingProfiler(enabled=False, sample_rate=1.0, interval=0.002)
+        app.profiling = ProfilingMiddleware(app, profiler=profiler, token='secret')
+
+        @app.route('/work')
+        def work():
+            busy_handler(0.1)
+            return jsonify({'ok': True})
+
+        return app
+
+    def admin(self, client, method, path='/admin/profiling', **kwargs):
+        return client.open(path, method=method, headers={TOKEN_HEADER: 'secret'}, **kwargs)
+
+    def test_disabled_profiles_nothing(self, app):
+        app.test_client().get('/work')
+        assert app.profiling.profiler.requests == 0
+        assert app.profiling.profiler._thread is None
+
+    def test_header_profiles_single_request(self, app):
+        client = app.test_client()
+        client.get('/work', headers={PROFILE_HEADER: 'wrong'})
+        assert app.profiling.profiler.requests == 0
+
+        client.get('/work', headers={PROFILE_HEADER: 'secret'})
+        profiler = app.profiling.profiler
+        assert profiler.requests == 1 and profiler._targets == {}
+        collapsed = self.admin(client, 'GET', '/admin/profiling/profile').get_data(as_text=True)
+        assert 'GET /work;full_dispatch_request' in collapsed
+        assert 'busy_handler (test_profiling.py:' in collapsed
+
+    def test_admin_toggle_and_download(self, app):
+        client = app.test_client()
+        assert self.admin(client, 'POST', json={'enabled': True}).get_json()['enabled'] is True
+        client.get('/work')
+        status = self.admin(client, 'GET').get_json()
+        assert status['profiled_requests'] == 1 and status['samples'] > 0
+
+        response = self.admin(client, 'GET', '/admin/profiling/profile?format=speedscope')
+        assert 'attachment' in response.headers['Content-Disposition']
+        assert response.get_json()['profiles'][0]['samples']
+
+        assert self.admin(client, 'DELETE', '/admin/profiling/profile').get_json()['samples'] == 0
+        assert self.admin(client, 'POST', json={'sample_rate': 5}).status_code == 400
+        assert self.admin(client, 'POST', json={'enabled': 'false'}).get_json()['enabled'] is False
+        assert self.admin(client, 'POST', json={'enabled': 'sometimes'}).status_code == 400
+        assert self.admin(client, 'GET', '/admin/profiling/profile?format=pprof').status_code == 400
+
+    def test_non_ascii_token_header_is_a_mismatch(self, app):
+        client = app.test_client()
+        # WSGI 헤더는 latin-1로 디코딩되므로 UTF-8 바이트가 ASCII가 아닌 str로 들어옴
+        value = '토큰'.encode('utf-8').decode('latin-1')
+        assert client.get('/work', headers={PROFILE_HEADER: value}).status_code == 200
+        assert app.profiling.profiler.requests == 0
+        assert client.get('/admin/profiling', headers={TOKEN_HEADER: value}).status_code == 403
+
+    def test_admin_requires_token(self, app):
+        client = app.test_client()
+        assert client.get('/admin/profiling').status_code == 403
+        assert client.get('/admin/profiling', headers={TOKEN_HEADER: 'nope'}).status_code == 403
+
+    def test_admin_disabled_without_token(self):
+        app = Flask('profiling-no-token')
+        ProfilingMiddleware(app, profiler=SamplingProfiler(), token='')
+        client = app.test_client()
+        assert client.get('/admin/profiling', headers={TOKEN_HEADER: ''}).status_code == 404
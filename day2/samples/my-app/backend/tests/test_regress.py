@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+벤치마크 회귀 검사 (benchmarks/regress.py) 테스트
+"""
+
+import sys
+import json
+from pathlib import Path
+
+import pytest
+from prometheus_client import REGISTRY
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'benchmarks'))
+
+import regress  # noqa: E402
+from regress import FakeDatabase, compare, fake_backend, mann_whitney_greater, view_call  # noqa: E402
+
+
+def result(**benchmarks):
+    return {'benchmarks': benchmarks}
+
+
+class TestMannWhitney:
+    """단측 순위합 검정 테스트"""
+
+    def test_separated_samples_are_significant(self):
+        low, high = [float(v) for v in range(10)], [float(v) for v in range(20, 30)]
+        assert mann_whitney_greater(high, low) < 0.001
+        assert mann_whitney_greater(low, high) > 0.99
+
+    def test_identical_samples_are_not(self):
+        samples = [1.0, 2.0, 3.0, 4.0, 5.0]
+        assert mann_whitney_greater(samples, list(samples)) > 0.4
+        assert mann_whitney_greater([1.0] * 5, [1.0] * 5) == 1.0
+
+
+class TestCompare:
+    """기준선 비교 판정 테스트"""
+
+    baseline = result(users={'throughput': [1000.0 + i for i in range(10)], 'p99_us': [500.0 + i for i in range(10)]})
+
+    def test_throughput_drop_is_regression(self):
+        current = result(users={'throughput': [800.0 + i for i in range(10)], 'p99_us': [500.0 + i for i in range(10)]})
+        rows = {r['metric']: r for r in compare(self.baseline, current)}
+        assert rows['throughput']['verdict'] == 'regression'
+        assert rows['throughput']['change'] == pytest.approx(-0.2, abs=0.01)
+        assert rows['p99_us']['verdict'] == 'ok'
+        assert 'REGRESSION' in regress.format_comparison(list(rows.values()))
+
+    def test_p99_growth_within_threshold_passes(self):
+        current = result(users={'throughput': [1000.0 + i for i in range(10)], 'p99_us': [550.0 + i for i in range(10)]})
+        rows = compare(self.baseline, current, max_p99_increase=0.2)
+        assert {r['verdict'] for r in rows} == {'ok'}
+        rows = compare(self.baseline, current, max_p99_increase=0.05)
+        assert [r['verdict'] for r in rows if r['metric'] == 'p99_us'] == ['regression']
+
+    def test_noisy_samples_are_not_regressions(self):
+        # 중앙값은 15% 떨어졌지만 분포가 겹쳐 유의하지 않음
+        current = result(users={
+            'throughput': [850.0, 1200.0, 700.0, 1100.0, 860.0, 1300.0, 600.0, 840.0, 1250.0, 650.0],
+            'p99_us': [500.0 + i for i in range(10)],
+        })
+        assert {r['verdict'] for r in compare(self.baseline, current)} == {'ok'}
+
+    def test_new_benchmark(self):
+        current = result(other={'throughput': [1.0], 'p99_us': [1.0]})
+        assert compare(self.baseline, current)[0]['verdict'] == 'new'
+
+    def test_compare_command_exit_code(self, tmp_path, capsys):
+        current = result(users={'throughput': [500.0 + i for i in range(10)], 'p99_us': [500.0 + i for i in range(10)]})
+        old, new = tmp_path / 'old.json', tmp_path / 'new.json'
+        old.write_text(json.dumps(self.baseline))
+        new.write_text(json.dumps(current))
+        assert regress.main(['compare', str(old), str(old)]) == 0
+        assert regress.main(['compare', str(old), str(new)]) == 1
+        assert 'regression' in capsys.readouterr().out
+
+
+class TestBenchmarks:
+    """가짜 DB 벤치마크 테스트"""
+
+    def test_views_run_against_fake_database(self):
+        with fake_backend(FakeDatabase(count=100)) as (backend, _):
+            users = view_call(backend, 'get_users', '/api/users?limit=20')().get_json()
+            stats = view_call(backend, 'get_stats', '/api/stats')().get_json()
+        assert len(users['users']) == 20 and users['pagination']['next_cursor']
+        assert stats['total_users'] == 100 and stats['new_users_today'] == 10
+
+    def test_middleware_benchmark_goes_through_request_timer(self):
+        labels = {'method': 'GET', 'endpoint': '/api/stats', 'status': '200'}
+        before = REGISTRY.get_sample_value('http_requests_total', labels) or 0
+        with fake_backend(FakeDatabase(count=10)) as (backend, database):
+            call = regress.BENCHMARKS['middleware_stats'][1](backend)
+            assert call().get_json()['total_users'] == 10
+            call()
+        assert REGISTRY.get_sample_value('http_requests_total', labels) - before == 2
+
+    def test_run_produces_samples(self):
+        data = regress.run_benchmarks(samples=2, sample_seconds=0.01)
+        assert set(data['benchmarks']) == set(regress.BENCHMARKS)
+        for samples in data['benchmarks'].values():
+            assert len(samples['throughput']) == len(samples['p99_us']) == 2
+            assert min(samples['throughput']) > 0
+
+    def test_committed_baseline_covers_all_benchmarks(self):
+        baseline = json.loads(regress.BASELINE_PATH.read_text())
+        assert set(baseline['benchmarks']) == set(regress.BENCHMARKS)
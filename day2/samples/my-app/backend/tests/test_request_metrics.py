@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+요청 타이밍 미들웨어 테스트
+"""
+
+from flask import Flask
+from prometheus_client import REGISTRY
+
+from request_metrics import UNMATCHED_ENDPOINT, RequestTimer
+
+
+def make_app():
+    app = Flask('request-metrics-test')
+    app.add_url_rule('/items/<int:item_id>', 'item', lambda item_id: 'ok')
+    app.add_url_rule('/metrics', 'metrics', lambda: 'ok')
+    RequestTimer(app, exclude={'/metrics'})
+    return app
+
+
+def count(endpoint, status, method='GET'):
+    labels = {'method': method, 'endpoint': endpoint, 'status': str(status)}
+    return REGISTRY.get_sample_value('http_requests_total', labels) or 0
+
+
+class TestRequestTimer:
+    """라벨/제외 규칙 테스트"""
+
+    def test_route_template_label(self):
+        """경로 파라미터가 달라도 라우트 템플릿 하나로 집계"""
+        client = make_app().test_client()
+        before = count('/items/<int:item_id>', 200)
+        client.get('/items/1')
+        client.get('/items/2')
+        assert count('/items/<int:item_id>', 200) - before == 2
+
+    def test_unmatched_paths_share_label(self):
+        """404 경로는 고정 라벨 하나로 묶음"""
+        client = make_app().test_client()
+        before = count(UNMATCHED_ENDPOINT, 404)
+        client.get('/random/a')
+        client.get('/random/b')
+        assert count(UNMATCHED_ENDPOINT, 404) - before == 2
+
+    def test_excluded_path_not_recorded(self):
+        """제외 경로는 기록하지 않음"""
+        client = make_app().test_client()
+        client.get('/metrics')
+        assert count('/metrics', 200) == 0
+
+    def test_unknown_method_bucketed(self):
+        """알 수 없는 HTTP 메서드는 OTHER로 기록"""
+        client = make_app().test_client()
+        before = count(UNMATCHED_ENDPOINT, 405, method='OTHER')
+        client.open('/items/1', method='PROPFIND')
+        assert count(UNMATCHED_ENDPOINT, 405, method='OTHER') - before == 1
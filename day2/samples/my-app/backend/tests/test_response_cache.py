@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+응답 캐시 테스트
+"""
+
+import time
+from contextlib import contextmanager
+
+import pytest
+from flask import Flask, jsonify
+
+from response_cache import TABLE_VERSION_SQL, DatabaseTableVersions, ResponseCache, build_table_versions, cached_response
+
+
+class TestResponseCache:
+    """LRU / TTL / 버전 테스트"""
+
+    def test_ttl_and_version(self, clock):
+        cache = ResponseCache(ttl=5, clock=clock)
+        cache.put('/a', 0, b'body', 'application/json')
+        assert cache.get('/a', 0).body == b'body'
+        assert cache.get('/a', 1) is None
+        cache.put('/a', 1, b'body', 'application/json')
+        clock.now = 5
+        assert cache.get('/a', 1) is None
+        assert cache.size_bytes == 0
+
+    def test_lru_eviction_by_entries(self):
+        cache = ResponseCache(ttl=60, max_entries=2)
+        cache.put('/a', 0, b'a', 'text/plain')
+        cache.put('/b', 0, b'b', 'text/plain')
+        cache.get('/a', 0)
+        cache.put('/c', 0, b'c', 'text/plain')
+        assert cache.get('/b', 0) is None
+        assert cache.get('/a', 0) is not None and cache.get('/c', 0) is not None
+
+    def test_eviction_by_bytes(self):
+        cache = ResponseCache(ttl=60, max_bytes=10)
+        cache.put('/a', 0, b'x' * 6, 'text/plain')
+        cache.put('/b', 0, b'y' * 6, 'text/plain')
+        assert len(cache) == 1 and cache.size_bytes == 6
+        cache.put('/huge', 0, b'z' * 11, 'text/plain')
+        assert cache.get('/huge', 0) is None
+
+
+def make_app(cache, calls):
+    app = Flask('response-cache-test')
+
+    @app.route('/items')
+    @cached_response(cache, 'items')
+    def items():
+        calls.append(1)
+        return jsonify({'items': [1, 2, 3]}), 200
+
+    return app
+
+
+class TestCachedResponse:
+    """ETag / 304 처리 테스트"""
+
+    def test_hit_and_not_modified_skip_view(self):
+        cache, calls = ResponseCache(ttl=60), []
+        client = make_app(cache, calls).test_client()
+
+        first = client.get('/items?b=2&a=1')
+        assert first.headers['X-Cache'] == 'MISS'
+        etag = first.headers['ETag']
+
+        assert client.get('/items?a=1&b=2').headers['X-Cache'] == 'HIT'
+        not_modified = client.get('/items?a=1&b=2', headers={'If-None-Match': etag})
+        assert not_modified.status_code == 304 and not_modified.data == b''
+        assert len(calls) == 1
+
+    def test_version_bump_refills(self):
+        cache, calls = ResponseCache(ttl=60), []
+        client = make_app(cache, calls).test_client()
+        etag = client.get('/items').headers['ETag']
+
+        cache.versions.bump('items')
+        response = client.get('/items', headers={'If-None-Match': etag})
+        assert len(calls) == 2
+        # 본문이 그대로면 ETag도 그대로라 304
+        assert response.status_code == 304 and response.headers['ETag'] == etag
+
+    def test_etag_matches_across_workers(self):
+        """테이블 버전이 다른 워커끼리도 같은 본문이면 같은 ETag"""
+        worker_a, worker_b = ResponseCache(ttl=60), ResponseCache(ttl=60)
+        worker_b.versions.bump('items')
+        etag = make_app(worker_a, []).test_client().get('/items').headers['ETag']
+        response = make_app(worker_b, []).test_client().get('/items', headers={'If-None-Match': etag})
+        assert response.status_code == 304
+
+    def test_disabled(self):
+        cache, calls = ResponseCache(ttl=0), []
+        client = make_app(cache, calls).test_client()
+        client.get('/items')
+        client.get('/items')
+        assert len(calls) == 2
+
+
+class TestDatabaseTableVersions:
+    """DB 카운터로 공유하는 테이블 버전 테스트"""
+
+    @pytest.fixture
+    def counters(self, fake_connection):
+        """user_counters 대역과 그 값을 읽는 연결 컨텍스트"""
+        values = {'users_version': 3}
+        conn = fake_connection(respond=lambda sql, params: [(n, values[n]) for n in params[0] if n in values])
+
+        @contextmanager
+        def connection():
+            yield conn
+
+        connection.values = values
+        connection.conn = conn
+        return connection
+
+    def test_get_never_queries(self, counters):
+        versions = DatabaseTableVersions(counters)
+        assert versions.get('users') == 0
+        assert versions.bump('users') == 1
+        assert counters.conn.executed == []
+
+    def test_refresh_reads_requested_tables_in_one_query(self, counters):
+        versions = DatabaseTableVersions(counters)
+        assert versions.refresh() and counters.conn.executed == []
+        versions.get('users')
+        versions.get('items')
+        assert versions.refresh()
+        assert counters.conn.executed == [(TABLE_VERSION_SQL, (['items_version', 'users_version'],))]
+        assert versions.get('users') == 3 and versions.get('items') == 0
+        counters.values['users_version'] = 4
+        versions.refresh()
+        assert versions.get('users') == 4
+
+    def test_failures_keep_last_version_and_back_off(self, counters, caplog):
+        versions = DatabaseTableVersions(counters, interval=0.5, max_backoff=3)
+        versions.get('users')
+        versions.refresh()
+        counters.conn.broken = True
+        delays = []
+        for _ in range(5):
+            assert versions.refresh() is False
+            delays.append(versions.next_delay())
+        assert versions.get('users') == 3
+        assert delays == [1.0, 2.0, 3, 3, 3]
+        assert len([r for r in caplog.records if 'table versions' in r.getMessage()]) == 1
+
+        counters.conn.broken = False
+        assert versions.refresh() and versions.next_delay() == 0.5
+
+    def test_background_thread_picks_up_other_workers(self, counters):
+        versions = DatabaseTableVersions(counters, interval=0.01)
+        versions.get('users')
+        versions.start()
+        try:
+            counters.values['users_version'] = 9
+            deadline = time.monotonic() + 2
+            while versions.get('users') != 9 and time.monotonic() < deadline:
+                time.sleep(0.005)
+            assert versions.get('users') == 9
+        finally:
+            versions.stop(timeout=1)
+        assert versions._thread is None
+
+    def test_source_setting(self, counters):
+        assert isinstance(build_table_versions(counters), DatabaseTableVersions)
+        assert not isinstance(build_table_versions(counters, source='local'), DatabaseTableVersions)
+        with pytest.raises(ValueError):
+            build_table_versions(counters, source='redis')
+
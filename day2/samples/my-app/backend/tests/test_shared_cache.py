@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+공유 응답 캐시 테스트 (로컬 RESP 대역 서버 사용)
+"""
+
+import socket
+import threading
+import socketserver
+
+import pytest
+import redis
+from flask import Flask, jsonify
+
+from response_cache import ResponseCache, cached_response
+from shared_cache import SharedResponseCache, build_response_cache
+
+
+class RespHandler(socketserver.StreamRequestHandler):
+    """GET/SET(NX, PX)/DEL/INCRBY/PING만 지원하는 RESP2 서버"""
+
+    def read_command(self):
+        line = self.rfile.readline()
+        if not line:
+            return None
+        count = int(line[1:])
+        args = []
+        for _ in range(count):
+            size = int(self.rfile.readline()[1:])
+            args.append(self.rfile.read(size + 2)[:-2])
+        return args
+
+    def reply(self, value):
+        if value is None:
+            self.wfile.write(b'$-1\r\n')
+        elif isinstance(value, int):
+            self.wfile.write(b':%d\r\n' % value)
+        elif isinstance(value, Exception):
+            self.wfile.write(b'-ERR %s\r\n' % str(value).encode())
+        elif value == 'OK':
+            self.wfile.write(b'+OK\r\n')
+        else:
+            self.wfile.write(b'$%d\r\n%s\r\n' % (len(value), value))
+
+    def handle(self):
+        data, lock = self.server.data, self.server.lock
+        while True:
+            args = self.read_command()
+            if args is None:
+                return
+            name = args[0].upper()
+            self.server.commands.append(name)
+            with lock:
+                if name == b'PING':
+                    self.reply('OK')
+                elif name == b'GET':
+                    self.reply(data.get(args[1]))
+                elif name == b'SET':
+                    options = [a.upper() for a in args[3:]]
+                    if b'NX' in options and args[1] in data:
+                        self.reply(None)
+                    else:
+                        data[args[1]] = args[2]
+                        self.reply('OK')
+                elif name == b'DEL':
+                    self.reply(sum(1 for k in args[1:] if data.pop(k, None) is not None))
+                elif name == b'INCRBY':
+                    data[args[1]] = str(int(data.get(args[1], b'0')) + int(args[2])).encode()
+                    self.reply(int(data[args[1]]))
+                else:
+                    self.reply(Exception(f"unknown command '{name.decode()}'"))
+
+
+class StandInServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), RespHandler)
+        self.data = {}
+        self.commands = []
+        self.lock = threading.Lock()
+
+
+@pytest.fixture
+def server():
+    srv = StandInServer()
+    thread = threading.Thread(target=srv.serve_forever, daemon=True)
+    thread.start()
+    yield srv
+    srv.shutdown()
+    srv.server_close()
+
+
+def make_client(srv):
+    host, port = srv.server_address
+    return redis.Redis(host=host, port=port, socket_timeout=1)
+
+
+def make_app(cache, calls):
+    app = Flask('shared-cache-test')
+
+    @app.route('/items')
+    @cached_response(cache, 'items')
+    def items():
+        calls.append(1)
+        return jsonify({'items': [1, 2, 3]}), 200
+
+    return app
+
+
+class TestSharedResponseCache:
+    """L1 + L2 캐시 테스트"""
+
+    def test_second_pod_hits_l2(self, server):
+        calls = []
+        pod_a = make_app(SharedResponseCache(make_client(server)), calls).test_client()
+        pod_b = make_app(SharedResponseCache(make_client(server)), calls).test_client()
+
+        first = pod_a.get('/items')
+        second = pod_b.get('/items')
+        assert first.headers['X-Cache'] == 'MISS'
+        assert second.headers['X-Cache'] == 'HIT'
+        assert second.headers['ETag'] == first.headers['ETag']
+        assert second.data == first.data
+        assert len(calls) == 1
+
+    def test_l1_hit_skips_network(self, server):
+        cache = SharedResponseCache(make_client(server), version_ttl=60)
+        client = make_app(cache, []).test_client()
+        client.get('/items')
+        sent = len(server.commands)
+        assert client.get('/items').headers['X-Cache'] == 'HIT'
+        assert len(server.commands) == sent
+
+    def test_bump_invalidates_other_pods(self, server):
+        calls = []
+        cache_a = SharedResponseCache(make_client(server))
+        cache_b = SharedResponseCache(make_client(server), version_ttl=0)
+        pod_a = make_app(cache_a, calls).test_client()
+        pod_b = make_app(cache_b, calls).test_client()
+
+        etag = pod_b.get('/items').headers['ETag']
+        cache_a.versions.bump('items')
+        # 다시 만들었지만 본문이 같으므로 ETag도 같음
+        response = pod_b.get('/items', headers={'If-None-Match': etag})
+        assert response.status_code == 304 and response.headers['ETag'] == etag
+        assert pod_a.get('/items').headers['X-Cache'] == 'HIT'
+        assert len(calls) == 2
+
+    def test_waits_for_lock_holder(self, server):
+        holder = SharedResponseCache(make_client(server))
+        waiter = SharedResponseCache(make_client(server), lock_wait=1, sleep=lambda s: None)
+
+        with holder.fill_lock('/items', 0) as entry:
+            assert entry is None
+            holder.put('/items', 0, b'{}', 'application/json')
+            with waiter.fill_lock('/items', 0) as waited:
+                assert waited.body == b'{}'
+        assert b'myapp:lock:0:/items' not in server.data
+
+    def test_server_down_falls_back_to_l1(self):
+        with socket.socket() as s:
+            s.bind(('127.0.0.1', 0))
+            port = s.getsockname()[1]
+        calls = []
+        cache = SharedResponseCache(redis.Redis(port=port, socket_connect_timeout=0.2), retry_after=60)
+        client = make_app(cache, calls).test_client()
+
+        assert client.get('/items').headers['X-Cache'] == 'MISS'
+        assert client.get('/items').headers['X-Cache'] == 'HIT'
+        cache.versions.bump('items')
+        assert client.get('/items').headers['X-Cache'] == 'MISS'
+        assert len(calls) == 2
+
+
+class TestBuildResponseCache:
+    """백엔드 선택 테스트"""
+
+    def test_memory_is_default(self):
+        assert isinstance(build_response_cache('memory'), ResponseCache)
+
+    def test_redis_backend(self):
+        assert isinstance(build_response_cache('redis', 'redis://127.0.0.1:1/0'), SharedResponseCache)
+
+    def test_unknown_backend(self):
+        with pytest.raises(ValueError):
+            build_response_cache('memcached')
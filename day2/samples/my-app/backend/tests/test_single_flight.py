@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+동일 요청 합치기 (single-flight) 테스트
+"""
+
+import time
+import threading
+
+import pytest
+from flask import Flask, jsonify
+
+from single_flight import SingleFlight, coalesce_requests
+
+
+def wait_for_followers(flight, key, count, timeout=2):
+    """key의 진행 중 호출에 follower가 count개 붙을 때까지 대기"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        call = flight._calls.get(key)
+        if call is not None and call.followers >= count:
+            return
+        time.sleep(0.005)
+    raise AssertionError('followers did not join')
+
+
+def run_threads(count, target):
+    results = [None] * count
+
+    def worker(i):
+        results[i] = target()
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(count)]
+    for t in threads:
+        t.start()
+    return threads, results
+
+
+class TestSingleFlight:
+    """키별 실행 공유 테스트"""
+
+    def test_concurrent_calls_share_one_execution(self):
+        flight, release, calls = SingleFlight(), threading.Event(), []
+
+        def fn():
+            calls.append(1)
+            release.wait(2)
+            return 'value'
+
+        threads, results = run_threads(5, lambda: flight.do('k', fn))
+        wait_for_followers(flight, 'k', 4)
+        release.set()
+        for t in threads:
+            t.join()
+
+        assert len(calls) == 1
+        assert sorted(role for _, role in results) == ['follower'] * 4 + ['leader']
+        assert all(value == 'value' for value, _ in results)
+        assert len(flight) == 0
+
+    def test_followers_receive_leader_error(self):
+        flight, release = SingleFlight(), threading.Event()
+
+        def fn():
+            release.wait(2)
+            raise RuntimeError('db down')
+
+        errors = []
+
+        def call():
+            try:
+                flight.do('k', fn)
+            except RuntimeError as e:
+                errors.append(e)
+
+        threads, _ = run_threads(3, call)
+        wait_for_followers(flight, 'k', 2)
+        release.set()
+        for t in threads:
+            t.join()
+        assert len(errors) == 3
+
+    def test_sequential_calls_do_not_share(self):
+        flight, calls = SingleFlight(), []
+        flight.do('k', lambda: calls.append(1))
+        flight.do('k', lambda: calls.append(1))
+        assert len(calls) == 2
+
+    def test_timeout_runs_own_call(self):
+        flight, release = SingleFlight(timeout=0.01), threading.Event()
+        leader = threading.Thread(target=lambda: flight.do('k', lambda: release.wait(2)))
+        leader.start()
+        wait_for_followers(flight, 'k', 0)
+        try:
+            assert flight.do('k', lambda: 'own') == ('own', 'timeout')
+        finally:
+            release.set()
+            leader.join()
+
+
+class TestCoalesceRequests:
+    """Flask 데코레이터 테스트"""
+
+    @pytest.fixture
+    def app(self):
+        app = Flask('single-flight-test')
+        app.flight = SingleFlight()
+        app.release = threading.Event()
+        app.calls = []
+
+        @app.route('/items')
+        @coalesce_requests(app.flight, bypass=lambda: app.bypass)
+        def items():
+            app.calls.append(1)
+            app.release.wait(2)
+            return jsonify({'items': len(app.calls)}), 200
+
+        app.bypass = False
+        return app
+
+    def test_identical_requests_share_response(self, app):
+        threads, results = run_threads(4, lambda: app.test_client().get('/items?b=2&a=1'))
+        wait_for_followers(app.flight, '/items?a=1&b=2', 3)
+        app.release.set()
+        for t in threads:
+            t.join()
+
+        assert len(app.calls) == 1
+        assert {r.status_code for r in results} == {200}
+        assert {r.data for r in results} == {results[0].data}
+
+    def test_different_queries_run_separately(self, app):
+        app.release.set()
+        client = app.test_client()
+        client.get('/items?a=1')
+        client.get('/items?a=2')
+        assert len(app.calls) == 2
+
+    def test_bypass(self, app):
+        app.release.set()
+        app.bypass = True
+        app.test_client().get('/items')
+        assert len(app.flight) == 0 and len(app.calls) == 1
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+통계 캐시 테스트
+"""
+
+import threading
+import time
+
+import pytest
+
+import prepared
+from stats import StatsCache, load_stats
+
+
+@pytest.fixture(autouse=True)
+def plain_execute(monkeypatch):
+    """SQL 내용을 그대로 확인하도록 prepared statement 비활성화"""
+    monkeypatch.setattr(prepared, 'PREPARED_STATEMENTS', False)
+
+
+def stats_rows(sql, params):
+    """json 전략은 JSON 텍스트 한 행, 나머지는 COUNT 결과 7"""
+    if 'json_build_object' in sql:
+        return [('{"total_users": 7, "new_users_today": 1}',)]
+    return [(7,)]
+
+
+class TestStatsCache:
+    """TTL / single-flight 테스트"""
+
+    def test_ttl(self, clock):
+        """TTL 안에서는 재계산하지 않음"""
+        calls = []
+        cache = StatsCache(lambda: calls.append(1) or len(calls), ttl=5, clock=clock)
+
+        assert cache.get() == 1
+        clock.now = 4.9
+        assert cache.get() == 1
+        clock.now = 5.0
+        assert cache.get() == 2
+
+    def test_zero_ttl_disables_cache(self):
+        """ttl=0이면 매번 계산"""
+        calls = []
+        cache = StatsCache(lambda: calls.append(1), ttl=0)
+        cache.get()
+        cache.get()
+        assert len(calls) == 2
+
+    def test_single_flight(self):
+        """동시 요청은 한 번의 재계산을 공유"""
+        calls = []
+
+        def slow_loader():
+            calls.append(1)
+            time.sleep(0.05)
+            return {'total_users': 1}
+
+        cache = StatsCache(slow_loader, ttl=60)
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(cache.get())) for _ in range(10)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert len(calls) == 1
+        assert results == [{'total_users': 1}] * 10
+
+
+class TestLoadStats:
+    """통계 쿼리 테스트"""
+
+    def test_counter_mode_avoids_full_count(self, fake_connection):
+        """counter 모드는 전체 COUNT(*) 대신 카운터 테이블 조회"""
+        conn = fake_connection(respond=stats_rows)
+        assert load_stats(conn, mode='counter') == {'total_users': 7, 'new_users_today': 7}
+        assert 'user_counters' in conn.statements[0]
+        assert 'SELECT COUNT(*) FROM users' not in conn.statements
+
+    def test_json_strategy_single_round_trip(self, fake_connection):
+        """json 전략은 한 번의 쿼리로 두 값 조회"""
+        conn = fake_connection(respond=stats_rows)
+        assert load_stats(conn, mode='count', strategy='json') == {'total_users': 7, 'new_users_today': 1}
+        assert len(conn.executed) == 1
+
+    def test_unknown_mode(self, fake_connection):
+        with pytest.raises(ValueError):
+            load_stats(fake_connection(respond=stats_rows), mode='view')
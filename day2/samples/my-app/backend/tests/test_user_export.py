@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+사용자 스트리밍 내보내기 테스트
+"""
+
+import json
+from datetime import datetime
+
+import pytest
+
+from user_export import stream_users
+
+
+ROWS = [
+    (2, '김철수', 'kim@example.com', datetime(2024, 1, 2)),
+    (1, 'John Doe', 'john@example.com', None),
+]
+
+
+class TestStreamUsers:
+    """스트리밍 응답 생성 테스트"""
+
+    def test_ndjson(self, fake_connection):
+        """행마다 한 줄, 서버 사이드 커서와 itersize 사용"""
+        conn = fake_connection(ROWS)
+        returned = []
+        body = ''.join(stream_users(conn, 'ndjson', returned.append, itersize=10))
+
+        lines = [json.loads(line) for line in body.splitlines()]
+        assert [u['id'] for u in lines] == [2, 1]
+        assert lines[0]['name'] == '김철수'
+        assert lines[1]['created_at'] is None
+        [(cursor_name, itersize)] = conn.iterated
+        assert cursor_name is not None and itersize == 10
+        assert returned == [conn] and conn.rollbacks == 1
+
+    def test_json_array(self, fake_connection):
+        """청크를 이어 붙이면 기존 목록 응답과 같은 형태"""
+        conn = fake_connection(ROWS)
+        body = ''.join(stream_users(conn, 'json', lambda c: None))
+        assert [u['id'] for u in json.loads(body)['users']] == [2, 1]
+
+    def test_connection_returned_on_disconnect(self, fake_connection):
+        """클라이언트가 중간에 끊어도 연결 반환"""
+        conn = fake_connection(ROWS)
+        returned = []
+        body = stream_users(conn, 'ndjson', returned.append)
+        next(body)
+        body.close()
+        assert returned == [conn]
+
+    def test_unread_stream_returns_connection(self, fake_connection):
+        """본문을 한 번도 읽지 않고 닫아도 연결 반환"""
+        conn = fake_connection(ROWS)
+        returned = []
+        stream_users(conn, 'ndjson', returned.append).close()
+        assert returned == [conn] and conn.rollbacks == 1
+        assert conn.executed == []
+
+
+class TestExportRoute:
+    """/api/users/export 라우트의 연결 반환 테스트"""
+
+    @pytest.fixture
+    def pool(self, monkeypatch, fake_connection):
+        import app as backend
+
+        pool = {'out': 0, 'returned': []}
+        conn = fake_connection(ROWS)
+
+        def getconn():
+            pool['out'] += 1
+            return conn
+
+        def putconn(c):
+            pool['out'] -= 1
+            pool['returned'].append(c)
+
+        monkeypatch.setattr(backend, 'get_db_connection', getconn)
+        monkeypatch.setattr(backend, 'return_db_connection', putconn)
+        pool['client'] = backend.app.test_client()
+        return pool
+
+    def test_head_keeps_pool_balanced(self, pool):
+        for _ in range(3):
+            response = pool['client'].head('/api/users/export')
+            assert response.status_code == 200 and response.data == b''
+            # WSGI 서버처럼 응답 iterable을 닫음
+            response.close()
+        assert pool['out'] == 0 and len(pool['returned']) == 3
+
+    def test_heavy_slot_held_until_stream_closes(self, pool):
+        import app as backend
+
+        heavy = backend.admission.limiters['heavy']
+        response = pool['client'].get('/api/users/export', buffered=False)
+        chunks = iter(response.response)
+        assert next(chunks)
+        assert heavy.in_flight == 1 and pool['out'] == 1
+        response.close()
+        assert heavy.in_flight == 0 and pool['out'] == 0
+
+    def test_get_streams_and_returns(self, pool):
+        response = pool['client'].get('/api/users/export?format=json')
+        assert [u['id'] for u in response.get_json()['users']] == [2, 1]
+        assert pool['out'] == 0
+
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+사용자 대량 등록 테스트
+"""
+
+import pytest
+
+import user_import
+from user_import import BulkPayloadError, bulk_insert, iter_batches, iter_ndjson_records, summarize
+
+
+@pytest.fixture
+def existing_emails(monkeypatch):
+    """ON CONFLICT (email) DO NOTHING 동작을 흉내내는 execute_values 대역"""
+    emails = {'dup@example.com'}
+
+    def fake_execute_values(cursor, sql, values, page_size, fetch):
+        assert 'ON CONFLICT (email) DO NOTHING' in sql
+        rows = []
+        for name, email in values:
+            if email not in emails:
+                emails.add(email)
+                rows.append((len(emails),))
+        return rows
+
+    monkeypatch.setattr(user_import, 'execute_values', fake_execute_values)
+    return emails
+
+
+class TestParsing:
+    """요청 본문 파싱 테스트"""
+
+    def test_ndjson_skips_blank_lines(self):
+        """빈 줄 무시, bytes 줄 처리"""
+        lines = [b'{"name": "a", "email": "a@x"}\n', b'\n', '{"name": "b", "email": "b@x"}']
+        assert [r['name'] for r in iter_ndjson_records(lines)] == ['a', 'b']
+
+    def test_ndjson_invalid_line(self):
+        """잘못된 JSON 줄 번호 보고"""
+        with pytest.raises(BulkPayloadError, match='line 2'):
+            list(iter_ndjson_records(['{}', '{oops']))
+
+    def test_ndjson_invalid_utf8(self):
+        """UTF-8이 아닌 줄도 줄 번호와 함께 BulkPayloadError"""
+        with pytest.raises(BulkPayloadError, match='line 2'):
+            list(iter_ndjson_records([b'{}\n', b'{"name": "\xff"}\n']))
+
+    def test_batches(self):
+        """batch_size 단위 분할"""
+        assert [len(b) for b in iter_batches(range(7), 3)] == [3, 3, 1]
+
+
+class TestBulkInsert:
+    """배치 적재 테스트"""
+
+    def test_reports_per_batch(self, existing_emails, fake_connection):
+        """배치별 inserted/skipped/invalid 집계와 배치당 1회 커밋"""
+        records = [
+            {'name': 'a', 'email': 'a@example.com'},
+            {'name': 'dup', 'email': 'dup@example.com'},
+            {'name': 'no email'},
+            {'name': 'a again', 'email': 'a@example.com'},
+        ]
+        conn = fake_connection()
+        reports = bulk_insert(conn, records, batch_size=3)
+
+        assert reports == [
+            {'batch': 1, 'received': 3, 'inserted': 1, 'skipped': 1, 'invalid': 1},
+            {'batch': 2, 'received': 1, 'inserted': 0, 'skipped': 1, 'invalid': 0},
+        ]
+        assert conn.commits == 2
+        assert summarize(reports) == {'received': 4, 'inserted': 1, 'skipped': 2, 'invalid': 1}
+
+    def test_failure_keeps_committed_reports(self, existing_emails, fake_connection):
+        """중간 배치 실패 시 롤백하고 이미 커밋된 결과 보존"""
+        records = iter_ndjson_records(['{"name": "a", "email": "a@x"}', 'broken'])
+        conn = fake_connection()
+        with pytest.raises(BulkPayloadError) as exc:
+            bulk_insert(conn, records, batch_size=1)
+        assert conn.rollbacks == 1
+        assert [r['inserted'] for r in exc.value.reports] == [1]
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+시작 워밍업 테스트
+"""
+
+import time
+import threading
+
+import pytest
+
+import db_pool
+import prepared
+from db_pool import PrefillConnectionPool
+from health import HealthMonitor
+from warmup import Warmup, warm_connection
+
+
+class SlowConnect:
+    """접속에 delay초 걸리는 psycopg2.connect 대역 (동시 접속 수 기록)"""
+
+    def __init__(self, delay, connect):
+        self.delay = delay
+        self.connect = connect
+        self.active = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, *args, **kwargs):
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(self.delay)
+        with self.lock:
+            self.active -= 1
+        return self.connect()
+
+
+class TestPrefill:
+    """최소 연결 병렬 생성 테스트"""
+
+    def test_opens_min_connections_in_parallel(self, monkeypatch, fake_connection):
+        connect = SlowConnect(0.2, fake_connection)
+        monkeypatch.setattr(db_pool.psycopg2, 'connect', connect)
+        pool = PrefillConnectionPool(4, 10, host='db')
+
+        start = time.perf_counter()
+        opened = pool.prefill()
+        assert len(opened) == 4 and connect.peak == 4
+        assert time.perf_counter() - start < 0.6
+        assert pool.prefill() == []
+
+    def test_connection_pool_tracks_prefilled(self, monkeypatch, fake_connection):
+        monkeypatch.setattr(db_pool.psycopg2, 'connect', SlowConnect(0, fake_connection))
+        pool = db_pool.ConnectionPool(minconn=2, maxconn=4, name='prefill-test', host='db')
+        assert pool.prefill() == 2
+        assert len(pool._born) == 2
+
+    def test_connect_errors_raise_when_nothing_opened(self, monkeypatch):
+        def refuse(*args, **kwargs):
+            raise OSError('connection refused')
+
+        monkeypatch.setattr(db_pool.psycopg2, 'connect', refuse)
+        with pytest.raises(OSError):
+            PrefillConnectionPool(2, 4, host='db').prefill()
+
+
+class TestWarmConnection:
+    """hot statement 준비 테스트"""
+
+    def test_prepares_hot_statements(self, monkeypatch, fake_connection):
+        monkeypatch.setattr(prepared, 'PREPARED_STATEMENTS', True)
+        conn = fake_connection()
+        warm_connection(conn, page_size=10, strategy='rows', stats_mode='count')
+
+        prepares = [s for s in conn.statements if s.startswith('PREPARE')]
+        assert any('_health_ping_' in s for s in prepares)
+        assert any('_users_page_' in s and 'ORDER BY created_at DESC' in s for s in prepares)
+        assert any('_users_insert_' in s for s in prepares)
+        assert any('_users_count_today_' in s for s in prepares)
+        # INSERT는 준비만 하고 실행하지 않음
+        assert not any(s.startswith('EXECUTE ps_users_insert') for s in conn.statements)
+
+
+class TestWarmup:
+    """워밍업 단계 실행 / readiness 연동 테스트"""
+
+    def test_runs_steps_and_records_failures(self):
+        calls = []
+
+        def fail():
+            raise RuntimeError('db down')
+
+        warmup = Warmup([('a', lambda: calls.append('a')), ('b', fail)])
+        warmup.start()
+        assert warmup.wait(2)
+        assert warmup.finished
+        assert calls == ['a']
+        assert warmup.summary()['b'] == {'ok': False, 'duration': pytest.approx(0, abs=0.1), 'error': 'db down'}
+
+    def test_timeout_skips_remaining_steps(self):
+        warmup = Warmup([('slow', lambda: time.sleep(0.05)), ('next', lambda: None)], timeout=0.01)
+        warmup.run()
+        assert warmup.results['next'].error == 'skipped: warmup timeout'
+
+    def test_not_ready_until_warm(self):
+        release = threading.Event()
+        warmup = Warmup([('db', release.wait)])
+        monitor = HealthMonitor(lambda: None)
+        monitor.wait_for(lambda: warmup.finished)
+        warmup.start()
+        monitor.refresh()
+        assert not monitor.is_ready()
+        assert monitor.status()['status'] == 'warming_up'
+
+        release.set()
+        warmup.wait(2)
+        assert monitor.is_ready()
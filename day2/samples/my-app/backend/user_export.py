@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+사용자 전체 내보내기 (스트리밍)
+
+psycopg2 서버 사이드(named) 커서로 itersize 단위만 가져오며 바로 응답에 흘려보내므로
+요청당 메모리가 테이블 크기와 무관하고, 쿼리가 끝나기 전에 첫 바이트가 나갑니다.
+"""
+
+import os
+
+from json_provider import NATIVE_DATETIME, dumps
+from metrics import query_timer
+
+EXPORT_ITERSIZE = int(os.getenv('EXPORT_ITERSIZE', 2000))
+
+EXPORT_QUERY = 'SELECT id, name, email, created_at FROM users ORDER BY created_at DESC, id DESC'
+
+EXPORT_FORMATS = {
+    'ndjson': 'application/x-ndjson',
+    'json': 'application/json',
+}
+
+
+USER_FIELDS = ('id', 'name', 'email', 'created_at')
+
+
+def row_to_user(row):
+    """users 행을 응답용 dict로 변환 (created_at은 JSON 직렬화 시 ISO 8601 문자열)"""
+    return dict(zip(USER_FIELDS, row))
+
+
+def rows_to_users(rows, native_datetime=NATIVE_DATETIME):
+    """users 행 목록을 한 번에 dict 목록으로 변환
+
+    직렬화기가 datetime을 직접 처리하지 못하면 (표준 json) 여기서 ISO 문자열로 바꿔
+    행마다 default 콜백이 호출되지 않게 합니다.
+    """
+    fields = USER_FIELDS
+    if native_datetime:
+        return [dict(zip(fields, row)) for row in rows]
+    return [
+        {'id': i, 'name': n, 'email': e, 'created_at': c.isoformat() if c else None}
+        for i, n, e, c in rows
+    ]
+
+
+def iter_user_rows(conn, itersize=EXPORT_ITERSIZE):
+    """서버 사이드 커서로 users 행을 itersize 단위로 읽기"""
+    with conn.cursor(name='users_export') as cursor:
+        cursor.itersize = itersize
+        # 서버 사이드 커서는 DECLARE까지만 측정 (행 전송은 스트리밍 중에 발생)
+        with query_timer('users_export'):
+            cursor.execute(EXPORT_QUERY)
+        for row in cursor:
+            yield row
+
+
+def iter_ndjson(rows):
+    """행마다 한 줄의 JSON 생성"""
+    for row in rows:
+        yield dumps(row_to_user(row)) + '\n'
+
+
+def iter_json_array(rows):
+    """{"users": [...]} 형태의 JSON을 조각 단위로 생성"""
+    yield '{"users": ['
+    first = True
+    for row in rows:
+        chunk = dumps(row_to_user(row))
+        yield chunk if first else ',' + chunk
+        first = False
+    yield ']}\n'
+
+
+class UserExportStream:
+    """내보내기 응답 본문 (WSGI iterable)
+
+    close()는 본문을 한 번도 읽지 않은 경우(HEAD, 첫 청크 전 연결 끊김)에도 WSGI 서버가
+    호출하므로, 생성기 finally 대신 여기서 트랜잭션을 정리하고 on_close(conn)로 연결을 돌려줍니다.
+    """
+
+    def __init__(self, conn, fmt, on_close, itersize=EXPORT_ITERSIZE):
+        encode = iter_ndjson if fmt == 'ndjson' else iter_json_array
+        self.conn = conn
+        self.on_close = on_close
+        self.closed = False
+        self._chunks = encode(iter_user_rows(conn, itersize))
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        try:
+            return next(self._chunks)
+        except StopIteration:
+            # 다 보낸 즉시 반환 (WSGI 서버의 close() 호출을 기다리지 않음)
+            self.close()
+            raise
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        try:
+            self._chunks.close()
+        finally:
+            try:
+                self.conn.rollback()
+            finally:
+                self.on_close(self.conn)
+
+
+def stream_users(conn, fmt, on_close, itersize=EXPORT_ITERSIZE):
+    """내보내기 응답 본문 생성 (스트림이 끝나거나 끊기거나 읽히지 않아도 close()에서 연결 반환)"""
+    return UserExportStream(conn, fmt, on_close, itersize)
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+사용자 대량 등록
+
+JSON 배열 또는 NDJSON 스트림을 받아 execute_values로 배치 단위 INSERT 합니다.
+행마다 왕복/커밋하던 create_user와 달리 배치당 한 번의 왕복과 한 번의 커밋만 발생합니다.
+"""
+
+import os
+import json
+from itertools import islice
+
+from psycopg2.extras import execute_values
+
+from metrics import query_timer
+
+BULK_BATCH_SIZE = int(os.getenv('BULK_BATCH_SIZE', 1000))
+
+# init.sql 샘플 데이터와 동일하게 이메일 중복은 건너뜀
+BULK_INSERT_SQL = (
+    'INSERT INTO users (name, email) VALUES %s '
+    'ON CONFLICT (email) DO NOTHING RETURNING id'
+)
+
+NDJSON_CONTENT_TYPES = ('application/x-ndjson', 'application/jsonl')
+
+
+class BulkPayloadError(ValueError):
+    """대량 등록 요청 본문 오류"""
+
+
+def iter_ndjson_records(lines):
+    """NDJSON 줄 단위 파싱 (빈 줄 무시)"""
+    for lineno, line in enumerate(lines, 1):
+        if isinstance(line, bytes):
+            try:
+                line = line.decode('utf-8')
+            except UnicodeDecodeError as e:
+                raise BulkPayloadError(f"Invalid UTF-8 on line {lineno}") from e
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError as e:
+            raise BulkPayloadError(f"Invalid JSON on line {lineno}") from e
+
+
+def iter_request_records(req):
+    """Flask 요청에서 레코드 이터레이터 생성
+
+    NDJSON은 요청 스트림을 줄 단위로 읽어 본문 전체를 메모리에 올리지 않습니다.
+    """
+    if req.mimetype in NDJSON_CONTENT_TYPES:
+        return iter_ndjson_records(req.stream)
+
+    data = req.get_json(silent=True)
+    if not isinstance(data, list):
+        raise BulkPayloadError('Request body must be a JSON array or NDJSON stream')
+    return iter(data)
+
+
+def is_valid_record(record):
+    """name, email 필수 필드 확인"""
+    return (
+        isinstance(record, dict)
+        and isinstance(record.get('name'), str) and record['name']
+        and isinstance(record.get('email'), str) and record['email']
+    )
+
+
+def iter_batches(records, batch_size=BULK_BATCH_SIZE):
+    """레코드를 batch_size 단위 리스트로 분할"""
+    records = iter(records)
+    while True:
+        batch = list(islice(records, batch_size))
+        if not batch:
+            return
+        yield batch
+
+
+def insert_batch(conn, batch):
+    """한 배치를 INSERT하고 커밋한 뒤 결과 집계 반환"""
+    values = [(r['name'], r['email']) for r in batch if is_valid_record(r)]
+    inserted = 0
+    if values:
+        with query_timer('users_bulk_insert'), conn.cursor() as cursor:
+            rows = execute_values(cursor, BULK_INSERT_SQL, values, page_size=len(values), fetch=True)
+            inserted = len(rows)
+        conn.commit()
+
+    return {
+        'received': len(batch),
+        'inserted': inserted,
+        'skipped': len(values) - inserted,
+        'invalid': len(batch) - len(values),
+    }
+
+
+def bulk_insert(conn, records, batch_size=BULK_BATCH_SIZE):
+    """모든 배치를 순서대로 적재하고 배치별 결과 목록 반환
+
+    실패한 배치는 롤백되며, 그 전까지 커밋된 배치 결과는 예외의 reports 속성에 담깁니다.
+    """
+    reports = []
+    try:
+        for number, batch in enumerate(iter_batches(records, batch_size), 1):
+            report = insert_batch(conn, batch)
+            report['batch'] = number
+            reports.append(report)
+    except Exception as e:
+        conn.rollback()
+        e.reports = reports
+        raise
+    return reports
+
+
+def summarize(reports):
+    """배치별 결과 합계"""
+    totals = {'received': 0, 'inserted': 0, 'skipped': 0, 'invalid': 0}
+    for report in reports:
+        for key in totals:
+            totals[key] += report[key]
+    return totals
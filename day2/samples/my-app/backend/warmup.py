@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+시작 시 DB 워밍업
+
+새 파드의 첫 요청들이 init_db, 연결 생성, PREPARE, 차가운 인덱스 페이지 비용을 대신 치르지 않도록
+워커가 뜨자마자 백그라운드 스레드에서 다음을 수행합니다.
+1. 최소 연결(DB_POOL_MIN)을 병렬로 열기
+2. 각 연결에서 자주 쓰는 statement를 PREPARE 하고 users 첫 페이지/최근 1일 조회로
+   idx_users_created_at_id 인덱스 페이지를 공유 버퍼에 올리기
+
+/readyz는 워밍업이 끝난 뒤에야 ready를 보고합니다 (실패해도 끝나면 헬스 체크 결과를 따름).
+"""
+
+import os
+import time
+import logging
+import threading
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+import prepared
+from metrics import WARMUP_DURATION, query_timer
+from pagination import (
+    DEFAULT_PAGE_SIZE, QUERY_STRATEGY, build_page_json_query, build_page_query,
+)
+from stats import STATS_MODE, load_stats
+
+logger = logging.getLogger(__name__)
+
+DB_WARMUP = os.getenv('DB_WARMUP', 'true').lower() == 'true'
+WARMUP_TIMEOUT = float(os.getenv('WARMUP_TIMEOUT', 30))
+
+INSERT_USER_SQL = 'INSERT INTO users (name, email) VALUES (%s, %s) RETURNING id'
+
+StepResult = namedtuple('StepResult', 'ok duration error')
+
+
+def warm_connection(conn, page_size=DEFAULT_PAGE_SIZE, strategy=QUERY_STRATEGY, stats_mode=STATS_MODE):
+    """연결 하나에 hot statement를 준비하고 인덱스 페이지를 읽어 둠"""
+    with conn.cursor() as cursor:
+        with query_timer('health_ping'):
+            prepared.execute(cursor, 'health_ping', 'SELECT 1')
+            cursor.fetchone()
+
+        # 첫 페이지: ORDER BY created_at DESC, id DESC LIMIT → idx_users_created_at_id 역방향 스캔
+        if strategy == 'json':
+            sql, params = build_page_json_query(page_size)
+            with query_timer('users_page_json'):
+                prepared.execute(cursor, 'users_page_json', sql, params)
+                cursor.fetchone()
+        else:
+            sql, params = build_page_query(page_size)
+            with query_timer('users_page'):
+                prepared.execute(cursor, 'users_page', sql, params)
+                cursor.fetchall()
+
+        prepared.prepare(cursor, 'users_insert', INSERT_USER_SQL)
+
+    # 최근 1일 가입자 수 (created_at 범위 스캔) + 전체 수
+    load_stats(conn, mode=stats_mode)
+    conn.rollback()
+
+
+def warm_pool(pool, workers=None):
+    """최소 연결을 병렬로 열고 각 연결을 워밍업, 워밍업한 연결 수 반환"""
+    pool.prefill(workers)
+    count = max(pool.minconn, 1)
+    conns = []
+    try:
+        for _ in range(count):
+            conns.append(pool.getconn())
+        with ThreadPoolExecutor(max_workers=workers or count) as executor:
+            # 예외는 result()에서 다시 발생
+            for future in [executor.submit(warm_connection, conn) for conn in conns]:
+                future.result()
+    finally:
+        for conn in conns:
+            pool.putconn(conn)
+    return len(conns)
+
+
+class Warmup:
+    """(이름, 함수) 단계를 순서대로 한 번 실행하는 백그라운드 작업
+
+    모든 단계가 끝나면(실패 포함) done이 설정되고, 단계가 멈춰 있어도 timeout이 지나면
+    finished로 간주합니다.
+    """
+
+    def __init__(self, steps, timeout=WARMUP_TIMEOUT, clock=time.monotonic):
+        self.steps = list(steps)
+        self.timeout = timeout
+        self.clock = clock
+        self.done = threading.Event()
+        self.results = {}
+        self._thread = None
+        self._pid = None
+        self._started_at = None
+        self._lock = threading.Lock()
+
+    def run(self):
+        """모든 단계 실행 (시간을 넘기면 남은 단계는 건너뜀)"""
+        deadline = self.clock() + self.timeout
+        try:
+            for name, step in self.steps:
+                if self.clock() >= deadline:
+                    self.results[name] = StepResult(False, 0.0, 'skipped: warmup timeout')
+                    continue
+                start = time.perf_counter()
+                try:
+                    step()
+                    error = None
+                except Exception as e:
+                    error = str(e) or type(e).__name__
+                    logger.warning(f"Warmup step {name} failed: {error}")
+                duration = time.perf_counter() - start
+                WARMUP_DURATION.labels(step=name).observe(duration)
+                self.results[name] = StepResult(error is None, duration, error)
+        finally:
+            self.done.set()
+        logger.info(f"Warmup finished: {self.summary()}")
+
+    def summary(self):
+        return {
+            name: {'ok': r.ok, 'duration': round(r.duration, 3), **({'error': r.error} if r.error else {})}
+            for name, r in self.results.items()
+        }
+
+    def start(self):
+        """워밍업 스레드 시작 (프로세스마다 한 번, fork 후 자식에서는 다시 실행)"""
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._started_at = self.clock()
+            self.done = threading.Event()
+            self.results = {}
+            self._thread = threading.Thread(target=self.run, name='db-warmup', daemon=True)
+            self._thread.start()
+
+    @property
+    def finished(self):
+        """현재 프로세스의 워밍업이 끝났는지"""
+        if self._pid != os.getpid():
+            return False
+        return self.done.is_set() or self.clock() - self._started_at >= self.timeout
+
+    def wait(self, timeout=None):
+        return self.done.wait(timeout)
@@ -5,13 +5,19 @@ CREATE TABLE IF NOT EXISTS users (
     id SERIAL PRIMARY KEY,
     name VARCHAR(100) NOT NULL,
     email VARCHAR(255) UNIQUE NOT NULL,
-    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
 -- 인덱스 생성
 CREATE INDEX IF NOT EXISTS idx_users_email ON users(email);
-CREATE INDEX IF NOT EXISTS idx_users_created_at ON users(created_at);
+-- 키셋 페이지네이션 (created_at, id) 시크와 정렬을 한 인덱스로 처리
+-- 이전 스키마로 만든 DB는 NULL created_at을 채우고 NOT NULL로 변경
+UPDATE users SET created_at = COALESCE(updated_at, CURRENT_TIMESTAMP) WHERE created_at IS NULL;
+ALTER TABLE users ALTER COLUMN created_at SET DEFAULT CURRENT_TIMESTAMP;
+ALTER TABLE users ALTER COLUMN created_at SET NOT NULL;
+DROP INDEX IF EXISTS idx_users_created_at;
+CREATE INDEX IF NOT EXISTS idx_users_created_at_id ON users(created_at, id);
 
 -- 샘플 데이터 삽입
 INSERT INTO users (name, email) VALUES 
@@ -81,6 +87,73 @@ BEGIN
 END;
 $$ LANGUAGE plpgsql;
 
+-- 사용자 수 카운터 (STATS_MODE=counter 에서 /api/stats 가 사용)
+CREATE TABLE IF NOT EXISTS user_counters (
+    name VARCHAR(50) PRIMARY KEY,
+    value BIGINT NOT NULL DEFAULT 0
+);
+
+INSERT INTO user_counters (name, value)
+SELECT 'total_users', COUNT(*) FROM users
+ON CONFLICT (name) DO NOTHING;
+
+-- 문장 단위 트리거: 대량 INSERT 도 카운터 UPDATE 는 한 번만 발생
+CREATE OR REPLACE FUNCTION user_counters_on_insert()
+RETURNS TRIGGER AS $$
+BEGIN
+    UPDATE user_counters
+    SET value = value + (SELECT COUNT(*) FROM inserted_users)
+    WHERE name = 'total_users';
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION user_counters_on_delete()
+RETURNS TRIGGER AS $$
+BEGIN
+    UPDATE user_counters
+    SET value = value - (SELECT COUNT(*) FROM deleted_users)
+    WHERE name = 'total_users';
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS users_counter_insert ON users;
+CREATE TRIGGER users_counter_insert
+    AFTER INSERT ON users
+    REFERENCING NEW TABLE AS inserted_users
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION user_counters_on_insert();
+
+DROP TRIGGER IF EXISTS users_counter_delete ON users;
+CREATE TRIGGER users_counter_delete
+    AFTER DELETE ON users
+    REFERENCING OLD TABLE AS deleted_users
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION user_counters_on_delete();
+
+-- users 테이블 버전 (응답 캐시 무효화용, 모든 워커/파드가 RESPONSE_CACHE_VERSION_TTL마다 읽음)
+-- 비용: INSERT/UPDATE/DELETE 문장마다 이 행 하나를 UPDATE 하므로 users에 동시에 쓰는 트랜잭션은
+-- 커밋될 때까지 이 행의 잠금을 기다림 (대량 등록은 배치 문장마다 한 번, total_users 카운터도 INSERT/DELETE에서 같은 방식)
+-- 쓰기 동시성이 더 중요하면 RESPONSE_CACHE_VERSIONS=local 로 두고 아래 트리거를 지움:
+--   DROP TRIGGER IF EXISTS users_version_bump ON users;
+INSERT INTO user_counters (name, value) VALUES ('users_version', 0)
+ON CONFLICT (name) DO NOTHING;
+
+CREATE OR REPLACE FUNCTION user_counters_bump_version()
+RETURNS TRIGGER AS $$
+BEGIN
+    UPDATE user_counters SET value = value + 1 WHERE name = 'users_version';
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS users_version_bump ON users;
+CREATE TRIGGER users_version_bump
+    AFTER INSERT OR UPDATE OR DELETE ON users
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION user_counters_bump_version();
+
 -- 권한 설정
 GRANT ALL PRIVILEGES ON ALL TABLES IN SCHEMA public TO postgres;
 GRANT ALL PRIVILEGES ON ALL SEQUENCES IN SCHEMA public TO postgres;
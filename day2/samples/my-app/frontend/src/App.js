@@ -249,7 +249,7 @@ function LoadTest() {
     setIsRunning(true);
     try {
       await api.generateLoad(duration, intensity);
-      alert(`Load test completed: ${duration}s with intensity ${intensity}`);
+      alert(`Load test started: ${duration}s with intensity ${intensity}`);
     } catch (err) {
       console.error('Load test failed:', err);
       alert('Load test failed');